@@ -1,24 +1,21 @@
-﻿import os
+﻿from startup_profile import PROFILE, EXIT_AFTER_STARTUP_FLAG
+import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from collections import defaultdict
 import threading
-import json
-import zipfile
-import shutil
 from datetime import datetime
-import webbrowser
-import tempfile
 import sv_ttk
 import platform
 import sys
-import re
 import time
-import concurrent.futures
 import gc
 from functools import wraps
 from resource_path import resource_path
 
+# Backup, export, compare and browser code is imported by the methods that use it
+PROFILE.mark("imports")
+
 class ModConflictChecker(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -39,25 +36,93 @@ class ModConflictChecker(tk.Tk):
         self.file_type_toggles = {}
         self.toggle_visible = tk.BooleanVar(value=False)
         self.current_tab = "conflicts"
+        self.diff_cache = None
+        self.compare_palettes = {}
+        self.compare_style_theme = None
+        self.compare_window_pool = []
+        self.scan_mods = {}
+        self.scan_mods_dir = None
         
         self.update_debounce_timer = None
         
         self.center_window()
+        PROFILE.mark("window")
         
         sv_ttk.set_theme("dark" if self.dark_mode else "light")
         self.set_dark_title_bar()
+        PROFILE.mark("theme")
         
         self.create_header()
         self.create_controls()
+        PROFILE.mark("header and controls")
         self.create_notebook()
+        PROFILE.mark("notebook")
         self.create_summary_panel()
         self.create_donation_button()
         
         self.bind_context_menus()
         
         self.optimize_memory()
+        PROFILE.mark("summary and status bar")
+        
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.restore_session()
+        PROFILE.mark("session")
+        
+        self.after_idle(self.startup_finished)
+        
+    def startup_finished(self):
+        """Runs once the first frame has been drawn and the window takes input"""
+        PROFILE.mark("first interactive")
+        PROFILE.report()
+        if EXIT_AFTER_STARTUP_FLAG in sys.argv:
+            self.destroy()
         
         
+    def restore_session(self):
+        """Restore the last folder, exclusions and filters, then show and recheck the last scan"""
+        from session_store import SessionStore
+        
+        self.session_store = SessionStore()
+        state = self.session_store.load_state()
+        if not state:
+            return
+            
+        self.path_var.set(state.get("lml_dir", ""))
+        self.excluded_files = set(state.get("excluded_files", []))
+        self.search_var.set(state.get("search", ""))
+        self.filter_var.set(state.get("filter", "All"))
+        for ext, enabled in state.get("file_types", {}).items():
+            self.file_type_toggles[ext] = tk.BooleanVar(value=enabled)
+        if state.get("show_file_types"):
+            self.toggle_file_type_filters()
+            
+        lml_dir = self.path_var.get().strip()
+        if os.path.isdir(lml_dir):
+            self.is_scanning = True
+            self.scan_btn.config(text="Checking for changes...", state='disabled')
+            # Started once the main loop runs, since the worker posts results back with self.after
+            self.after(0, lambda: threading.Thread(target=self.scan_conflicts, args=(lml_dir, True),
+                                                   daemon=True).start())
+            
+    def save_session(self):
+        state = {
+            "lml_dir": self.path_var.get().strip(),
+            "excluded_files": sorted(self.excluded_files),
+            "search": self.search_var.get(),
+            "filter": self.filter_var.get(),
+            "file_types": {ext: var.get() for ext, var in self.file_type_toggles.items()},
+            "show_file_types": self.toggle_visible.get(),
+        }
+        try:
+            self.session_store.save_state(state)
+        except OSError as e:
+            print(f"Failed to save session: {e}")
+            
+    def on_close(self):
+        self.save_session()
+        self.destroy()
+        
     def resource_path(relative_path):
         try:
             
@@ -67,6 +132,10 @@ class ModConflictChecker(tk.Tk):
 
         return os.path.join(base_path, relative_path)
         
+    def open_url(self, url):
+        import webbrowser
+        webbrowser.open(url)
+        
     def create_donation_button(self):
         """Add a Ko-fi donation button to the bottom right of the application"""
      
@@ -84,7 +153,7 @@ class ModConflictChecker(tk.Tk):
             relief="flat",
             padx=10,
             pady=5,
-            command=lambda: webbrowser.open("https://ko-fi.com/W7W41IBL6D")
+            command=lambda: self.open_url("https://ko-fi.com/W7W41IBL6D")
         )
         kofi_button.pack(side="right", padx=5)
         
@@ -297,6 +366,16 @@ class ModConflictChecker(tk.Tk):
         self.restore_btn.config(command=lambda: self.restore_backup())
         self.restore_btn.pack(side='left', padx=(10, 0))
         
+        self.merge_btn = ttk.Button(left_buttons,
+                                  text="Auto-Merge")
+        self.merge_btn.config(command=lambda: self.auto_merge_conflicts())
+        self.merge_btn.pack(side='left', padx=(10, 0))
+        
+        self.history_btn = ttk.Button(left_buttons,
+                                    text="Scan History")
+        self.history_btn.config(command=lambda: self.show_scan_history())
+        self.history_btn.pack(side='left', padx=(10, 0))
+        
         right_buttons = ttk.Frame(action_row)
         right_buttons.pack(side='right')
         
@@ -310,6 +389,11 @@ class ModConflictChecker(tk.Tk):
         self.export_json_btn.config(command=lambda: self.export_to_json())
         self.export_json_btn.pack(side='right', padx=(0, 10))
         
+        self.export_data_btn = ttk.Button(right_buttons,
+                                        text="Export Data")
+        self.export_data_btn.config(command=lambda: self.export_to_data())
+        self.export_data_btn.pack(side='right', padx=(0, 10))
+        
         self.export_html_btn = ttk.Button(right_buttons,
                                         text="Export HTML")
         self.export_html_btn.config(command=lambda: self.export_to_html())
@@ -333,8 +417,8 @@ class ModConflictChecker(tk.Tk):
         
         self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
         
+        # The Excluded Files tab is built the first time it is opened
         self.create_conflicts_tab()
-        self.create_excluded_tab()
         
     def on_tab_changed(self, event):
         tab_id = self.notebook.select()
@@ -344,6 +428,8 @@ class ModConflictChecker(tk.Tk):
             self.current_tab = "conflicts"
         elif tab_name == "Excluded Files":
             self.current_tab = "excluded"
+            if not hasattr(self, 'excluded_tree'):
+                self.create_excluded_tab()
             self.update_excluded_tree()
         
     def create_conflicts_tab(self):
@@ -373,38 +459,7 @@ class ModConflictChecker(tk.Tk):
         right_frame = ttk.Frame(main_paned, padding=10)
         main_paned.add(right_frame, weight=2)
         
-        self.gxt2_warning = tk.Frame(right_frame, padx=10, pady=10)
-        self.gxt2_warning.pack(fill='x', pady=(0, 10))
-        self.gxt2_warning.pack_forget()
-        
-        if self.dark_mode:
-            self.gxt2_warning.configure(background='#3a3321')
-        else:
-            self.gxt2_warning.configure(background='#fff3cd')
-        
-        warning_icon = tk.Label(self.gxt2_warning, text="⚠️", font=('Segoe UI', 16))
-        warning_icon.pack(side='left', padx=(0, 10))
-        
-        if self.dark_mode:
-            warning_icon.configure(background='#3a3321', foreground='#ffffff')
-        else:
-            warning_icon.configure(background='#fff3cd', foreground='#000000')
-        
-        warning_text = tk.Label(
-            self.gxt2_warning, 
-            text="Warning: GXT2 files typically do not conflict and may result in false positives. Modify only if you understand what you're doing.",
-            wraplength=600,
-            font=('Segoe UI', 10),
-            justify='left'
-        )
-        warning_text.pack(side='left', fill='x', expand=True)
-        
-        if self.dark_mode:
-            warning_text.configure(background='#3a3321', foreground='#ffd700')
-        else:
-            warning_text.configure(background='#fff3cd', foreground='#856404')
-        
-        results_header = ttk.Frame(right_frame)
+        self.results_header = results_header = ttk.Frame(right_frame)
         results_header.pack(fill='x', pady=(0, 10))
         
         ttk.Label(results_header, 
@@ -460,6 +515,40 @@ class ModConflictChecker(tk.Tk):
         
         self.apply_tree_tags()
         
+    def ensure_gxt2_warning(self):
+        """Build the GXT2 warning banner the first time a scan finds GXT2 conflicts"""
+        if hasattr(self, 'gxt2_warning'):
+            return
+            
+        self.gxt2_warning = tk.Frame(self.results_header.master, padx=10, pady=10)
+        
+        if self.dark_mode:
+            self.gxt2_warning.configure(background='#3a3321')
+        else:
+            self.gxt2_warning.configure(background='#fff3cd')
+        
+        warning_icon = tk.Label(self.gxt2_warning, text="⚠️", font=('Segoe UI', 16))
+        warning_icon.pack(side='left', padx=(0, 10))
+        
+        if self.dark_mode:
+            warning_icon.configure(background='#3a3321', foreground='#ffffff')
+        else:
+            warning_icon.configure(background='#fff3cd', foreground='#000000')
+        
+        warning_text = tk.Label(
+            self.gxt2_warning, 
+            text="Warning: GXT2 files typically do not conflict and may result in false positives. Modify only if you understand what you're doing.",
+            wraplength=600,
+            font=('Segoe UI', 10),
+            justify='left'
+        )
+        warning_text.pack(side='left', fill='x', expand=True)
+        
+        if self.dark_mode:
+            warning_text.configure(background='#3a3321', foreground='#ffd700')
+        else:
+            warning_text.configure(background='#fff3cd', foreground='#856404')
+        
     def create_excluded_tab(self):
         excluded_frame = ttk.Frame(self.excluded_tab, padding=10)
         excluded_frame.pack(fill='both', expand=True)
@@ -509,6 +598,9 @@ class ModConflictChecker(tk.Tk):
         tree_frame.grid_rowconfigure(0, weight=1)
         tree_frame.grid_columnconfigure(0, weight=1)
         
+        self.excluded_tree.bind("<Button-3>", self.show_excluded_context_menu)
+        self.apply_tree_tags()
+        
     def create_summary_panel(self):
         summary_frame = ttk.Frame(self, padding=10)
         summary_frame.pack(fill='x', padx=20, pady=(0, 10))
@@ -522,7 +614,6 @@ class ModConflictChecker(tk.Tk):
         
     def bind_context_menus(self):
         self.tree.bind("<Button-3>", self.show_conflict_context_menu)
-        self.excluded_tree.bind("<Button-3>", self.show_excluded_context_menu)
         
     def show_conflict_context_menu(self, event):
         if not self.tree.identify_row(event.y):
@@ -536,21 +627,17 @@ class ModConflictChecker(tk.Tk):
         
         context_menu = tk.Menu(self, tearoff=0)
         
-        if len(mods) >= 2:
-            mod_menu = tk.Menu(context_menu, tearoff=0)
-            
-            mod_pairs = []
-            for i, mod1 in enumerate(mods):
-                for mod2 in mods[i+1:]:
-                    mod_pairs.append((mod1, mod2))
-            
-            for mod1, mod2 in mod_pairs:
-                mod_menu.add_command(
-                    label=f"Compare {mod1} vs {mod2}",
-                    command=lambda m1=mod1, m2=mod2, fp=file_path: self.compare_mods(fp, m1, m2)
-                )
-                
-            context_menu.add_cascade(label="Compare Mods", menu=mod_menu)
+        if len(mods) == 2:
+            context_menu.add_command(
+                label=f"Compare {mods[0]} vs {mods[1]}",
+                command=lambda: self.compare_mods(file_path, mods[0], mods[1])
+            )
+            context_menu.add_separator()
+        elif len(mods) > 2:
+            context_menu.add_command(
+                label=f"Compare All {len(mods)} Versions",
+                command=lambda: self.compare_all_mods(file_path, mods)
+            )
             context_menu.add_separator()
             
         context_menu.add_command(
@@ -616,37 +703,492 @@ class ModConflictChecker(tk.Tk):
             
         self.open_comparison_window(file_path, mod1, mod2, mod1_path, mod2_path)
         
+    def compare_all_mods(self, file_path, mods):
+        lml_dir = self.path_var.get().strip()
+        if not os.path.isdir(lml_dir):
+            messagebox.showerror("Error", "Please select a valid LML directory first.")
+            return
+            
+        mod_paths = {mod: os.path.join(lml_dir, mod, file_path) for mod in mods}
+        missing = [mod for mod, path in mod_paths.items() if not os.path.exists(path)]
+        if missing:
+            messagebox.showerror("Error", f"File not found in: {', '.join(missing)}")
+            return
+            
+        self.open_nway_comparison_window(file_path, mod_paths)
+        
+    def open_nway_comparison_window(self, file_path, mod_paths):
+        """Show how every mod's version of a file differs from a chosen base in one window"""
+        import hashlib
+        import concurrent.futures
+        from binary_compare import is_binary_file
+        from text_diff import compute_nway_hunks, group_nway_regions
+        
+        mods = list(mod_paths)
+        
+        compare_window = tk.Toplevel(self)
+        compare_window.title(f"Compare All Versions: {file_path}")
+        compare_window.geometry("1200x800")
+        compare_window.minsize(800, 600)
+        
+        # Same cached palette and styles as the side-by-side compare window
+        self.ensure_compare_styles()
+        palette = self.get_compare_palette()
+        bg_color = palette["bg"]
+        text_color = palette["text"]
+        conflict_color = palette["diff_remove"]
+        identical_color = palette["diff_add"]
+        
+        main_frame = ttk.Frame(compare_window, padding=10)
+        main_frame.pack(fill='both', expand=True)
+        
+        ttk.Label(main_frame, 
+                text=f"Comparing {len(mods)} versions of: {file_path}",
+                style="CompareTitle.TLabel").pack(side='top', anchor='w', pady=(0, 10))
+        
+        controls_frame = ttk.Frame(main_frame)
+        controls_frame.pack(fill='x', pady=(0, 10))
+        
+        ttk.Label(controls_frame, text="Base version:").pack(side='left')
+        base_var = tk.StringVar(value=mods[0])
+        base_box = ttk.Combobox(controls_frame, textvariable=base_var, values=mods,
+                                state='readonly', width=30)
+        base_box.pack(side='left', padx=(5, 0))
+        
+        status_var = tk.StringVar(value="Loading files...")
+        ttk.Label(controls_frame, textvariable=status_var).pack(side='right')
+        
+        paned_window = ttk.PanedWindow(main_frame, orient='vertical')
+        paned_window.pack(fill='both', expand=True)
+        
+        tree_frame = ttk.Frame(paned_window)
+        detail_frame = ttk.Frame(paned_window)
+        paned_window.add(tree_frame, weight=2)
+        paned_window.add(detail_frame, weight=3)
+        
+        mod_columns = [f"mod{i}" for i in range(len(mods))]
+        region_tree = ttk.Treeview(tree_frame, columns=["lines", "status"] + mod_columns,
+                                   show="headings", selectmode="browse")
+        region_tree.heading("lines", text="Base Lines")
+        region_tree.heading("status", text="Status")
+        region_tree.column("lines", width=110, anchor='w', stretch=False)
+        region_tree.column("status", width=110, anchor='w', stretch=False)
+        for column, mod in zip(mod_columns, mods):
+            region_tree.heading(column, text=mod)
+            region_tree.column(column, width=90, anchor='center')
+        
+        region_tree.tag_configure("conflict", background=conflict_color)
+        region_tree.tag_configure("identical", background=identical_color)
+        
+        tree_scroll_y = ttk.Scrollbar(tree_frame, orient='vertical', command=region_tree.yview)
+        tree_scroll_x = ttk.Scrollbar(tree_frame, orient='horizontal', command=region_tree.xview)
+        region_tree.configure(yscrollcommand=tree_scroll_y.set, xscrollcommand=tree_scroll_x.set)
+        
+        region_tree.grid(row=0, column=0, sticky="nsew")
+        tree_scroll_y.grid(row=0, column=1, sticky="ns")
+        tree_scroll_x.grid(row=1, column=0, sticky="ew")
+        tree_frame.grid_rowconfigure(0, weight=1)
+        tree_frame.grid_columnconfigure(0, weight=1)
+        
+        detail_text = tk.Text(detail_frame, wrap='none', padx=5, pady=5,
+                              bg=bg_color, fg=text_color, font=('Consolas', 10))
+        detail_scroll = ttk.Scrollbar(detail_frame, orient='vertical', command=detail_text.yview)
+        detail_text.configure(yscrollcommand=detail_scroll.set)
+        detail_text.tag_configure("heading", font=('Consolas', 10, 'bold'))
+        detail_text.pack(side='left', fill='both', expand=True)
+        detail_scroll.pack(side='right', fill='y')
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill='x', pady=(10, 0))
+        
+        ttk.Label(button_frame, text="Open side-by-side with base:").pack(side='left')
+        pair_var = tk.StringVar(value=mods[1])
+        pair_box = ttk.Combobox(button_frame, textvariable=pair_var, values=mods[1:],
+                                state='readonly', width=30)
+        pair_box.pack(side='left', padx=(5, 5))
+        
+        # The base cannot be compared with itself
+        def update_pair_choices(*args):
+            others = [mod for mod in mods if mod != base_var.get()]
+            pair_box.config(values=others)
+            if pair_var.get() not in others:
+                pair_var.set(others[0])
+        
+        base_var.trace_add("write", update_pair_choices)
+        ttk.Button(button_frame, text="Compare",
+                   command=lambda: self.compare_mods(file_path, base_var.get(), pair_var.get())).pack(side='left')
+        ttk.Button(button_frame, text="Close", command=compare_window.destroy).pack(side='right')
+        
+        # Worker results are dropped if the window was closed while they were computed
+        def post(callback):
+            compare_window.after(0, lambda: compare_window.winfo_exists() and callback())
+        
+        # Every version is loaded exactly once; changing the base only re-diffs
+        versions = {}
+        state = {"regions": [], "generation": 0}
+        
+        def show_region(event=None):
+            selection = region_tree.selection()
+            detail_text.config(state='normal')
+            detail_text.delete("1.0", "end")
+            if not selection:
+                detail_text.config(state='disabled')
+                return
+            
+            region = state["regions"][int(selection[0])]
+            base = state["base"]
+            base_lines = versions[base][region["start"]:region["end"]]
+            
+            detail_text.insert("end", f"{base} (base), lines {region['start'] + 1}-{region['end']}\n", "heading")
+            detail_text.insert("end", "\n".join(base_lines) + "\n\n")
+            for mod in region["names"]:
+                detail_text.insert("end", f"{mod}\n", "heading")
+                detail_text.insert("end", "\n".join(region["texts"][mod]) + "\n\n")
+            detail_text.config(state='disabled')
+        
+        region_tree.bind("<<TreeviewSelect>>", show_region)
+        
+        def show_regions(generation, base, regions):
+            if generation != state["generation"]:
+                return
+            state["regions"] = regions
+            state["base"] = base
+            
+            region_tree.delete(*region_tree.get_children())
+            for i, region in enumerate(regions):
+                if region["end"] > region["start"]:
+                    lines = f"{region['start'] + 1}-{region['end']}"
+                else:
+                    lines = f"after {region['start']}"
+                marks = ["●" if mod in region["texts"] else ("base" if mod == base else "")
+                         for mod in mods]
+                region_tree.insert("", "end", iid=str(i), values=[lines, region["status"].title()] + marks,
+                                   tags=(region["status"],))
+            
+            conflicts = sum(1 for region in regions if region["status"] == "conflict")
+            identical = sum(1 for region in regions if region["status"] == "identical")
+            status_var.set(f"{len(regions)} changed regions | {conflicts} conflicting | {identical} identical across mods")
+            show_region()
+        
+        def diff_against_base(*args):
+            base = base_var.get()
+            state["generation"] += 1
+            generation = state["generation"]
+            status_var.set(f"Comparing {len(mods) - 1} versions against {base}...")
+            
+            def diff_thread():
+                try:
+                    others = {mod: lines for mod, lines in versions.items() if mod != base}
+                    hunks = compute_nway_hunks(versions[base], others)
+                    regions = group_nway_regions(versions[base], others, hunks)
+                    post(lambda: show_regions(generation, base, regions))
+                except Exception as e:
+                    post(lambda error=str(e): status_var.set(f"Comparison failed: {error}"))
+            
+            threading.Thread(target=diff_thread, daemon=True).start()
+        
+        def show_binary_versions(digests):
+            region_tree.heading("lines", text="Size")
+            region_tree.heading("status", text="Content")
+            groups = {}
+            for mod in mods:
+                groups.setdefault(digests[mod][1], []).append(mod)
+            
+            for i, mod in enumerate(mods):
+                size, digest = digests[mod]
+                same = [other for other in groups[digest] if other != mod]
+                marks = ["=" if other in same else "" for other in mods]
+                region_tree.insert("", "end", iid=str(i), values=[f"{size:,} B", digest[:12]] + marks,
+                                   tags=("identical",) if same else ())
+            
+            status_var.set(f"Binary file: {len(groups)} distinct versions across {len(mods)} mods")
+            base_box.config(state='disabled')
+            region_tree.unbind("<<TreeviewSelect>>")
+        
+        def load_thread():
+            try:
+                if any(is_binary_file(path) for path in mod_paths.values()):
+                    def digest_file(path):
+                        hasher = hashlib.blake2b(digest_size=16)
+                        with open(path, 'rb') as f:
+                            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                                hasher.update(chunk)
+                        return os.path.getsize(path), hasher.hexdigest()
+                    
+                    with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(mods))) as executor:
+                        digests = dict(zip(mods, executor.map(digest_file, mod_paths.values())))
+                    post(lambda: show_binary_versions(digests))
+                    return
+                
+                for mod, path in mod_paths.items():
+                    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                        versions[mod] = f.read().splitlines()
+                
+                post(lambda: base_var.trace_add("write", diff_against_base))
+                post(diff_against_base)
+            except Exception as e:
+                post(lambda error=str(e): messagebox.showerror("Error", f"Failed to load files: {error}"))
+                post(compare_window.destroy)
+        
+        threading.Thread(target=load_thread, daemon=True).start()
+        
+    def open_xml_structure_window(self, file_path, mod1, mod2, mod1_path, mod2_path):
+        """Compare two XML/meta files entry by entry, independent of order and formatting"""
+        import xml.etree.ElementTree as ET
+        from xml_diff import diff_xml_files
+        
+        structure_window = tk.Toplevel(self)
+        structure_window.title(f"Structural Compare: {file_path}")
+        structure_window.geometry("1000x650")
+        structure_window.minsize(700, 400)
+        
+        main_frame = ttk.Frame(structure_window, padding=10)
+        main_frame.pack(fill='both', expand=True)
+        
+        ttk.Label(main_frame, 
+                text=f"Structural Compare: {file_path}",
+                font=('Segoe UI', 12, 'bold')).pack(side='top', anchor='w')
+        ttk.Label(main_frame, text=f"Left: {mod1}    Right: {mod2}").pack(side='top', anchor='w', pady=(5, 0))
+        
+        status_var = tk.StringVar(value="Parsing XML...")
+        ttk.Label(main_frame, textvariable=status_var).pack(side='top', anchor='w', pady=(5, 10))
+        
+        tree_frame = ttk.Frame(main_frame)
+        tree_frame.pack(fill='both', expand=True)
+        
+        columns = ("change", "left", "right")
+        entry_tree = ttk.Treeview(tree_frame, columns=columns, show="tree headings")
+        entry_tree.heading("#0", text="Entry")
+        entry_tree.heading("change", text="Change")
+        entry_tree.heading("left", text=mod1)
+        entry_tree.heading("right", text=mod2)
+        entry_tree.column("#0", width=420, anchor='w')
+        entry_tree.column("change", width=90, anchor='w', stretch=False)
+        entry_tree.column("left", width=220, anchor='w')
+        entry_tree.column("right", width=220, anchor='w')
+        
+        if self.dark_mode:
+            entry_tree.tag_configure('added', background='#213a21')
+            entry_tree.tag_configure('removed', background='#3a2121')
+            entry_tree.tag_configure('changed', background='#2d2d3a')
+        else:
+            entry_tree.tag_configure('added', background='#e8f5e8')
+            entry_tree.tag_configure('removed', background='#f8d7da')
+            entry_tree.tag_configure('changed', background='#e8eaf5')
+        
+        v_scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=entry_tree.yview)
+        h_scrollbar = ttk.Scrollbar(tree_frame, orient="horizontal", command=entry_tree.xview)
+        entry_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        
+        entry_tree.grid(row=0, column=0, sticky="nsew")
+        v_scrollbar.grid(row=0, column=1, sticky="ns")
+        h_scrollbar.grid(row=1, column=0, sticky="ew")
+        tree_frame.grid_rowconfigure(0, weight=1)
+        tree_frame.grid_columnconfigure(0, weight=1)
+        
+        def show_results(left_entries, right_entries, diff, elapsed):
+            added, removed, changed = diff
+            
+            for key, field_changes in changed:
+                parent = entry_tree.insert("", "end", text=key, values=("Changed", "", ""), tags=('changed',))
+                for path, before, after in field_changes:
+                    entry_tree.insert(parent, "end", text=path, values=("", before, after))
+            for key in removed:
+                entry_tree.insert("", "end", text=key, values=("Removed", "present", ""), tags=('removed',))
+            for key in added:
+                entry_tree.insert("", "end", text=key, values=("Added", "", "present"), tags=('added',))
+            
+            if not (added or removed or changed):
+                status_var.set(f"No structural differences across {len(left_entries)} entries ({elapsed:.2f}s)")
+            else:
+                status_var.set(f"{len(left_entries)} / {len(right_entries)} entries | "
+                               f"{len(changed)} changed | {len(removed)} removed | {len(added)} added "
+                               f"({elapsed:.2f}s)")
+        
+        # Worker results are dropped if the window was closed while they were computed
+        def post(callback):
+            structure_window.after(0, lambda: structure_window.winfo_exists() and callback())
+        
+        def parse_thread():
+            try:
+                started = time.time()
+                left_entries, right_entries, diff = diff_xml_files(mod1_path, mod2_path)
+                elapsed = time.time() - started
+                post(lambda: show_results(left_entries, right_entries, diff, elapsed))
+            except ET.ParseError as e:
+                post(lambda error=str(e): status_var.set(f"Could not parse XML: {error}"))
+            except Exception as e:
+                post(lambda error=str(e): status_var.set(f"An error occurred: {error}"))
+        
+        threading.Thread(target=parse_thread, daemon=True).start()
+        
+    def get_diff_cache(self):
+        from diff_cache import DiffCache
+        from session_store import data_dir
+        
+        # Kept in the per-user data folder; the shared temp folder is writable by other users
+        if self.diff_cache is None:
+            self.diff_cache = DiffCache(disk_dir=os.path.join(data_dir(), "diff_cache"))
+        return self.diff_cache
+        
+    COMPARE_WINDOW_POOL_SIZE = 2
+    
+    def get_compare_palette(self):
+        """Colors for compare windows, built once per theme"""
+        palette = self.compare_palettes.get(self.dark_mode)
+        if palette is None:
+            if self.dark_mode:
+                palette = {
+                    "bg": "#1a1a1a",
+                    "text": "#ffffff",
+                    "line_number_bg": "#2d2d2d",
+                    "line_number_fg": "#888888",
+                    "diff_add": "#213a21",
+                    "diff_remove": "#3a2121",
+                    "diff_change": "#2d2d3a",
+                    "diff_char": "#4b4b7a",
+                    "search_highlight": "#5e4c10",
+                }
+            else:
+                palette = {
+                    "bg": "#ffffff",
+                    "text": "#000000",
+                    "line_number_bg": "#f0f0f0",
+                    "line_number_fg": "#888888",
+                    "diff_add": "#e8f5e8",
+                    "diff_remove": "#f8d7da",
+                    "diff_change": "#e8eaf5",
+                    "diff_char": "#c3c8ef",
+                    "search_highlight": "#fff2cc",
+                }
+            self.compare_palettes[self.dark_mode] = palette
+        return palette
+        
+    def ensure_compare_styles(self):
+        """Create the compare window label styles once for the active ttk theme"""
+        style = ttk.Style(self)
+        theme = style.theme_use()
+        if theme == self.compare_style_theme:
+            return
+        style.configure("CompareLoading.TLabel", font=('Segoe UI', 14))
+        style.configure("CompareTitle.TLabel", font=('Segoe UI', 12, 'bold'))
+        style.configure("CompareHeading.TLabel", font=('Segoe UI', 10, 'bold'))
+        self.compare_style_theme = theme
+        
+    def acquire_compare_window(self):
+        """Return an empty compare window, reusing a pooled one when possible"""
+        self.ensure_compare_styles()
+        
+        window = None
+        while self.compare_window_pool and window is None:
+            candidate = self.compare_window_pool.pop()
+            if candidate.winfo_exists():
+                window = candidate
+                
+        if window is None:
+            window = tk.Toplevel(self)
+            window.protocol("WM_DELETE_WINDOW", lambda: self.release_compare_window(window))
+            # Worker threads schedule callbacks too, so after_ids is only touched under after_lock
+            window.after_lock = threading.Lock()
+            
+        window.release_callbacks = []
+        with window.after_lock:
+            window.after_ids = set()
+        # Threads and timers left over from the window's previous comparison check this and stop
+        window.generation = getattr(window, "generation", 0) + 1
+        return window
+        
+    def compare_after(self, window, generation, delay, callback):
+        """window.after for one comparison; the callback is dropped once that comparison is released"""
+        job = {}
+        
+        def run():
+            with window.after_lock:
+                job["done"] = True
+                window.after_ids.discard(job.get("id"))
+            if window.generation == generation:
+                callback()
+                
+        # window.after is called outside the lock: from a worker it waits for the Tk thread,
+        # which may itself be waiting for the lock in release_compare_window
+        after_id = window.after(delay, run)
+        with window.after_lock:
+            job["id"] = after_id
+            if not job.get("done"):
+                window.after_ids.add(after_id)
+        return after_id
+        
+    def release_compare_window(self, window, generation=None):
+        """Close a compare window, keeping a few hidden for the next comparison
+        
+        When generation is given the window is only released if it still shows that comparison.
+        """
+        if generation is not None and generation != getattr(window, "generation", None):
+            return
+        window.generation = getattr(window, "generation", 0) + 1
+        after_lock = getattr(window, "after_lock", None)
+        if after_lock is not None:
+            with after_lock:
+                after_ids, window.after_ids = window.after_ids, set()
+            # Anything scheduled after the swap sees the new generation and does nothing
+            for after_id in after_ids:
+                window.after_cancel(after_id)
+        
+        callbacks = getattr(window, "release_callbacks", [])
+        window.release_callbacks = []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error closing compare window: {e}")
+                
+        if not window.winfo_exists() or window in self.compare_window_pool:
+            return
+            
+        if len(self.compare_window_pool) >= self.COMPARE_WINDOW_POOL_SIZE:
+            window.destroy()
+            return
+            
+        window.withdraw()
+        for child in window.winfo_children():
+            child.destroy()
+        self.compare_window_pool.append(window)
+        
     def open_comparison_window(self, file_path, mod1, mod2, mod1_path, mod2_path):
+        import bisect
+        import shutil
+        from binary_compare import BINARY_DIFF_OPTIONS, BinaryComparison, MappedFile, compare_binary_files, is_binary_file
+        from compare_widgets import HexView, LineNumberGutter, watch_text_changes
+        from diff_cache import content_digest
+        from text_diff import TEXT_DIFF_OPTIONS, compute_intraline_diffs, decode_text
+        from text_search import SEARCH_MODES, LineOffsetIndex, compile_search_pattern, find_matches
+        from xml_diff import XML_EXTENSIONS
+        
         import re
         import threading
         
-        # Create window immediately
-        compare_window = tk.Toplevel(self)
+        # Create window immediately, reusing a pooled one when available
+        compare_window = self.acquire_compare_window()
+        window_generation = compare_window.generation
+        
+        def schedule(delay, callback):
+            return self.compare_after(compare_window, window_generation, delay, callback)
+        
         compare_window.title(f"Compare: {file_path}")
         compare_window.geometry("1200x800")
         compare_window.minsize(800, 600)
         
-        # Set up colors based on theme
-        if self.dark_mode:
-            sv_ttk.set_theme("dark")
-            bg_color = "#1a1a1a"
-            text_color = "#ffffff"
-            line_number_bg = "#2d2d2d"
-            line_number_fg = "#888888"
-            diff_add_color = "#213a21"
-            diff_remove_color = "#3a2121"
-            diff_change_color = "#2d2d3a"
-            search_highlight = "#5e4c10"
-        else:
-            sv_ttk.set_theme("light")
-            bg_color = "#ffffff"
-            text_color = "#000000"
-            line_number_bg = "#f0f0f0"
-            line_number_fg = "#888888"
-            diff_add_color = "#e8f5e8"
-            diff_remove_color = "#f8d7da"
-            diff_change_color = "#e8eaf5"
-            search_highlight = "#fff2cc"
+        # Colors come from a cached palette so the global theme is left alone
+        palette = self.get_compare_palette()
+        bg_color = palette["bg"]
+        text_color = palette["text"]
+        line_number_bg = palette["line_number_bg"]
+        line_number_fg = palette["line_number_fg"]
+        diff_add_color = palette["diff_add"]
+        diff_remove_color = palette["diff_remove"]
+        diff_change_color = palette["diff_change"]
+        diff_char_color = palette["diff_char"]
+        search_highlight = palette["search_highlight"]
         
         # Create main layout immediately
         main_frame = ttk.Frame(compare_window, padding=10)
@@ -658,7 +1200,7 @@ class ModConflictChecker(tk.Tk):
         
         loading_label = ttk.Label(loading_frame, 
                                 text="Loading comparison...",
-                                font=('Segoe UI', 14))
+                                style="CompareLoading.TLabel")
         loading_label.pack(expand=True)
         
         progress = ttk.Progressbar(loading_frame, mode='indeterminate')
@@ -669,10 +1211,10 @@ class ModConflictChecker(tk.Tk):
         status_label = ttk.Label(loading_frame, textvariable=status_var)
         status_label.pack(pady=10)
         
-        compare_window.update()
+        compare_window.deiconify()
         
         # Function to build UI with content
-        def build_ui(mod1_content, mod2_content, is_binary=False):
+        def build_ui(mod1_content, mod2_content, cache_key=None, cached_intraline=None):
             # Remove loading indicator
             loading_frame.destroy()
             
@@ -682,7 +1224,7 @@ class ModConflictChecker(tk.Tk):
             
             ttk.Label(header_frame, 
                     text=f"Comparing: {file_path}",
-                    font=('Segoe UI', 12, 'bold')).pack(side='top', anchor='w')
+                    style="CompareTitle.TLabel").pack(side='top', anchor='w')
             
             info_frame = ttk.Frame(header_frame)
             info_frame.pack(fill='x', pady=(5, 0))
@@ -739,6 +1281,17 @@ class ModConflictChecker(tk.Tk):
             ttk.Checkbutton(options_frame, text="Sync Scrolling", variable=sync_scroll_var).pack(side='left')
             ttk.Checkbutton(options_frame, text="Backup Before Saving", variable=backup_before_save_var).pack(side='left', padx=(10, 0))
             
+            if file_path.lower().endswith(XML_EXTENSIONS):
+                ttk.Button(options_frame, text="Structural Compare",
+                           command=lambda: self.open_xml_structure_window(
+                               file_path, mod1, mod2, mod1_path, mod2_path)).pack(side='left', padx=(10, 0))
+            
+            search_mode_var = tk.StringVar(value=SEARCH_MODES[0])
+            search_mode_box = ttk.Combobox(options_frame, textvariable=search_mode_var,
+                                           values=SEARCH_MODES, state='readonly', width=12)
+            search_mode_box.pack(side='right')
+            ttk.Label(options_frame, text="Search Mode:").pack(side='right', padx=(0, 5))
+            
             # Editor panes
             paned_window = ttk.PanedWindow(main_frame, orient='horizontal')
             paned_window.pack(fill='both', expand=True)
@@ -749,18 +1302,25 @@ class ModConflictChecker(tk.Tk):
             paned_window.add(left_frame, weight=1)
             paned_window.add(right_frame, weight=1)
             
+            gutter_colors = {
+                "bg": line_number_bg,
+                "fg": line_number_fg,
+                "change": diff_char_color,
+                "add": diff_add_color,
+                "remove": diff_remove_color,
+            }
+            
             # Left editor with line numbers
             left_editor_frame = ttk.Frame(left_frame)
             left_editor_frame.pack(fill='both', expand=True)
             
-            left_line_numbers = tk.Text(left_editor_frame, width=6, padx=5, pady=5, takefocus=0,
-                                    bg=line_number_bg, fg=line_number_fg,
-                                    border=0, font=('Consolas', 10))
-            left_line_numbers.pack(side='left', fill='y')
-            
             left_text = tk.Text(left_editor_frame, wrap='none', padx=5, pady=5,
                             bg=bg_color, fg=text_color, font=('Consolas', 10),
                             undo=True, maxundo=1000)
+            watch_text_changes(left_text)
+            
+            left_gutter = LineNumberGutter(left_editor_frame, left_text, gutter_colors)
+            left_gutter.pack(side='left', fill='y')
             left_text.pack(side='left', fill='both', expand=True)
             
             left_scroll_y = ttk.Scrollbar(left_editor_frame, orient='vertical', command=left_text.yview)
@@ -770,20 +1330,18 @@ class ModConflictChecker(tk.Tk):
             left_scroll_x.pack(side='bottom', fill='x')
             
             left_text.configure(yscrollcommand=left_scroll_y.set, xscrollcommand=left_scroll_x.set)
-            left_line_numbers.configure(yscrollcommand=left_scroll_y.set)
             
             # Right editor with line numbers
             right_editor_frame = ttk.Frame(right_frame)
             right_editor_frame.pack(fill='both', expand=True)
             
-            right_line_numbers = tk.Text(right_editor_frame, width=6, padx=5, pady=5, takefocus=0,
-                                    bg=line_number_bg, fg=line_number_fg,
-                                    border=0, font=('Consolas', 10))
-            right_line_numbers.pack(side='left', fill='y')
-            
             right_text = tk.Text(right_editor_frame, wrap='none', padx=5, pady=5,
                             bg=bg_color, fg=text_color, font=('Consolas', 10),
                             undo=True, maxundo=1000)
+            watch_text_changes(right_text)
+            
+            right_gutter = LineNumberGutter(right_editor_frame, right_text, gutter_colors)
+            right_gutter.pack(side='left', fill='y')
             right_text.pack(side='left', fill='both', expand=True)
             
             right_scroll_y = ttk.Scrollbar(right_editor_frame, orient='vertical', command=right_text.yview)
@@ -793,18 +1351,19 @@ class ModConflictChecker(tk.Tk):
             right_scroll_x.pack(side='bottom', fill='x')
             
             right_text.configure(yscrollcommand=right_scroll_y.set, xscrollcommand=right_scroll_x.set)
-            right_line_numbers.configure(yscrollcommand=right_scroll_y.set)
             
             # Configure tags
             left_text.tag_configure("add", background=diff_add_color)
             left_text.tag_configure("remove", background=diff_remove_color)
             left_text.tag_configure("change", background=diff_change_color)
+            left_text.tag_configure("intraline", background=diff_char_color)
             left_text.tag_configure("search", background=search_highlight)
             left_text.tag_configure("current_search", background=search_highlight, underline=1)
             
             right_text.tag_configure("add", background=diff_add_color)
             right_text.tag_configure("remove", background=diff_remove_color)
             right_text.tag_configure("change", background=diff_change_color)
+            right_text.tag_configure("intraline", background=diff_char_color)
             right_text.tag_configure("search", background=search_highlight)
             right_text.tag_configure("current_search", background=search_highlight, underline=1)
             
@@ -869,113 +1428,246 @@ class ModConflictChecker(tk.Tk):
             save_right_as_btn.config(command=lambda: save_file_as(right_text.get("1.0", "end-1c")))
             save_right_as_btn.pack(side='right', padx=(0, 5))
             
-            # Handle binary files
-            if is_binary:
-                left_text.insert(tk.END, f"Binary file from {mod1}\n")
-                left_text.insert(tk.END, f"Cannot display content - binary files cannot be compared as text.")
-                
-                right_text.insert(tk.END, f"Binary file from {mod2}\n")
-                right_text.insert(tk.END, f"Cannot display content - binary files cannot be compared as text.")
-                
-                left_text.config(state='disabled')
-                right_text.config(state='disabled')
-                return
-            
             # Insert content directly (much faster than chunking for most files)
             left_text.insert("1.0", mod1_content)
             right_text.insert("1.0", mod2_content)
             
-            # Update line numbers
-            def update_line_numbers(text_widget, line_numbers):
-                line_count = text_widget.get("1.0", "end").count("\n")
-                line_numbers_text = "\n".join(str(i) for i in range(1, line_count + 1))
-                line_numbers.config(state='normal')
-                line_numbers.delete("1.0", "end")
-                line_numbers.insert("1.0", line_numbers_text)
-                line_numbers.config(state='disabled')
+            # Loading the content should not count as an edit or be undoable
+            for text_widget in (left_text, right_text):
+                text_widget.edit_reset()
+                text_widget.edit_modified(False)
             
-            update_line_numbers(left_text, left_line_numbers)
-            update_line_numbers(right_text, right_line_numbers)
+            left_lines = mod1_content.splitlines()
+            right_lines = mod2_content.splitlines()
             
             # Sync scrolling
             def sync_scroll_y(*args):
                 if sync_scroll_var.get():
                     left_text.yview_moveto(args[0])
                     right_text.yview_moveto(args[0])
-                    left_line_numbers.yview_moveto(args[0])
-                    right_line_numbers.yview_moveto(args[0])
             
-            left_text.config(yscrollcommand=lambda *args: sync_scroll_y(*args) or left_scroll_y.set(*args))
-            right_text.config(yscrollcommand=lambda *args: sync_scroll_y(*args) or right_scroll_y.set(*args))
+            def on_yscroll(scrollbar, *args):
+                sync_scroll_y(*args)
+                scrollbar.set(*args)
+                left_gutter.schedule_redraw()
+                right_gutter.schedule_redraw()
+                schedule_intraline()
+                schedule_search_paint()
+            
+            left_text.config(yscrollcommand=lambda *args: on_yscroll(left_scroll_y, *args))
+            right_text.config(yscrollcommand=lambda *args: on_yscroll(right_scroll_y, *args))
+            
+            # Intra-line differences are computed off-thread and painted lazily for visible lines
+            intraline_results = {}
+            intraline_applied = set()
+            intraline_cancel = threading.Event()
+            intraline_job = {"timer": None}
+            
+            def visible_line_range(text_widget):
+                first = int(text_widget.index("@0,0").split(".")[0])
+                last = int(text_widget.index(f"@0,{text_widget.winfo_height()}").split(".")[0])
+                return first, last
+            
+            def apply_visible_intraline(batch_size=200):
+                intraline_job["timer"] = None
+                
+                # Edits shift line numbers, so stop painting results computed for the original text
+                if left_text.edit_modified() or right_text.edit_modified():
+                    return
+                
+                left_first, left_last = visible_line_range(left_text)
+                right_first, right_last = visible_line_range(right_text)
+                
+                pending = [i for i in range(min(left_first, right_first) - 1, max(left_last, right_last))
+                           if i in intraline_results and i not in intraline_applied]
+                
+                for i in pending[:batch_size]:
+                    left_ranges, right_ranges = intraline_results[i]
+                    for start, end in left_ranges:
+                        left_text.tag_add("intraline", f"{i+1}.{start}", f"{i+1}.{end}")
+                    for start, end in right_ranges:
+                        right_text.tag_add("intraline", f"{i+1}.{start}", f"{i+1}.{end}")
+                    intraline_applied.add(i)
+                
+                if len(pending) > batch_size:
+                    schedule_intraline(1)
+            
+            def schedule_intraline(delay=50):
+                if intraline_job["timer"] is None and not intraline_cancel.is_set():
+                    intraline_job["timer"] = schedule(delay, apply_visible_intraline)
+            
+            def intraline_worker():
+                completed = compute_intraline_diffs(
+                    left_lines, right_lines, intraline_results, intraline_cancel,
+                    progress_callback=lambda done, total: schedule(0, schedule_intraline)
+                )
+                if completed and cache_key:
+                    cached_value = {
+                        "left": mod1_content,
+                        "right": mod2_content,
+                        "intraline": [[i, left, right] for i, (left, right) in intraline_results.items()],
+                    }
+                    cached_size = len(mod1_content) + len(mod2_content) + 64 * len(intraline_results)
+                    self.get_diff_cache().put(cache_key, cached_value, cached_size)
             
-            # Search functionality
-            left_search_matches = []
-            right_search_matches = []
-            left_current_match = tk.IntVar(value=-1)
-            right_current_match = tk.IntVar(value=-1)
+            compare_window.release_callbacks.append(intraline_cancel.set)
             
-            def search_text(text_widget, search_var, count_var):
-                search_term = search_var.get()
+            if cached_intraline is not None:
+                intraline_results.update(cached_intraline)
+                schedule(0, schedule_intraline)
+            else:
+                threading.Thread(target=intraline_worker, daemon=True).start()
+            
+            # Search runs over the in-memory content in a worker, only visible hits get tagged
+            search_states = {
+                "left": {"text": left_text, "var": left_search_var, "count": left_search_count,
+                         "content": mod1_content, "index": None},
+                "right": {"text": right_text, "var": right_search_var, "count": right_search_count,
+                          "content": mod2_content, "index": None},
+            }
+            for state in search_states.values():
+                state.update(matches=[], current=-1, generation=0, timer=None)
+            
+            search_paint_job = {"timer": None}
+            
+            def build_line_indexes():
+                for state in search_states.values():
+                    content = state["content"]
+                    index = LineOffsetIndex(content)
+                    if state["content"] is content:
+                        state["index"] = index
+            
+            threading.Thread(target=build_line_indexes, daemon=True).start()
+            
+            def schedule_search(side, delay=250):
+                state = search_states[side]
+                if state["timer"]:
+                    compare_window.after_cancel(state["timer"])
+                state["timer"] = schedule(delay, lambda: run_search(side))
+            
+            def run_search(side):
+                state = search_states[side]
+                state["timer"] = None
+                state["generation"] += 1
+                generation = state["generation"]
+                
+                text_widget = state["text"]
                 text_widget.tag_remove("search", "1.0", "end")
                 text_widget.tag_remove("current_search", "1.0", "end")
+                state["matches"] = []
+                state["current"] = -1
                 
+                search_term = state["var"].get()
                 if not search_term:
-                    count_var.set("0 matches")
-                    return []
+                    state["count"].set("0 matches")
+                    return
                 
-                matches = []
-                start_pos = "1.0"
+                try:
+                    pattern = compile_search_pattern(search_term, search_mode_var.get())
+                except re.error:
+                    state["count"].set("Invalid pattern")
+                    return
                 
-                while True:
-                    start_pos = text_widget.search(search_term, start_pos, stopindex="end", nocase=True)
-                    if not start_pos:
-                        break
-                        
-                    end_pos = f"{start_pos}+{len(search_term)}c"
-                    text_widget.tag_add("search", start_pos, end_pos)
-                    matches.append(start_pos)
-                    start_pos = end_pos
+                content = text_widget.get("1.0", "end-1c")
+                if content != state["content"]:
+                    state["content"] = content
+                    state["index"] = None
+                line_index = state["index"]
                 
-                count_var.set(f"{len(matches)} matches")
-                return matches
+                state["count"].set("Searching...")
+                
+                def search_worker():
+                    is_cancelled = lambda: state["generation"] != generation
+                    matches = find_matches(content, pattern, is_cancelled)
+                    if matches is None or is_cancelled():
+                        return
+                    index = line_index or LineOffsetIndex(content)
+                    schedule(0, lambda: finish_search(side, generation, matches, index))
+                
+                threading.Thread(target=search_worker, daemon=True).start()
             
-            def navigate_search(text_widget, matches, current_match, direction, search_term):
+            def finish_search(side, generation, matches, index):
+                state = search_states[side]
+                if state["generation"] != generation:
+                    return
+                state["matches"] = matches
+                state["index"] = index
+                state["count"].set(f"{len(matches):,} matches")
+                paint_visible_matches(side)
+            
+            def paint_visible_matches(side, limit=2000):
+                state = search_states[side]
+                text_widget = state["text"]
+                matches = state["matches"]
+                index = state["index"]
+                
+                text_widget.tag_remove("search", "1.0", "end")
+                if not matches or index is None:
+                    return
+                
+                first, last = visible_line_range(text_widget)
+                lo = bisect.bisect_left(matches, (index.line_start(first), -1))
+                if last >= index.line_count:
+                    hi = len(matches)
+                else:
+                    hi = bisect.bisect_left(matches, (index.line_start(last + 1), -1))
+                
+                ranges = []
+                for start, end in matches[lo:min(hi, lo + limit)]:
+                    ranges.extend((index.to_tk_index(start), index.to_tk_index(end)))
+                if ranges:
+                    text_widget.tag_add("search", *ranges)
+            
+            def schedule_search_paint(delay=50):
+                if search_paint_job["timer"] is None:
+                    search_paint_job["timer"] = schedule(delay, repaint_searches)
+            
+            def repaint_searches():
+                search_paint_job["timer"] = None
+                for side in search_states:
+                    paint_visible_matches(side)
+            
+            def navigate_search(side, direction):
+                state = search_states[side]
+                matches = state["matches"]
                 if not matches:
                     return
-                    
+                
                 total = len(matches)
                 if direction == "next":
-                    new_index = (current_match.get() + 1) % total
+                    new_index = (state["current"] + 1) % total
                 else:
-                    new_index = (current_match.get() - 1) % total
-                    
-                current_match.set(new_index)
-                match_pos = matches[new_index]
+                    new_index = (state["current"] - 1) % total
+                state["current"] = new_index
                 
-                text_widget.see(match_pos)
+                index = state["index"]
+                start, end = matches[new_index]
+                start_pos = index.to_tk_index(start)
                 
+                text_widget = state["text"]
+                text_widget.see(start_pos)
                 text_widget.tag_remove("current_search", "1.0", "end")
-                end_pos = f"{match_pos}+{len(search_term)}c"
-                text_widget.tag_add("current_search", match_pos, end_pos)
+                text_widget.tag_add("current_search", start_pos, index.to_tk_index(end))
+                state["count"].set(f"{new_index + 1:,} of {total:,} matches")
+            
+            # Keep hit positions valid after edits
+            def on_text_changed(side):
+                if search_states[side]["var"].get():
+                    schedule_search(side, 500)
+            
+            left_text.bind("<<TextChanged>>", lambda e: on_text_changed("left"), add="+")
+            right_text.bind("<<TextChanged>>", lambda e: on_text_changed("right"), add="+")
             
             # Configure search buttons
-            left_search_var.trace_add("write", lambda *args: 
-                compare_window.after(300, lambda: 
-                    setattr(compare_window, '_left_matches', search_text(left_text, left_search_var, left_search_count))))
-                    
-            right_search_var.trace_add("write", lambda *args: 
-                compare_window.after(300, lambda: 
-                    setattr(compare_window, '_right_matches', search_text(right_text, right_search_var, right_search_count))))
+            left_search_var.trace_add("write", lambda *args: schedule_search("left"))
+            right_search_var.trace_add("write", lambda *args: schedule_search("right"))
+            search_mode_var.trace_add("write", lambda *args: (schedule_search("left", 0), schedule_search("right", 0)))
             
-            left_search_next.config(command=lambda: navigate_search(
-                left_text, getattr(compare_window, '_left_matches', []), left_current_match, "next", left_search_var.get()))
-            left_search_prev.config(command=lambda: navigate_search(
-                left_text, getattr(compare_window, '_left_matches', []), left_current_match, "previous", left_search_var.get()))
+            left_search_next.config(command=lambda: navigate_search("left", "next"))
+            left_search_prev.config(command=lambda: navigate_search("left", "previous"))
             
-            right_search_next.config(command=lambda: navigate_search(
-                right_text, getattr(compare_window, '_right_matches', []), right_current_match, "next", right_search_var.get()))
-            right_search_prev.config(command=lambda: navigate_search(
-                right_text, getattr(compare_window, '_right_matches', []), right_current_match, "previous", right_search_var.get()))
+            right_search_next.config(command=lambda: navigate_search("right", "next"))
+            right_search_prev.config(command=lambda: navigate_search("right", "previous"))
             
             # Create a status bar for highlighting progress
             status_frame = ttk.Frame(main_frame)
@@ -989,9 +1681,6 @@ class ModConflictChecker(tk.Tk):
             
             # Highlight differences directly in the main thread for better reliability
             def highlight_differences():
-                left_lines = mod1_content.splitlines()
-                right_lines = mod2_content.splitlines()
-                
                 min_len = min(len(left_lines), len(right_lines))
                 total_lines = max(len(left_lines), len(right_lines))
                 
@@ -1015,9 +1704,12 @@ class ModConflictChecker(tk.Tk):
                             left_text.tag_add("change", f"{i+1}.0", f"{i+1}.end+1c")
                             right_text.tag_add("change", f"{i+1}.0", f"{i+1}.end+1c")
                     
+                    left_gutter.schedule_redraw()
+                    right_gutter.schedule_redraw()
+                    
                     # Schedule next batch or finish
                     if end_idx < min_len:
-                        compare_window.after(1, lambda: process_batch(end_idx))
+                        schedule(1, lambda: process_batch(end_idx))
                     else:
                         # Handle different lengths
                         if len(left_lines) > len(right_lines):
@@ -1032,59 +1724,172 @@ class ModConflictChecker(tk.Tk):
                         highlight_status.config(text=f"Completed - {total_lines} lines analyzed")
                         
                         # Hide progress after a delay
-                        compare_window.after(1000, lambda: status_frame.pack_forget())
+                        schedule(1000, lambda: status_frame.pack_forget())
                 
                 # Start processing
                 process_batch()
             
             # Start highlighting after a short delay to let the UI render
-            compare_window.after(100, highlight_differences)
-        
-        # Load files in background thread
-        def load_files_thread():
-            try:
-                status_var.set("Checking file types...")
-                
-                # Check if file is binary
-                def is_binary(file_path):
-                    try:
-                        with open(file_path, 'rb') as f:
-                            chunk = f.read(1024)
-                            return b'\0' in chunk
-                    except:
-                        return True
-                
-                is_binary_file = is_binary(mod1_path) or is_binary(mod2_path)
-                
-                if is_binary_file:
-                    compare_window.after(0, lambda: build_ui("", "", True))
-                    return
-                
-                status_var.set("Loading files...")
-                
-                # Load files directly - much faster than using ThreadPoolExecutor for most files
-                try:
-                    with open(mod1_path, 'r', encoding='utf-8', errors='replace') as f:
-                        mod1_content = f.read()
-                    with open(mod2_path, 'r', encoding='utf-8', errors='replace') as f:
-                        mod2_content = f.read()
-                    
-                    compare_window.after(0, lambda: build_ui(mod1_content, mod2_content))
-                except Exception as e:
-                    compare_window.after(0, lambda: messagebox.showerror("Error", f"Failed to load files: {str(e)}"))
-                    compare_window.after(0, lambda: compare_window.destroy())
-                
-            except Exception as e:
-                compare_window.after(0, lambda: messagebox.showerror("Error", f"An error occurred: {str(e)}"))
-                compare_window.after(0, lambda: compare_window.destroy())
-        
-        # Start loading files
-        threading.Thread(target=load_files_thread, daemon=True).start()
-
+            schedule(100, highlight_differences)
         
-    def apply_tree_tags(self):
-        if hasattr(self, 'type_tree'):
-            self.type_tree.tag_configure('file_item', foreground='#4a9eff')
+        # Binary files get a block-hash summary and a virtualized hex view
+        def build_binary_ui(left_file, right_file, comparison):
+            loading_frame.destroy()
+            
+            compare_window.release_callbacks.append(left_file.close)
+            compare_window.release_callbacks.append(right_file.close)
+            
+            header_frame = ttk.Frame(main_frame)
+            header_frame.pack(fill='x', pady=(0, 10))
+            
+            ttk.Label(header_frame, 
+                    text=f"Comparing: {file_path} (binary)",
+                    style="CompareTitle.TLabel").pack(side='top', anchor='w')
+            
+            info_frame = ttk.Frame(header_frame)
+            info_frame.pack(fill='x', pady=(5, 0))
+            
+            ttk.Label(info_frame, text=f"Left: {mod1} ({left_file.size:,} bytes)").pack(side='left')
+            ttk.Label(info_frame, text=f"Right: {mod2} ({right_file.size:,} bytes)").pack(side='right')
+            
+            summary_frame = ttk.Frame(main_frame)
+            summary_frame.pack(fill='x', pady=(0, 10))
+            
+            ttk.Label(summary_frame, text=comparison.summary_text(),
+                    style="CompareHeading.TLabel").pack(side='left')
+            
+            region_prev = ttk.Button(summary_frame, text="◀", width=2)
+            region_next = ttk.Button(summary_frame, text="▶", width=2)
+            region_next.pack(side='right')
+            region_prev.pack(side='right', padx=(0, 2))
+            
+            region_var = tk.StringVar(value="")
+            ttk.Label(summary_frame, textvariable=region_var).pack(side='right', padx=(0, 10))
+            
+            hex_colors = {
+                "bg": bg_color,
+                "fg": text_color,
+                "offset": line_number_fg,
+                "diff": diff_remove_color,
+                "missing": diff_add_color,
+            }
+            
+            paned_window = ttk.PanedWindow(main_frame, orient='horizontal')
+            paned_window.pack(fill='both', expand=True)
+            
+            views = {}
+            
+            def sync_views(source, row):
+                other = views["right"] if source == "left" else views["left"]
+                other.goto_row(row, notify=False)
+            
+            views["left"] = HexView(paned_window, left_file, right_file, hex_colors,
+                                    on_scroll=lambda row: sync_views("left", row))
+            views["right"] = HexView(paned_window, right_file, left_file, hex_colors,
+                                     on_scroll=lambda row: sync_views("right", row))
+            paned_window.add(views["left"], weight=1)
+            paned_window.add(views["right"], weight=1)
+            
+            current_region = tk.IntVar(value=-1)
+            
+            def goto_region(direction):
+                regions = comparison.regions
+                if not regions:
+                    return
+                step = 1 if direction == "next" else -1
+                index = (current_region.get() + step) % len(regions)
+                current_region.set(index)
+                start, end = regions[index]
+                region_var.set(f"Region {index + 1}/{len(regions)}: 0x{start:08X} ({end - start:,} bytes)")
+                views["left"].goto_offset(start)
+                views["right"].goto_offset(start)
+            
+            region_next.config(command=lambda: goto_region("next"))
+            region_prev.config(command=lambda: goto_region("previous"))
+            
+            if comparison.regions:
+                schedule(100, lambda: goto_region("next"))
+        
+        # Load files in background thread
+        def load_files_thread():
+            try:
+                cache = self.get_diff_cache()
+                
+                # Unchanged files are recognised by their stat, so a cached comparison skips the read
+                status_var.set("Checking comparison cache...")
+                left_digest = cache.known_digest(mod1_path)
+                right_digest = cache.known_digest(mod2_path)
+                if left_digest and right_digest:
+                    text_key = cache.make_key(left_digest, right_digest, TEXT_DIFF_OPTIONS)
+                    cached = cache.get(text_key)
+                    if cached is not None:
+                        cached_intraline = {i: (left, right) for i, left, right in cached["intraline"]}
+                        schedule(0, lambda: build_ui(cached["left"], cached["right"], text_key, cached_intraline))
+                        return
+                    
+                    cached = cache.get(cache.make_key(left_digest, right_digest, BINARY_DIFF_OPTIONS))
+                    if cached is not None:
+                        comparison = BinaryComparison.from_dict(cached)
+                        left_file = MappedFile(mod1_path)
+                        right_file = MappedFile(mod2_path)
+                        schedule(0, lambda: build_binary_ui(left_file, right_file, comparison))
+                        return
+                
+                status_var.set("Checking file types...")
+                
+                if is_binary_file(mod1_path) or is_binary_file(mod2_path):
+                    status_var.set("Mapping binary files...")
+                    left_file = MappedFile(mod1_path)
+                    right_file = MappedFile(mod2_path)
+                    
+                    def report_progress(done, total):
+                        status_var.set(f"Hashing blocks... ({done}/{total})")
+                    
+                    comparison = compare_binary_files(left_file, right_file, report_progress)
+                    
+                    cache.remember_digest(mod1_path, comparison.left_digest)
+                    cache.remember_digest(mod2_path, comparison.right_digest)
+                    cache.put(cache.make_key(comparison.left_digest, comparison.right_digest, BINARY_DIFF_OPTIONS),
+                              comparison.to_dict(), 64 * (len(comparison.regions) + 1))
+                    
+                    schedule(0, lambda: build_binary_ui(left_file, right_file, comparison))
+                    return
+                
+                status_var.set("Loading files...")
+                
+                # Load files directly - much faster than using ThreadPoolExecutor for most files
+                try:
+                    with open(mod1_path, 'rb') as f:
+                        mod1_raw = f.read()
+                    with open(mod2_path, 'rb') as f:
+                        mod2_raw = f.read()
+                    
+                    left_digest = content_digest(mod1_raw)
+                    right_digest = content_digest(mod2_raw)
+                    cache.remember_digest(mod1_path, left_digest)
+                    cache.remember_digest(mod2_path, right_digest)
+                    text_key = cache.make_key(left_digest, right_digest, TEXT_DIFF_OPTIONS)
+                    
+                    mod1_content = decode_text(mod1_raw)
+                    mod2_content = decode_text(mod2_raw)
+                    del mod1_raw, mod2_raw
+                    
+                    schedule(0, lambda: build_ui(mod1_content, mod2_content, text_key))
+                except Exception as e:
+                    schedule(0, lambda error=str(e): messagebox.showerror("Error", f"Failed to load files: {error}"))
+                    schedule(0, lambda: self.release_compare_window(compare_window, window_generation))
+                
+            except Exception as e:
+                schedule(0, lambda error=str(e): messagebox.showerror("Error", f"An error occurred: {error}"))
+                schedule(0, lambda: self.release_compare_window(compare_window, window_generation))
+        
+        # Start loading files
+        threading.Thread(target=load_files_thread, daemon=True).start()
+
+        
+    def apply_tree_tags(self):
+        if hasattr(self, 'type_tree'):
+            self.type_tree.tag_configure('file_item', foreground='#4a9eff')
         
         if hasattr(self, 'tree'):
             if self.dark_mode:
@@ -1286,6 +2091,9 @@ class ModConflictChecker(tk.Tk):
             self.results_count.config(text="0 conflicts found")
             
     def update_excluded_tree(self):
+        if not hasattr(self, 'excluded_tree'):
+            return
+            
         for item in self.excluded_tree.get_children():
             self.excluded_tree.delete(item)
             
@@ -1482,107 +2290,421 @@ class ModConflictChecker(tk.Tk):
         
         threading.Thread(target=self.scan_conflicts, args=(lml_dir,), daemon=True).start()
         
-    def scan_conflicts(self, lml_dir):
+    def scan_conflicts(self, lml_dir, warm_start=False):
+        """Scan on a worker thread, rescanning only mods that changed since the last scan
+        
+        On a warm start the saved scan is shown first and then brought up to date.
+        """
+        from session_store import refresh_mods, same_dir
+        from scan_history import ScanHistory
+        
         try:
-            cache_file = os.path.join(tempfile.gettempdir(), "rdr2_mod_cache.json")
-            use_cache = False
-            
-            if os.path.exists(cache_file):
-                cache_time = os.path.getmtime(cache_file)
-                if time.time() - cache_time < 3600:
-                    try:
-                        with open(cache_file, 'r') as f:
-                            cache_data = json.load(f)
-                            
-                        if cache_data.get("lml_dir") == lml_dir:
-                            files_map = cache_data.get("files_map", {})
-                            use_cache = True
-                    except:
-                        pass
+            mods = {}
+            if warm_start:
+                saved = self.session_store.load_scan(lml_dir)
+                if saved:
+                    saved_conflicts, mods = saved
+                    self.after(0, lambda: self.show_scan_results(saved_conflicts))
+            elif same_dir(self.scan_mods_dir, lml_dir):
+                mods = dict(self.scan_mods)
+            
+            files_map, conflicts, changed = refresh_mods(
+                lml_dir, mods,
+                on_update=lambda partial: self.after(0, lambda: self.show_scan_results(partial)))
+            
+            self.scan_mods_dir = lml_dir
+            self.scan_mods = mods
+            if not changed:
+                self.after(0, lambda: self.scan_complete(conflicts, notify=not warm_start))
+                return
             
-            if not use_cache:
-                files_map = self.gather_mod_files_optimized(lml_dir)
-                
+            # The results go on screen now, but the next scan has to wait until the
+            # session and history below are written, or two scans would write them at once
+            self.after(0, lambda: self.scan_complete(conflicts, notify=not warm_start, saving=True))
+            try:
                 try:
-                    cache_data = {
-                        "lml_dir": lml_dir,
-                        "files_map": files_map,
-                        "timestamp": time.time()
-                    }
-                    with open(cache_file, 'w') as f:
-                        json.dump(cache_data, f)
-                except:
-                    pass
-            
-            self.conflicts = {path: mods for path, mods in files_map.items() if len(mods) > 1}
-            
-            all_mods = set()
-            for mods in self.conflicts.values():
-                all_mods.update(mods)
-            
-            colors = ['#ff6b6b', '#4ecdc4', '#45b7d1', '#96ceb4', '#feca57', 
-                     '#ff9ff3', '#54a0ff', '#5f27cd', '#00d2d3', '#ff9f43']
-            
-            self.mod_colors = {}
-            for i, mod in enumerate(sorted(all_mods)):
-                self.mod_colors[mod] = colors[i % len(colors)]
-            
-            self.after(0, self.scan_complete)
+                    self.session_store.save_scan(lml_dir, conflicts, mods)
+                except OSError as e:
+                    print(f"Failed to save scan: {e}")
+                try:
+                    ScanHistory(lml_dir).record_scan(files_map)
+                except Exception as e:
+                    print(f"Failed to record scan history: {e}")
+            finally:
+                self.after(0, self.scan_finished)
             
         except Exception as e:
-            self.after(0, lambda: messagebox.showerror("Error", f"An error occurred: {str(e)}"))
+            self.after(0, lambda error=str(e): messagebox.showerror("Error", f"An error occurred: {error}"))
             self.after(0, self.scan_complete)
             
-    def gather_mod_files_optimized(self, mods_dir):
-        files_map = defaultdict(list)
+    def show_scan_results(self, conflicts):
+        """Show a scan result, which may still be partial while changed mods are rescanned"""
+        self.conflicts = conflicts
         
-        mods = [d for d in os.listdir(mods_dir) if os.path.isdir(os.path.join(mods_dir, d))]
-        total_mods = len(mods)
-        
-        def process_mod(mod_name):
-            mod_files = {}
-            mod_path = os.path.join(mods_dir, mod_name)
-            
-            for root, _, files in os.walk(mod_path):
-                for fname in files:
-                    rel_root = os.path.relpath(root, mod_path)
-                    rel_path = fname if rel_root == '.' else os.path.join(rel_root, fname)
-                    mod_files[rel_path] = mod_name
-            
-            return mod_files
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4)) as executor:
-            futures = {executor.submit(process_mod, mod): mod for mod in mods}
-            
-            for future in concurrent.futures.as_completed(futures):
-                mod = futures[future]
-                try:
-                    mod_files = future.result()
-                    for rel_path, _ in mod_files.items():
-                        files_map[rel_path].append(mod)
-                except Exception as e:
-                    print(f"Error processing mod {mod}: {e}")
+        all_mods = set()
+        for mods in conflicts.values():
+            all_mods.update(mods)
         
-        return files_map
+        colors = ['#ff6b6b', '#4ecdc4', '#45b7d1', '#96ceb4', '#feca57', 
+                 '#ff9ff3', '#54a0ff', '#5f27cd', '#00d2d3', '#ff9f43']
         
-    def scan_complete(self):
-        self.is_scanning = False
-        self.scan_btn.config(text="Scan for Conflicts", state='normal')
-        self.config(cursor="")
+        self.mod_colors = {}
+        for i, mod in enumerate(sorted(all_mods)):
+            self.mod_colors[mod] = colors[i % len(colors)]
         
         self.update_tree()
         self.update_type_tree()
         self.update_summary()
+        if self.toggle_visible.get():
+            self.update_file_type_toggles()
         
         has_gxt2 = any(path.endswith('.gxt2') for path in self.conflicts)
         if has_gxt2:
-            self.gxt2_warning.pack(fill='x', pady=(0, 10))
-        else:
+            self.ensure_gxt2_warning()
+            self.gxt2_warning.pack(fill='x', pady=(0, 10), before=self.results_header)
+        elif hasattr(self, 'gxt2_warning'):
             self.gxt2_warning.pack_forget()
+            
+    def scan_complete(self, conflicts=None, notify=True, saving=False):
+        """Show the final scan result; with saving set the scan stays running until scan_finished"""
+        if saving:
+            self.scan_btn.config(text="Saving scan...")
+        else:
+            self.scan_finished()
         
-        if not self.conflicts:
+        if conflicts is None:
+            conflicts = self.conflicts
+        else:
+            self.save_session()
+        # A warm start that found no changes leaves the saved results on screen untouched
+        if notify or conflicts != self.conflicts:
+            self.show_scan_results(conflicts)
+        
+        if notify and not self.conflicts:
             messagebox.showinfo("No Conflicts", "No conflicts detected in your mods!")
             
+    def scan_finished(self):
+        self.is_scanning = False
+        self.scan_btn.config(text="Scan for Conflicts", state='normal')
+        self.config(cursor="")
+            
+    def show_scan_history(self):
+        """List the recorded scans of the current LML folder and compare any two of them"""
+        from scan_history import ScanHistory
+        
+        lml_dir = self.path_var.get().strip()
+        if not os.path.isdir(lml_dir):
+            messagebox.showerror("Error", "Please select a valid LML directory first.")
+            return
+        
+        history = ScanHistory(lml_dir)
+        scans = history.load_index()
+        if not scans:
+            messagebox.showinfo("Scan History", "No scans have been recorded for this folder yet.")
+            return
+        
+        history_window = tk.Toplevel(self)
+        history_window.title("Scan History")
+        history_window.geometry("760x420")
+        history_window.transient(self)
+        
+        ttk.Label(history_window, text="Select one scan to compare with the scan before it, or two scans to compare them:",
+                font=('Segoe UI', 11)).pack(pady=(15, 10), padx=15, anchor='w')
+        
+        tree_frame = ttk.Frame(history_window)
+        tree_frame.pack(fill='both', expand=True, padx=15)
+        
+        columns = ("date", "mods", "files", "conflicts", "changes")
+        scan_tree = ttk.Treeview(tree_frame, columns=columns, show="headings", selectmode="extended")
+        scan_tree.heading("date", text="Scanned")
+        scan_tree.heading("mods", text="Mods")
+        scan_tree.heading("files", text="Files")
+        scan_tree.heading("conflicts", text="Conflicts")
+        scan_tree.heading("changes", text="Files Added / Removed")
+        scan_tree.column("date", width=170, anchor='w')
+        scan_tree.column("mods", width=80, anchor='e')
+        scan_tree.column("files", width=100, anchor='e')
+        scan_tree.column("conflicts", width=100, anchor='e')
+        scan_tree.column("changes", width=200, anchor='e')
+        
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=scan_tree.yview)
+        scan_tree.configure(yscrollcommand=scrollbar.set)
+        scan_tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+        
+        scans_by_item = {}
+        for scan in reversed(scans):
+            changes = f"+{scan['added']:,} / -{scan['removed']:,}" if scan["id"] != scans[0]["id"] else "First scan"
+            item = scan_tree.insert("", "end", values=(scan["time"], f"{scan['mods']:,}", f"{scan['files']:,}",
+                                                       f"{scan['conflicts']:,}", changes))
+            scans_by_item[item] = scan
+        
+        def on_compare():
+            selected = sorted((scans_by_item[item] for item in scan_tree.selection()), key=lambda scan: scan["id"])
+            if len(selected) == 1:
+                position = scans.index(selected[0])
+                if position == 0:
+                    messagebox.showinfo("Scan History", "The first scan has nothing before it to compare with.",
+                                        parent=history_window)
+                    return
+                selected.insert(0, scans[position - 1])
+            if len(selected) != 2:
+                messagebox.showinfo("Scan History", "Select one or two scans to compare.", parent=history_window)
+                return
+            self.show_scan_changes(history, selected[0], selected[1])
+        
+        scan_tree.bind("<Double-1>", lambda event: on_compare())
+        
+        button_frame = ttk.Frame(history_window)
+        button_frame.pack(fill='x', padx=15, pady=15)
+        ttk.Button(button_frame, text="Close", command=history_window.destroy).pack(side='left')
+        ttk.Button(button_frame, text="Compare Selected", style='Accent.TButton',
+                  command=on_compare).pack(side='right')
+        
+    def show_scan_changes(self, history, old_scan, new_scan):
+        """Show conflicts that appeared, went away or changed mods between two recorded scans"""
+        changes_window = tk.Toplevel(self)
+        changes_window.title(f"Conflict Changes: {old_scan['time']} → {new_scan['time']}")
+        changes_window.geometry("900x600")
+        changes_window.minsize(600, 400)
+        
+        main_frame = ttk.Frame(changes_window, padding=10)
+        main_frame.pack(fill='both', expand=True)
+        
+        ttk.Label(main_frame,
+                text=f"Conflicts from the scan of {old_scan['time']} to the scan of {new_scan['time']}",
+                font=('Segoe UI', 12, 'bold')).pack(side='top', anchor='w')
+        
+        status_var = tk.StringVar(value="Rebuilding scans from history...")
+        ttk.Label(main_frame, textvariable=status_var).pack(side='top', anchor='w', pady=(5, 10))
+        
+        tree_frame = ttk.Frame(main_frame)
+        tree_frame.pack(fill='both', expand=True)
+        
+        changes_tree = ttk.Treeview(tree_frame, columns=("mods",), show="tree headings")
+        changes_tree.heading("#0", text="Change / File")
+        changes_tree.heading("mods", text="Mods")
+        changes_tree.column("#0", width=420, anchor='w')
+        changes_tree.column("mods", width=440, anchor='w')
+        
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=changes_tree.yview)
+        changes_tree.configure(yscrollcommand=scrollbar.set)
+        changes_tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        max_rows_per_group = 5000
+        pending_children = {}
+        
+        def mods_text(row, kind):
+            if kind != "changed":
+                return ", ".join(sorted(row[1]))
+            _, old_mods, new_mods = row
+            parts = [f"+{mod}" for mod in sorted(new_mods - old_mods)]
+            parts.extend(f"-{mod}" for mod in sorted(old_mods - new_mods))
+            return ", ".join(parts)
+        
+        # Rows are only inserted when their group is expanded
+        def on_open(event):
+            item = changes_tree.focus()
+            group = pending_children.pop(item, None)
+            if group is None:
+                return
+            kind, rows = group
+            changes_tree.delete(*changes_tree.get_children(item))
+            for row in rows[:max_rows_per_group]:
+                changes_tree.insert(item, "end", text=row[0], values=(mods_text(row, kind),))
+            if len(rows) > max_rows_per_group:
+                changes_tree.insert(item, "end", text=f"... {len(rows) - max_rows_per_group:,} more", values=("",))
+        
+        changes_tree.bind("<<TreeviewOpen>>", on_open)
+        
+        def show_changes(changes, elapsed):
+            if not changes_window.winfo_exists():
+                return
+            labels = {"new": "New conflicts", "resolved": "Resolved conflicts", "changed": "Changed conflicts"}
+            for kind, label in labels.items():
+                rows = changes[kind]
+                item = changes_tree.insert("", "end", text=f"{label} ({len(rows):,})", values=("",))
+                if rows:
+                    changes_tree.insert(item, "end", text="Loading...")
+                    pending_children[item] = (kind, rows)
+            status_var.set(f"{len(changes['new']):,} new, {len(changes['resolved']):,} resolved, "
+                           f"{len(changes['changed']):,} changed ({elapsed:.1f}s)")
+        
+        def compare_thread():
+            try:
+                start_time = time.time()
+                changes = history.compare(old_scan["id"], new_scan["id"])
+                elapsed = time.time() - start_time
+                self.after(0, lambda: show_changes(changes, elapsed))
+            except Exception as e:
+                self.after(0, lambda error=str(e): status_var.set(f"Failed to compare scans: {error}"))
+        
+        threading.Thread(target=compare_thread, daemon=True).start()
+        
+    def auto_merge_conflicts(self):
+        from auto_merge import MERGEABLE_EXTENSIONS
+        
+        lml_dir = self.path_var.get().strip()
+        if not os.path.isdir(lml_dir):
+            messagebox.showerror("Error", "Please select a valid LML directory first.")
+            return
+            
+        mergeable = {path: mods for path, mods in self.conflicts.items()
+                     if path not in self.excluded_files and path.lower().endswith(MERGEABLE_EXTENSIONS)}
+        if not mergeable:
+            messagebox.showinfo("No Data", f"No conflicting text files ({', '.join(MERGEABLE_EXTENSIONS)}) to merge.")
+            return
+            
+        merge_dialog = tk.Toplevel(self)
+        merge_dialog.title("Auto-Merge Text Conflicts")
+        merge_dialog.geometry("560x260")
+        merge_dialog.transient(self)
+        merge_dialog.grab_set()
+        merge_dialog.resizable(False, False)
+        
+        ttk.Label(merge_dialog, 
+                 text=f"Merge {len(mergeable)} conflicting text files",
+                 font=('Segoe UI', 11, 'bold')).pack(pady=(15, 10), padx=20, anchor='w')
+        
+        form = ttk.Frame(merge_dialog)
+        form.pack(fill='x', padx=20)
+        form.grid_columnconfigure(1, weight=1)
+        
+        staging_var = tk.StringVar(value=os.path.join(os.path.dirname(lml_dir), "LML_Merged"))
+        base_var = tk.StringVar()
+        
+        def browse(var, title):
+            folder = filedialog.askdirectory(title=title, parent=merge_dialog)
+            if folder:
+                var.set(folder)
+        
+        ttk.Label(form, text="Output folder:").grid(row=0, column=0, sticky='w', pady=5)
+        ttk.Entry(form, textvariable=staging_var).grid(row=0, column=1, sticky='ew', padx=5)
+        ttk.Button(form, text="Browse",
+                   command=lambda: browse(staging_var, "Select Merge Output Folder")).grid(row=0, column=2)
+        
+        ttk.Label(form, text="Base files (optional):").grid(row=1, column=0, sticky='w', pady=5)
+        ttk.Entry(form, textvariable=base_var).grid(row=1, column=1, sticky='ew', padx=5)
+        ttk.Button(form, text="Browse",
+                   command=lambda: browse(base_var, "Select Folder With Original Files")).grid(row=1, column=2)
+        
+        ttk.Label(merge_dialog,
+                 text="Without base files, the first mod's version is used as the base.",
+                 font=('Segoe UI', 9)).pack(padx=20, pady=(5, 0), anchor='w')
+        
+        button_frame = ttk.Frame(merge_dialog)
+        button_frame.pack(fill='x', pady=(20, 10), padx=20)
+        
+        def on_confirm():
+            staging_dir = staging_var.get().strip()
+            base_dir = base_var.get().strip() or None
+            if not staging_dir:
+                messagebox.showerror("Error", "Please choose an output folder.", parent=merge_dialog)
+                return
+            if base_dir and not os.path.isdir(base_dir):
+                messagebox.showerror("Error", f"'{base_dir}' is not a valid directory.", parent=merge_dialog)
+                return
+            staging_abs = os.path.normcase(os.path.abspath(staging_dir))
+            lml_abs = os.path.normcase(os.path.abspath(lml_dir))
+            if staging_abs == lml_abs or staging_abs.startswith(lml_abs + os.sep):
+                messagebox.showerror("Error", "The output folder must not be the LML folder or inside it.", parent=merge_dialog)
+                return
+            merge_dialog.destroy()
+            self.perform_auto_merge(lml_dir, mergeable, staging_dir, base_dir)
+        
+        ttk.Button(button_frame, text="Cancel", command=merge_dialog.destroy).pack(side='left')
+        ttk.Button(button_frame, text="Merge", style='Accent.TButton', command=on_confirm).pack(side='right')
+        
+    def perform_auto_merge(self, lml_dir, conflicts, staging_dir, base_dir):
+        """Run the batch merge in the background and show which files need attention"""
+        from auto_merge import run_batch_merge
+        
+        progress_window = tk.Toplevel(self)
+        progress_window.title("Auto-Merging")
+        progress_window.geometry("400x150")
+        progress_window.transient(self)
+        progress_window.grab_set()
+        
+        ttk.Label(progress_window, text="Merging text conflicts...", font=('Segoe UI', 12)).pack(pady=(20, 10))
+        progress = ttk.Progressbar(progress_window, mode='determinate', maximum=len(conflicts))
+        progress.pack(fill='x', padx=20)
+        
+        status_var = tk.StringVar(value="Starting worker processes...")
+        ttk.Label(progress_window, textvariable=status_var).pack(pady=10)
+        
+        def report_progress(done, total):
+            self.after(0, lambda: progress.config(value=done))
+            self.after(0, lambda: status_var.set(f"Merged {done}/{total} files"))
+        
+        def merge_thread():
+            try:
+                started = time.time()
+                results = run_batch_merge(lml_dir, conflicts, staging_dir, base_dir, report_progress)
+                elapsed = time.time() - started
+                self.after(0, lambda: progress_window.destroy())
+                self.after(0, lambda: self.show_merge_results(staging_dir, results, elapsed))
+            except Exception as e:
+                self.after(0, lambda: progress_window.destroy())
+                self.after(0, lambda error=str(e): messagebox.showerror("Merge Error", f"Failed to merge files: {error}"))
+        
+        threading.Thread(target=merge_thread, daemon=True).start()
+        
+    def show_merge_results(self, staging_dir, results, elapsed):
+        results_window = tk.Toplevel(self)
+        results_window.title("Auto-Merge Results")
+        results_window.geometry("900x550")
+        
+        counts = defaultdict(int)
+        for result in results:
+            counts[result["status"]] += 1
+        
+        ttk.Label(results_window,
+                 text=f"{counts['merged'] + counts['identical']} merged automatically, "
+                      f"{counts['conflict']} need manual attention, "
+                      f"{counts['skipped'] + counts['error']} skipped ({elapsed:.1f}s)",
+                 font=('Segoe UI', 11, 'bold')).pack(pady=(15, 5), padx=15, anchor='w')
+        ttk.Label(results_window, text=f"Output: {staging_dir}").pack(padx=15, anchor='w')
+        
+        tree_frame = ttk.Frame(results_window)
+        tree_frame.pack(fill='both', expand=True, padx=15, pady=10)
+        
+        columns = ("file", "status", "details")
+        results_tree = ttk.Treeview(tree_frame, columns=columns, show="headings")
+        results_tree.heading("file", text="File Path")
+        results_tree.heading("status", text="Status")
+        results_tree.heading("details", text="Details")
+        results_tree.column("file", width=380, anchor='w')
+        results_tree.column("status", width=110, anchor='w')
+        results_tree.column("details", width=330, anchor='w')
+        
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=results_tree.yview)
+        results_tree.configure(yscrollcommand=scrollbar.set)
+        results_tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+        
+        if self.dark_mode:
+            results_tree.tag_configure('conflict', background='#3a2121')
+            results_tree.tag_configure('skipped', background='#3a3321')
+        else:
+            results_tree.tag_configure('conflict', background='#f8d7da')
+            results_tree.tag_configure('skipped', background='#fff3cd')
+        
+        status_order = {"conflict": 0, "error": 1, "skipped": 2, "merged": 3, "identical": 4}
+        for result in sorted(results, key=lambda r: (status_order.get(r["status"], 5), r["path"])):
+            tag = "skipped" if result["status"] == "error" else result["status"]
+            results_tree.insert("", "end", values=(result["path"], result["status"].title(), result["message"]),
+                                tags=(tag,))
+        
+        button_frame = ttk.Frame(results_window)
+        button_frame.pack(fill='x', padx=15, pady=(0, 15))
+        
+        def open_output():
+            self.open_url(f"file://{os.path.abspath(staging_dir)}")
+        
+        ttk.Button(button_frame, text="Open Output Folder", command=open_output).pack(side='left')
+        ttk.Button(button_frame, text="Close", command=results_window.destroy).pack(side='right')
+        
     def create_backup(self):
         lml_dir = self.path_var.get().strip()
         if not os.path.isdir(lml_dir):
@@ -1593,7 +2715,7 @@ class ModConflictChecker(tk.Tk):
             # Ask for backup name
             backup_name_dialog = tk.Toplevel(self)
             backup_name_dialog.title("Backup Name")
-            backup_name_dialog.geometry("400x150")
+            backup_name_dialog.geometry("400x250")
             backup_name_dialog.transient(self)
             backup_name_dialog.grab_set()
             backup_name_dialog.resizable(False, False)
@@ -1610,6 +2732,13 @@ class ModConflictChecker(tk.Tk):
             name_entry.select_range(0, 'end')
             name_entry.focus_set()
             
+            format_var = tk.StringVar(value="zip")
+            for value, label in (("incremental", "Incremental (only store files that changed)"),
+                                 ("per_mod", "One archive per mod (reuses unchanged mods)"),
+                                 ("zip", "Single zip archive")):
+                ttk.Radiobutton(backup_name_dialog, text=label, value=value,
+                              variable=format_var).pack(padx=20, pady=(8, 0), anchor='w')
+            
             button_frame = ttk.Frame(backup_name_dialog)
             button_frame.pack(fill='x', pady=(15, 10), padx=20)
             
@@ -1626,7 +2755,7 @@ class ModConflictChecker(tk.Tk):
                 backup_name = "".join(c for c in backup_name if c.isalnum() or c in "._- ")
                 
                 backup_name_dialog.destroy()
-                self.perform_backup(lml_dir, backup_name)
+                self.perform_backup(lml_dir, backup_name, format_var.get())
             
             ttk.Button(button_frame, text="Cancel", command=on_cancel).pack(side='left')
             ttk.Button(button_frame, text="Create Backup", style='Accent.TButton', command=on_confirm).pack(side='right')
@@ -1642,15 +2771,85 @@ class ModConflictChecker(tk.Tk):
         except Exception as e:
             messagebox.showerror("Backup Error", f"Failed to create backup: {str(e)}")
 
-    def perform_backup(self, lml_dir, backup_name):
-        """Perform the actual backup operation with the given name"""
+    def create_transfer_window(self, title, heading, stats, parent=None):
+        """Progress window for a backup or restore that polls stats and offers Cancel
+
+        Returns (window, status_var, cancel_event); the worker sets status_var
+        for phase messages and the window refreshes byte counts, rates, ETA and
+        the current file from stats on a timer.
+        """
+        parent = parent or self
+        progress_window = tk.Toplevel(parent)
+        progress_window.title(title)
+        progress_window.geometry("460x250")
+        progress_window.transient(parent)
+        progress_window.grab_set()
+        
+        ttk.Label(progress_window, text=heading, font=('Segoe UI', 12)).pack(pady=(15, 10))
+        progress = ttk.Progressbar(progress_window, mode='determinate', maximum=100)
+        progress.pack(fill='x', padx=20)
+        
+        status_var = tk.StringVar(value="Preparing...")
+        ttk.Label(progress_window, textvariable=status_var).pack(pady=(10, 0))
+        
+        detail_var = tk.StringVar()
+        ttk.Label(progress_window, textvariable=detail_var, justify='left').pack(padx=20, pady=5, anchor='w')
+        
+        current_var = tk.StringVar()
+        ttk.Label(progress_window, textvariable=current_var, foreground='gray').pack(padx=20, anchor='w')
+        
+        cancel_event = threading.Event()
+        
+        def on_cancel():
+            cancel_event.set()
+            status_var.set("Cancelling...")
+            cancel_btn.config(state='disabled')
+        
+        cancel_btn = ttk.Button(progress_window, text="Cancel", command=on_cancel)
+        cancel_btn.pack(pady=10)
+        progress_window.protocol("WM_DELETE_WINDOW", on_cancel)
+        
+        # Poll instead of having workers post every update to the event loop
+        def refresh():
+            if not progress_window.winfo_exists():
+                return
+            lines, data = stats.status_lines()
+            progress.config(value=data["percent"])
+            detail_var.set("\n".join(lines))
+            current = data["current_file"]
+            if len(current) > 60:
+                current = "..." + current[-57:]
+            current_var.set(current)
+            progress_window.after(250, refresh)
+        
+        refresh()
+        return progress_window, status_var, cancel_event
+
+    def perform_backup(self, lml_dir, backup_name, backup_format="zip", on_success=None):
+        """Perform the actual backup operation with the given name
+        
+        on_success runs on the Tk thread once the backup has been written; it is
+        not called if the backup fails, is cancelled or is not started.
+        """
+        import json
+        import backup_archive
+        import backup_catalog
+        import backup_snapshot
+        import backup_store
+        from transfer_stats import TransferStats
+        
         try:
             # Create backups directory if it doesn't exist
             backups_dir = os.path.join(os.path.dirname(lml_dir), "LML_Backups")
             os.makedirs(backups_dir, exist_ok=True)
             
             # Create backup file path
-            backup_path = os.path.join(backups_dir, f"{backup_name}.zip")
+            if backup_format == "incremental":
+                backup_path = backup_store.manifest_path(backups_dir, backup_name)
+            elif backup_format == "per_mod":
+                backup_path = backup_snapshot.snapshot_path(backups_dir, backup_name)
+            else:
+                backup_path = os.path.join(backups_dir, f"{backup_name}.zip")
             
             # Check if file already exists
             if os.path.exists(backup_path):
@@ -1663,66 +2862,141 @@ class ModConflictChecker(tk.Tk):
                     return
             
             # Show progress dialog
-            progress_window = tk.Toplevel(self)
-            progress_window.title("Creating Backup")
-            progress_window.geometry("400x150")
-            progress_window.transient(self)
-            progress_window.grab_set()
-            
-            ttk.Label(progress_window, text="Creating backup...", font=('Segoe UI', 12)).pack(pady=(20, 10))
-            progress = ttk.Progressbar(progress_window, mode='indeterminate')
-            progress.pack(fill='x', padx=20)
-            progress.start()
+            stats = TransferStats("backup", {"format": backup_format})
+            progress_window, status_var, cancel_event = self.create_transfer_window(
+                "Creating Backup", "Creating backup...", stats)
+            
+            def finish_job(cancelled=False):
+                stats.finish(cancelled)
+                stats.write_log(backups_dir, name=backup_name)
+            
+            # Tells the user when a follow-up step (like a restore) was dropped with the backup
+            not_continued = "\n\nThe restore was not started." if on_success else ""
+            
+            def show_cancelled():
+                progress_window.destroy()
+                messagebox.showinfo("Backup Cancelled", f"Backup '{backup_name}' was cancelled. No backup was saved.{not_continued}")
+            
+            def show_failed(error):
+                progress_window.destroy()
+                messagebox.showerror("Backup Error", f"Failed to create backup: {error}{not_continued}")
+            
+            def show_complete(message):
+                self.restore_btn.config(state='normal')
+                progress_window.destroy()
+                messagebox.showinfo("Backup Complete", message)
+                if on_success:
+                    on_success()
+            
+            # Incremental backups only hash and store files that changed since the last one
+            def create_incremental_backup_thread():
+                try:
+                    previous = backup_store.latest_manifest(backups_dir, lml_dir)
+                    
+                    def on_progress(done, total, written):
+                        if done % 10 == 0 or done == total:
+                            self.after(0, lambda: status_var.set(
+                                f"Processing file {done}/{total} ({written / (1024*1024):.1f} MB new)"))
+                    
+                    manifest, result = backup_store.create_snapshot(lml_dir, backups_dir, backup_name,
+                                                                    previous, on_progress, cancel_event,
+                                                                    stats=stats)
+                    finish_job()
+                    
+                    self.backup_folder = backup_path
+                    backup_catalog.record_backup(backups_dir, backup_path, backup_name, manifest["created"],
+                                                 manifest["file_count"], manifest["total_size"])
+                    summary = (f"Backup '{backup_name}' created successfully.\n\n"
+                               f"{result['unchanged']} unchanged file(s) skipped, {result['hashed']} file(s) hashed, "
+                               f"{result['bytes_written'] / (1024*1024):.1f} MB of new data stored.")
+                    self.after(0, lambda: show_complete(summary))
+                    
+                except InterruptedError:
+                    # Chunks already stored are kept for the next backup; no manifest was written
+                    finish_job(cancelled=True)
+                    self.after(0, show_cancelled)
+                except Exception as e:
+                    self.after(0, lambda error=str(e): show_failed(error))
             
-            status_var = tk.StringVar(value="Preparing...")
-            ttk.Label(progress_window, textvariable=status_var).pack(pady=10)
+            # Per-mod backups archive changed mods in parallel and reuse the archives of unchanged ones
+            def create_mod_backup_thread():
+                try:
+                    def on_progress(mods_done, mods_total, bytes_done):
+                        self.after(0, lambda: status_var.set(
+                            f"Archived {mods_done}/{mods_total} mods ({bytes_done / (1024*1024):.1f} MB read)"))
+                    
+                    manifest, result = backup_snapshot.create_mod_snapshot(lml_dir, backups_dir, backup_name,
+                                                                           on_progress, cancel_event, stats=stats)
+                    finish_job()
+                    
+                    self.backup_folder = backup_path
+                    backup_catalog.record_backup(backups_dir, backup_path, backup_name, manifest["created"],
+                                                 manifest["file_count"], manifest["total_size"])
+                    summary = (f"Backup '{backup_name}' created successfully.\n\n"
+                               f"{result['archived']} mod(s) archived, {result['reused']} unchanged mod(s) reused.")
+                    self.after(0, lambda: show_complete(summary))
+                    
+                except InterruptedError:
+                    # Unfinished mod archives are removed as they are abandoned
+                    finish_job(cancelled=True)
+                    self.after(0, show_cancelled)
+                except Exception as e:
+                    self.after(0, lambda error=str(e): show_failed(error))
             
-            # Update UI
-            progress_window.update()
+            if backup_format == "incremental":
+                threading.Thread(target=create_incremental_backup_thread, daemon=True).start()
+                return
+            if backup_format == "per_mod":
+                threading.Thread(target=create_mod_backup_thread, daemon=True).start()
+                return
             
             # Create backup in background thread
             def create_backup_thread():
                 try:
-                    with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                        total_files = sum([len(files) for _, _, files in os.walk(lml_dir)])
-                        processed = 0
-                        
-                        for root, dirs, files in os.walk(lml_dir):
-                            for file in files:
-                                file_path = os.path.join(root, file)
-                                arc_name = os.path.relpath(file_path, lml_dir)
-                                zipf.write(file_path, arc_name)
-                                
-                                processed += 1
-                                if processed % 10 == 0:  # Update status every 10 files
-                                    self.after(0, lambda: status_var.set(f"Processing file {processed}/{total_files}"))
-                    
-                    # Create metadata file inside the zip
-                    with tempfile.NamedTemporaryFile(mode='w', delete=False) as meta_file:
-                        meta_data = {
-                            "name": backup_name,
-                            "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            "lml_dir": lml_dir,
-                            "file_count": total_files
-                        }
-                        json.dump(meta_data, meta_file)
-                        meta_file_path = meta_file.name
+                    # One scandir walk feeds the writer through a bounded queue
+                    feed = backup_archive.FileFeed(backup_store.iter_files(lml_dir))
                     
-                    # Add metadata to zip
-                    with zipfile.ZipFile(backup_path, 'a') as zipf:
-                        zipf.write(meta_file_path, "backup_metadata.json")
+                    def on_progress(processed, total_bytes):
+                        stats.set_total(feed.discovered_bytes, feed.discovered, feed.finished)
+                        if processed % 10 == 0:  # Update status every 10 files
+                            self.after(0, lambda: status_var.set(f"Processing file {processed}/{feed.total_text()}"))
                     
-                    # Clean up temp file
-                    os.unlink(meta_file_path)
+                    # Blocks are compressed on a worker pool; this thread only reads and writes.
+                    # The archive only replaces backup_path once it is complete.
+                    temp_path = backup_path + ".tmp"
+                    try:
+                        with backup_archive.ArchiveWriter(temp_path) as writer:
+                            total_files, total_bytes = backup_archive.add_files(writer, feed, on_progress,
+                                                                                cancel_event, stats=stats)
+                            
+                            # Metadata goes straight into the open archive
+                            meta_data = {
+                                "name": backup_name,
+                                "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                                "lml_dir": lml_dir,
+                                "file_count": total_files,
+                                "total_size": total_bytes
+                            }
+                            writer.writestr("backup_metadata.json", json.dumps(meta_data).encode('utf-8'))
+                        os.replace(temp_path, backup_path)
+                    except BaseException:
+                        if os.path.exists(temp_path):
+                            os.remove(temp_path)
+                        raise
+                    finally:
+                        feed.close()
+                    finish_job()
                     
                     self.backup_folder = backup_path
-                    self.after(0, lambda: self.restore_btn.config(state='normal'))
-                    self.after(0, lambda: progress_window.destroy())
-                    self.after(0, lambda: messagebox.showinfo("Backup Complete", f"Backup '{backup_name}' created successfully."))
+                    backup_catalog.record_backup(backups_dir, backup_path, backup_name, meta_data["created"],
+                                                 total_files)
+                    self.after(0, lambda: show_complete(f"Backup '{backup_name}' created successfully."))
                     
+                except InterruptedError:
+                    finish_job(cancelled=True)
+                    self.after(0, show_cancelled)
                 except Exception as e:
-                    self.after(0, lambda: progress_window.destroy())
-                    self.after(0, lambda: messagebox.showerror("Backup Error", f"Failed to create backup: {str(e)}"))
+                    self.after(0, lambda error=str(e): show_failed(error))
             
             threading.Thread(target=create_backup_thread, daemon=True).start()
             
@@ -1731,6 +3005,8 @@ class ModConflictChecker(tk.Tk):
 
     def restore_backup(self):
         """Restore from a selected backup file"""
+        import backup_catalog
+        
         lml_dir = self.path_var.get().strip()
         if not os.path.isdir(lml_dir):
             messagebox.showerror(
@@ -1741,14 +3017,14 @@ class ModConflictChecker(tk.Tk):
         # Look for backups directory
         backups_dir = os.path.join(os.path.dirname(lml_dir), "LML_Backups")
         if os.path.isdir(backups_dir):
-            backup_files = [f for f in os.listdir(backups_dir) if f.endswith('.zip')]
+            backup_files = [f for f in os.listdir(backups_dir) if backup_catalog.is_backup_file(f)]
         else:
             backup_files = []
         
         if not backup_files:
             # No backups found in the default location, ask user to select a file
             backup_file = filedialog.askopenfilename(
-                filetypes=[("ZIP files", "*.zip")],
+                filetypes=[("Backups", "*.zip *.manifest.json *.snapshot.json"), ("ZIP files", "*.zip")],
                 title="Select Backup File"
             )
             if not backup_file:
@@ -1760,9 +3036,12 @@ class ModConflictChecker(tk.Tk):
 
     def show_backup_selection_dialog(self, backups_dir, backup_files):
         """Show a dialog to select which backup to restore"""
+        import backup_catalog
+        import backup_store
+        
         backup_dialog = tk.Toplevel(self)
         backup_dialog.title("Select Backup to Restore")
-        backup_dialog.geometry("500x400")
+        backup_dialog.geometry("880x420")
         backup_dialog.transient(self)
         backup_dialog.grab_set()
         
@@ -1773,15 +3052,17 @@ class ModConflictChecker(tk.Tk):
         list_frame.pack(fill='both', expand=True, padx=15, pady=10)
         
         # Create treeview for backups
-        columns = ("name", "date", "size")
-        backup_tree = ttk.Treeview(list_frame, columns=columns, show="headings", selectmode="browse")
+        columns = ("name", "date", "files", "size")
+        backup_tree = ttk.Treeview(list_frame, columns=columns, show="headings", selectmode="extended")
         
         backup_tree.heading("name", text="Backup Name")
         backup_tree.heading("date", text="Date Created")
+        backup_tree.heading("files", text="Files")
         backup_tree.heading("size", text="Size")
         
         backup_tree.column("name", width=200, anchor='w')
         backup_tree.column("date", width=150, anchor='w')
+        backup_tree.column("files", width=70, anchor='e')
         backup_tree.column("size", width=100, anchor='e')
         
         # Add scrollbar
@@ -1791,38 +3072,42 @@ class ModConflictChecker(tk.Tk):
         backup_tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        # Populate the list
+        def entry_values(entry):
+            file_count = entry.get("file_count")
+            return (entry["name"], entry["date"],
+                    f"{file_count:,}" if file_count is not None else "",
+                    f"{entry['size'] / (1024*1024):.1f} MB")
+        
+        # Populate the list from the catalog; new or changed archives are read in the background
+        entries, stale = backup_catalog.scan_backups(backups_dir)
         backup_info = []
         for file in backup_files:
             file_path = os.path.join(backups_dir, file)
-            file_size = os.path.getsize(file_path)
-            file_size_str = f"{file_size / (1024*1024):.1f} MB"
-            
-            # Try to get metadata from zip
-            try:
-                with zipfile.ZipFile(file_path, 'r') as zipf:
-                    if "backup_metadata.json" in zipf.namelist():
-                        with zipf.open("backup_metadata.json") as meta_file:
-                            meta_data = json.load(meta_file)
-                            name = meta_data.get("name", os.path.splitext(file)[0])
-                            date = meta_data.get("created", "Unknown")
-                    else:
-                        # Get info from filename and modification time
-                        name = os.path.splitext(file)[0]
-                        date = datetime.fromtimestamp(os.path.getmtime(file_path)).strftime("%Y-%m-%d %H:%M:%S")
-            except:
-                # Fallback if metadata can't be read
-                name = os.path.splitext(file)[0]
-                date = datetime.fromtimestamp(os.path.getmtime(file_path)).strftime("%Y-%m-%d %H:%M:%S")
-            
-            backup_info.append((name, date, file_size_str, file_path))
+            entry = entries.get(file)
+            if entry is None:
+                values = (os.path.splitext(file)[0], "Reading...", "", "")
+            else:
+                values = entry_values(entry)
+            backup_info.append((values, file, file_path))
         
         # Sort by date (newest first)
-        backup_info.sort(key=lambda x: x[1], reverse=True)
+        backup_info.sort(key=lambda x: x[0][1], reverse=True)
         
         # Add to tree
-        for name, date, size, path in backup_info:
-            backup_tree.insert("", "end", values=(name, date, size), tags=(path,))
+        rows = {}
+        for values, file, path in backup_info:
+            rows[file] = backup_tree.insert("", "end", values=values, tags=(path,))
+        
+        def fill_entry(file, entry):
+            def apply():
+                if backup_tree.winfo_exists() and file in rows:
+                    backup_tree.item(rows[file], values=entry_values(entry))
+            self.after(0, apply)
+        
+        stale = [file for file in stale if file in rows]
+        if stale:
+            threading.Thread(target=backup_catalog.update_catalog, args=(backups_dir, stale, fill_entry),
+                             daemon=True).start()
         
         # Select the first item
         if backup_info:
@@ -1830,6 +3115,10 @@ class ModConflictChecker(tk.Tk):
             backup_tree.selection_set(first_item)
             backup_tree.focus(first_item)
         
+        verify_first_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(backup_dialog, text="Verify the backup before restoring",
+                      variable=verify_first_var).pack(padx=15, anchor='w')
+        
         # Button frame
         button_frame = ttk.Frame(backup_dialog)
         button_frame.pack(fill='x', pady=15, padx=15)
@@ -1837,21 +3126,95 @@ class ModConflictChecker(tk.Tk):
         def on_cancel():
             backup_dialog.destroy()
         
-        def on_select():
+        def selected_backup():
             selected_items = backup_tree.selection()
             if not selected_items:
+                return None
+            return backup_tree.item(selected_items[0], "tags")[0]
+        
+        def on_select():
+            selected_path = selected_backup()
+            if not selected_path:
                 messagebox.showerror("Error", "Please select a backup to restore.")
                 return
             
-            selected_item = selected_items[0]
-            selected_path = backup_tree.item(selected_item, "tags")[0]
+            backup_dialog.destroy()
+            if verify_first_var.get():
+                self.verify_backup(selected_path, on_verified=lambda: self.select_backup_to_restore(selected_path))
+            else:
+                self.select_backup_to_restore(selected_path)
+        
+        def on_diff():
+            selected_items = backup_tree.selection()
+            if not selected_items or len(selected_items) > 2:
+                messagebox.showerror("Error", "Select one backup to compare with the LML folder, or two backups to compare.")
+                return
             
+            # Oldest first, so changes read as "what happened since"
+            selected = sorted(selected_items, key=lambda item: backup_tree.set(item, "date"))
+            old_path = backup_tree.item(selected[0], "tags")[0]
+            old_label = backup_tree.set(selected[0], "name")
+            if len(selected) == 2:
+                new_path = backup_tree.item(selected[1], "tags")[0]
+                new_label = backup_tree.set(selected[1], "name")
+            else:
+                new_path = self.path_var.get().strip()
+                new_label = "current LML folder"
+            self.show_backup_diff(old_path, new_path, old_label, new_label)
+        
+        def on_restore_mods():
+            selected_path = selected_backup()
+            if not selected_path:
+                messagebox.showerror("Error", "Please select a backup to restore from.")
+                return
             backup_dialog.destroy()
-            self.select_backup_to_restore(selected_path)
+            self.show_mod_restore_dialog(selected_path)
+        
+        def on_verify():
+            selected_path = selected_backup()
+            if not selected_path:
+                messagebox.showerror("Error", "Please select a backup to verify.")
+                return
+            self.verify_backup(selected_path, parent=backup_dialog)
+        
+        def on_delete():
+            selected_items = backup_tree.selection()
+            if not selected_items:
+                messagebox.showerror("Error", "Please select a backup to delete.", parent=backup_dialog)
+                return
+            names = [backup_tree.set(item, "name") for item in selected_items]
+            if not messagebox.askyesno(
+                "Delete Backup",
+                f"Permanently delete {len(names)} backup(s)?\n\n" + "\n".join(names[:10]),
+                icon="warning", parent=backup_dialog
+            ):
+                return
+            
+            failed = []
+            for item in selected_items:
+                path = backup_tree.item(item, "tags")[0]
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    failed.append(f"{os.path.basename(path)}: {e}")
+                    continue
+                backup_tree.delete(item)
+            if failed:
+                messagebox.showerror("Delete Error", "Could not delete:\n" + "\n".join(failed), parent=backup_dialog)
+            
+            # Chunks only the deleted manifests used are freed in the background
+            def cleanup_thread():
+                backup_catalog.update_catalog(backups_dir, [])
+                try:
+                    backup_store.sweep_objects(backups_dir)
+                except (OSError, ValueError) as e:
+                    print(f"Failed to free unused backup data: {e}")
+            
+            threading.Thread(target=cleanup_thread).start()
         
         def on_browse():
             backup_file = filedialog.askopenfilename(
-                filetypes=[("ZIP files", "*.zip")],
+                filetypes=[("Backups", "*.zip *.manifest.json *.snapshot.json"), ("ZIP files", "*.zip")],
                 title="Select Backup File"
             )
             if backup_file:
@@ -1860,7 +3223,11 @@ class ModConflictChecker(tk.Tk):
         
         ttk.Button(button_frame, text="Cancel", command=on_cancel).pack(side='left')
         ttk.Button(button_frame, text="Browse for Backup", command=on_browse).pack(side='left', padx=10)
+        ttk.Button(button_frame, text="Verify Selected", command=on_verify).pack(side='left')
+        ttk.Button(button_frame, text="Show Changes", command=on_diff).pack(side='left', padx=10)
+        ttk.Button(button_frame, text="Delete Selected", command=on_delete).pack(side='left')
         ttk.Button(button_frame, text="Restore Selected", style='Accent.TButton', command=on_select).pack(side='right')
+        ttk.Button(button_frame, text="Restore Mods...", command=on_restore_mods).pack(side='right', padx=10)
         
         # Double-click to select
         backup_tree.bind("<Double-1>", lambda e: on_select())
@@ -1873,19 +3240,296 @@ class ModConflictChecker(tk.Tk):
         y = (self.winfo_screenheight() // 2) - (height // 2)
         backup_dialog.geometry(f'{width}x{height}+{x}+{y}')
 
+    def show_mod_restore_dialog(self, backup_path):
+        """Pick individual mods from a backup and restore only their folders"""
+        import backup_restore
+        
+        lml_dir = self.path_var.get().strip()
+        
+        mods_dialog = tk.Toplevel(self)
+        mods_dialog.title(f"Restore Mods: {os.path.basename(backup_path)}")
+        mods_dialog.geometry("450x450")
+        mods_dialog.transient(self)
+        mods_dialog.grab_set()
+        
+        ttk.Label(mods_dialog, text="Select the mods to restore:", font=('Segoe UI', 12, 'bold')).pack(pady=(15, 5), padx=15, anchor='w')
+        
+        status_var = tk.StringVar(value="Reading backup contents...")
+        ttk.Label(mods_dialog, textvariable=status_var).pack(padx=15, anchor='w')
+        
+        list_frame = ttk.Frame(mods_dialog)
+        list_frame.pack(fill='both', expand=True, padx=15, pady=10)
+        
+        mod_list = tk.Listbox(list_frame, selectmode='extended', activestyle='none')
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=mod_list.yview)
+        mod_list.configure(yscrollcommand=scrollbar.set)
+        mod_list.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        mod_names = []
+        
+        def show_mods(counts):
+            if not mods_dialog.winfo_exists():
+                return
+            mod_names.extend(sorted(counts, key=str.lower))
+            for mod in mod_names:
+                mod_list.insert('end', f"{mod}  ({counts[mod]:,} files)")
+            status_var.set(f"{len(mod_names)} mod(s) in this backup")
+        
+        def load_thread():
+            try:
+                counts = backup_restore.backup_mods(backup_path)
+                self.after(0, lambda: show_mods(counts))
+            except Exception as e:
+                self.after(0, lambda error=str(e): status_var.set(f"Failed to read backup: {error}"))
+        
+        threading.Thread(target=load_thread, daemon=True).start()
+        
+        button_frame = ttk.Frame(mods_dialog)
+        button_frame.pack(fill='x', pady=15, padx=15)
+        
+        def on_restore():
+            mods = [mod_names[i] for i in mod_list.curselection()]
+            if not mods:
+                messagebox.showerror("Error", "Please select at least one mod.", parent=mods_dialog)
+                return
+            if not messagebox.askyesno(
+                "Confirm Restore",
+                f"Restore {len(mods)} mod folder(s) in:\n{lml_dir}\n\n"
+                f"Changed files in those folders are replaced and files that are not in the backup are removed. "
+                f"Other mods are not touched.",
+                icon="warning", parent=mods_dialog
+            ):
+                return
+            mods_dialog.destroy()
+            self.restore_mods(backup_path, lml_dir, mods)
+        
+        ttk.Button(button_frame, text="Cancel", command=mods_dialog.destroy).pack(side='left')
+        ttk.Button(button_frame, text="Restore Selected Mods", style='Accent.TButton', command=on_restore).pack(side='right')
+        
+    def restore_mods(self, backup_path, lml_dir, mods):
+        """Differentially restore only the given top-level mod folders"""
+        import backup_restore
+        from transfer_stats import TransferStats
+        
+        stats = TransferStats("restore", {"mode": "mods"})
+        progress_window, status_var, cancel_event = self.create_transfer_window(
+            "Restoring Mods", f"Restoring {len(mods)} mod(s)...", stats)
+        status_var.set("Comparing files...")
+        
+        def restore_thread():
+            try:
+                phase_labels = {"compare": "Comparing file", "extract": "Extracting file", "delete": "Removing file"}
+                
+                def on_progress(phase, done, total):
+                    if done % 10 == 0 or done == total:
+                        self.after(0, lambda: status_var.set(f"{phase_labels[phase]} {done}/{total}"))
+                
+                result = backup_restore.differential_restore(backup_path, lml_dir, on_progress, mods=set(mods),
+                                                             stats=stats, cancel_event=cancel_event)
+                stats.finish()
+                stats.write_log(os.path.dirname(backup_path), backup=os.path.basename(backup_path))
+                
+                summary = (f"Restored {len(mods)} mod(s).\n\n"
+                           f"{result['written']} file(s) extracted, {result['deleted']} removed, "
+                           f"{result['unchanged']} already up to date.")
+                self.after(0, lambda: progress_window.destroy())
+                self.after(0, lambda: messagebox.showinfo("Restore Complete", summary))
+                
+            except InterruptedError:
+                stats.finish(cancelled=True)
+                stats.write_log(os.path.dirname(backup_path), backup=os.path.basename(backup_path))
+                self.after(0, lambda: progress_window.destroy())
+                self.after(0, lambda: messagebox.showinfo(
+                    "Restore Cancelled", "The restore was cancelled. Files already extracted were left in place."))
+            except Exception as e:
+                self.after(0, lambda: progress_window.destroy())
+                self.after(0, lambda error=str(e): messagebox.showerror("Restore Error", f"Failed to restore mods: {error}"))
+        
+        threading.Thread(target=restore_thread, daemon=True).start()
+
+    def show_backup_diff(self, old_path, new_path, old_label, new_label):
+        """List files added, removed and modified between two snapshots, grouped by mod"""
+        import backup_diff
+        
+        diff_window = tk.Toplevel(self)
+        diff_window.title(f"Changes: {old_label} → {new_label}")
+        diff_window.geometry("900x600")
+        diff_window.minsize(600, 400)
+        
+        main_frame = ttk.Frame(diff_window, padding=10)
+        main_frame.pack(fill='both', expand=True)
+        
+        ttk.Label(main_frame, 
+                text=f"Changes from '{old_label}' to '{new_label}'",
+                font=('Segoe UI', 12, 'bold')).pack(side='top', anchor='w')
+        
+        status_var = tk.StringVar(value="Reading file lists...")
+        ttk.Label(main_frame, textvariable=status_var).pack(side='top', anchor='w', pady=(5, 10))
+        
+        tree_frame = ttk.Frame(main_frame)
+        tree_frame.pack(fill='both', expand=True)
+        
+        columns = ("change", "old_size", "new_size")
+        diff_tree = ttk.Treeview(tree_frame, columns=columns, show="tree headings")
+        diff_tree.heading("#0", text="Mod / File")
+        diff_tree.heading("change", text="Change")
+        diff_tree.heading("old_size", text="Old Size")
+        diff_tree.heading("new_size", text="New Size")
+        diff_tree.column("#0", width=480, anchor='w')
+        diff_tree.column("change", width=170, anchor='w')
+        diff_tree.column("old_size", width=100, anchor='e')
+        diff_tree.column("new_size", width=100, anchor='e')
+        
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=diff_tree.yview)
+        diff_tree.configure(yscrollcommand=scrollbar.set)
+        diff_tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        max_rows_per_mod = 5000
+        pending_children = {}
+        
+        def size_text(entry):
+            return f"{entry.size:,}" if entry is not None else ""
+        
+        # Files are only inserted when their mod is expanded, so huge diffs stay responsive
+        def on_open(event):
+            item = diff_tree.focus()
+            changes = pending_children.pop(item, None)
+            if changes is None:
+                return
+            diff_tree.delete(*diff_tree.get_children(item))
+            rows = [(kind, entry) for kind in ("modified", "added", "removed") for entry in changes[kind]]
+            for kind, (rel_path, old_entry, new_entry) in rows[:max_rows_per_mod]:
+                diff_tree.insert(item, "end", text=rel_path,
+                                 values=(kind.capitalize(), size_text(old_entry), size_text(new_entry)))
+            if len(rows) > max_rows_per_mod:
+                diff_tree.insert(item, "end", text=f"... {len(rows) - max_rows_per_mod:,} more", values=("", "", ""))
+        
+        diff_tree.bind("<<TreeviewOpen>>", on_open)
+        
+        def show_diff(grouped, elapsed):
+            if not diff_window.winfo_exists():
+                return
+            totals = {"added": 0, "removed": 0, "modified": 0}
+            for mod, changes in grouped.items():
+                counts = {kind: len(items) for kind, items in changes.items()}
+                for kind, count in counts.items():
+                    totals[kind] += count
+                summary = ", ".join(f"{count:,} {kind}" for kind, count in counts.items() if count)
+                item = diff_tree.insert("", "end", text=mod, values=(summary, "", ""))
+                diff_tree.insert(item, "end", text="Loading...")
+                pending_children[item] = changes
+            
+            if grouped:
+                status_var.set(f"{len(grouped):,} mod(s) changed: {totals['added']:,} added, "
+                               f"{totals['removed']:,} removed, {totals['modified']:,} modified ({elapsed:.1f}s)")
+            else:
+                status_var.set(f"No differences ({elapsed:.1f}s)")
+        
+        def diff_thread():
+            try:
+                start_time = time.time()
+                grouped = backup_diff.diff_backups(old_path, new_path)
+                elapsed = time.time() - start_time
+                self.after(0, lambda: show_diff(grouped, elapsed))
+            except Exception as e:
+                self.after(0, lambda error=str(e): status_var.set(f"Failed to compare: {error}"))
+        
+        threading.Thread(target=diff_thread, daemon=True).start()
+
+    def verify_backup(self, backup_path, on_verified=None, parent=None):
+        """Check every entry of a backup in the background, then optionally continue with a restore"""
+        import backup_verify
+        
+        parent = parent or self
+        progress_window = tk.Toplevel(parent)
+        progress_window.title("Verifying Backup")
+        progress_window.geometry("420x170")
+        progress_window.transient(parent)
+        progress_window.grab_set()
+        
+        ttk.Label(progress_window, text=f"Verifying {os.path.basename(backup_path)}...",
+                font=('Segoe UI', 12)).pack(pady=(20, 10))
+        progress = ttk.Progressbar(progress_window, mode='determinate', maximum=100)
+        progress.pack(fill='x', padx=20)
+        
+        status_var = tk.StringVar(value="Reading archive index...")
+        ttk.Label(progress_window, textvariable=status_var).pack(pady=10)
+        
+        cancel_event = threading.Event()
+        
+        def on_cancel():
+            cancel_event.set()
+            status_var.set("Cancelling...")
+        
+        ttk.Button(progress_window, text="Cancel", command=on_cancel).pack()
+        progress_window.protocol("WM_DELETE_WINDOW", on_cancel)
+        
+        start_time = time.time()
+        last_update = [0.0]
+        
+        def on_progress(done_bytes, total_bytes):
+            now = time.time()
+            if now - last_update[0] < 0.2 and done_bytes < total_bytes:
+                return
+            last_update[0] = now
+            rate = done_bytes / max(now - start_time, 0.001) / (1024 * 1024)
+            percent = done_bytes * 100 / total_bytes if total_bytes else 100
+            text = f"{done_bytes / (1024*1024):,.0f} / {total_bytes / (1024*1024):,.0f} MB at {rate:,.1f} MB/s"
+            self.after(0, lambda: (progress.config(value=percent), status_var.set(text)))
+        
+        def show_result(result):
+            progress_window.destroy()
+            if result.cancelled:
+                messagebox.showinfo("Verification Cancelled", result.summary_text(), parent=parent)
+            elif result.ok:
+                if on_verified:
+                    on_verified()
+                else:
+                    messagebox.showinfo("Backup Verified", result.summary_text(), parent=parent)
+            elif on_verified:
+                if messagebox.askyesno("Backup Damaged", result.summary_text() + "\n\nRestore anyway?",
+                                       icon="warning", parent=parent):
+                    on_verified()
+            else:
+                messagebox.showwarning("Backup Damaged", result.summary_text(), parent=parent)
+        
+        def verify_thread():
+            try:
+                result = backup_verify.verify_backup(backup_path, on_progress, cancel_event)
+                self.after(0, lambda: show_result(result))
+            except Exception as e:
+                self.after(0, lambda: progress_window.destroy())
+                self.after(0, lambda error=str(e): messagebox.showerror("Verify Error", f"Failed to verify backup: {error}"))
+        
+        threading.Thread(target=verify_thread, daemon=True).start()
+
     def select_backup_to_restore(self, backup_path):
         """Confirm and perform the restore operation"""
+        import json
+        import zipfile
+        import backup_restore
+        import backup_snapshot
+        import backup_store
+        from transfer_stats import TransferStats
+        
         lml_dir = self.path_var.get().strip()
         
         # Try to get backup name from metadata
         try:
-            with zipfile.ZipFile(backup_path, 'r') as zipf:
-                if "backup_metadata.json" in zipf.namelist():
-                    with zipf.open("backup_metadata.json") as meta_file:
-                        meta_data = json.load(meta_file)
-                        backup_name = meta_data.get("name", os.path.basename(backup_path))
-                else:
-                    backup_name = os.path.basename(backup_path)
+            if backup_store.is_manifest(backup_path):
+                backup_name = backup_store.load_manifest(backup_path).get("name", os.path.basename(backup_path))
+            elif backup_snapshot.is_snapshot(backup_path):
+                backup_name = backup_snapshot.load_snapshot_manifest(backup_path).get("name", os.path.basename(backup_path))
+            else:
+                with zipfile.ZipFile(backup_path, 'r') as zipf:
+                    if "backup_metadata.json" in zipf.namelist():
+                        with zipf.open("backup_metadata.json") as meta_file:
+                            meta_data = json.load(meta_file)
+                            backup_name = meta_data.get("name", os.path.basename(backup_path))
+                    else:
+                        backup_name = os.path.basename(backup_path)
         except:
             backup_name = os.path.basename(backup_path)
         
@@ -1896,116 +3540,203 @@ class ModConflictChecker(tk.Tk):
             icon="warning"
         )
         
+        def start_restore():
+            # Confirm final restore
+            final_confirm = messagebox.askyesno(
+                "Final Confirmation",
+                f"Ready to restore from backup '{backup_name}'.\n\n"
+                f"This will overwrite all files in:\n{lml_dir}\n\n"
+                f"Continue with restore?",
+                icon="warning"
+            )
+        
+            if not final_confirm:
+                return
+        
+            differential = messagebox.askyesno(
+                "Restore Mode",
+                "Only rewrite files that differ from the backup?\n\n"
+                "Yes: compare sizes and checksums, extract changed files and delete files that are not in the backup.\n"
+                "No: rebuild the whole folder from the backup next to it, then swap it into place.",
+            )
+        
+            # Show progress dialog
+            stats = TransferStats("restore", {"mode": "differential" if differential else "staged"})
+            progress_window, status_var, cancel_event = self.create_transfer_window(
+                "Restoring Backup", "Restoring from backup...", stats)
+            status_var.set("Comparing files...")
+        
+            def finish_job(cancelled=False):
+                stats.finish(cancelled)
+                stats.write_log(os.path.dirname(backup_path), backup=os.path.basename(backup_path))
+        
+            # Differential restore leaves files that already match the backup untouched
+            def differential_restore_thread():
+                try:
+                    phase_labels = {"compare": "Comparing file", "extract": "Extracting file", "delete": "Removing file"}
+                
+                    def on_progress(phase, done, total):
+                        if done % 10 == 0 or done == total:
+                            self.after(0, lambda: status_var.set(f"{phase_labels[phase]} {done}/{total}"))
+                
+                    restored = backup_restore.differential_restore(backup_path, lml_dir, on_progress,
+                                                                   stats=stats, cancel_event=cancel_event)
+                    finish_job()
+                
+                    summary = (f"LML folder has been restored from backup '{backup_name}'.\n\n"
+                               f"{restored['written']} file(s) extracted, {restored['deleted']} removed, "
+                               f"{restored['unchanged']} already up to date.")
+                    self.after(0, lambda: progress_window.destroy())
+                    self.after(0, lambda: messagebox.showinfo("Restore Complete", summary))
+                
+                except InterruptedError:
+                    finish_job(cancelled=True)
+                    self.after(0, lambda: progress_window.destroy())
+                    self.after(0, lambda: messagebox.showinfo(
+                        "Restore Cancelled", "The restore was cancelled. Files already extracted were left in place."))
+                except Exception as e:
+                    self.after(0, lambda: progress_window.destroy())
+                    self.after(0, lambda error=str(e): messagebox.showerror("Restore Error", f"Failed to restore backup: {error}"))
+        
+            if differential:
+                threading.Thread(target=differential_restore_thread, daemon=True).start()
+                return
+        
+            # Full restores are built next to the LML folder and swapped in once verified
+            def restore_thread():
+                try:
+                    phase_labels = {"compare": "Comparing file", "link": "Reusing file",
+                                    "extract": "Extracting file", "verify": "Verifying restored files",
+                                    "swap": "Swapping folders"}
+                
+                    def on_progress(phase, done, total):
+                        if phase in ("verify", "swap"):
+                            self.after(0, lambda: status_var.set(f"{phase_labels[phase]}..."))
+                        elif done % 10 == 0 or done == total:
+                            self.after(0, lambda: status_var.set(f"{phase_labels[phase]} {done}/{total}"))
+                
+                    # Without a pre-restore backup the old folder is the only way back, so keep it.
+                    # With one, this only runs once that backup has been written.
+                    restored, previous_dir = backup_restore.staged_restore(backup_path, lml_dir, on_progress,
+                                                                           keep_previous=not result, stats=stats,
+                                                                           cancel_event=cancel_event)
+                    finish_job()
+                
+                    summary = (f"LML folder has been restored from backup '{backup_name}'.\n\n"
+                               f"{restored['written']} file(s) extracted, {restored['linked']} reused.")
+                    if previous_dir:
+                        summary += f"\n\nThe previous folder was kept at:\n{previous_dir}"
+                    self.after(0, lambda: progress_window.destroy())
+                    self.after(0, lambda: messagebox.showinfo("Restore Complete", summary))
+                
+                except InterruptedError:
+                    finish_job(cancelled=True)
+                    self.after(0, lambda: progress_window.destroy())
+                    self.after(0, lambda: messagebox.showinfo(
+                        "Restore Cancelled", "The restore was cancelled. The LML folder was not changed."))
+                except Exception as e:
+                    self.after(0, lambda: progress_window.destroy())
+                    self.after(0, lambda error=str(e): messagebox.showerror("Restore Error", f"Failed to restore backup: {error}"))
+        
+            threading.Thread(target=restore_thread, daemon=True).start()
+        
         if result:
-            # Create a backup of current state first
+            # Create a backup of current state first and only restore once it is written
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self.perform_backup(lml_dir, f"Pre_Restore_Backup_{timestamp}")
-        
-        # Confirm final restore
-        final_confirm = messagebox.askyesno(
-            "Final Confirmation",
-            f"Ready to restore from backup '{backup_name}'.\n\n"
-            f"This will overwrite all files in:\n{lml_dir}\n\n"
-            f"Continue with restore?",
-            icon="warning"
-        )
-        
-        if not final_confirm:
-            return
+            self.perform_backup(lml_dir, f"Pre_Restore_Backup_{timestamp}", on_success=start_restore)
+        else:
+            start_restore()
+
+
+            
+    def report_data(self):
+        """Snapshot the current scan result for an exporter running in the background"""
+        import report_export
         
-        # Show progress dialog
+        return report_export.ReportData(self.conflicts, self.excluded_files, self.path_var.get(),
+                                        self.get_conflict_severity)
+
+    def run_report_job(self, title, data, work, on_complete, error_title, error_text):
+        """Run an exporter on a background thread behind a progress window with Cancel
+
+        work(progress_callback, cancel_event) does the export; on_complete(result)
+        runs on the Tk thread once it finishes.
+        """
         progress_window = tk.Toplevel(self)
-        progress_window.title("Restoring Backup")
-        progress_window.geometry("400x150")
+        progress_window.title(title)
+        progress_window.geometry("400x160")
         progress_window.transient(self)
         progress_window.grab_set()
         
-        ttk.Label(progress_window, text="Restoring from backup...", font=('Segoe UI', 12)).pack(pady=(20, 10))
-        progress = ttk.Progressbar(progress_window, mode='indeterminate')
+        ttk.Label(progress_window, text=f"{title}...", font=('Segoe UI', 12)).pack(pady=(20, 10))
+        progress = ttk.Progressbar(progress_window, mode='determinate', maximum=max(data.total, 1))
         progress.pack(fill='x', padx=20)
-        progress.start()
         
-        status_var = tk.StringVar(value="Removing existing files...")
+        status_var = tk.StringVar(value=f"0/{data.total} conflicts")
         ttk.Label(progress_window, textvariable=status_var).pack(pady=10)
         
-        # Update UI
-        progress_window.update()
+        cancel_event = threading.Event()
         
-        # Restore in background thread
-        def restore_thread():
+        def on_cancel():
+            cancel_event.set()
+            status_var.set("Cancelling...")
+        
+        ttk.Button(progress_window, text="Cancel", command=on_cancel).pack()
+        progress_window.protocol("WM_DELETE_WINDOW", on_cancel)
+        
+        def report_progress(done, total):
+            self.after(0, lambda: (progress.config(value=done), status_var.set(f"{done}/{total} conflicts")))
+        
+        def job_thread():
             try:
-                # Remove existing files
-                for item in os.listdir(lml_dir):
-                    item_path = os.path.join(lml_dir, item)
-                    if os.path.isdir(item_path):
-                        shutil.rmtree(item_path)
-                    else:
-                        os.remove(item_path)
-                
-                # Extract backup
-                self.after(0, lambda: status_var.set("Extracting backup files..."))
-                with zipfile.ZipFile(backup_path, "r") as zipf:
-                    # Filter out metadata file
-                    file_list = [f for f in zipf.namelist() if f != "backup_metadata.json"]
-                    zipf.extractall(lml_dir, members=file_list)
-                
+                result = work(report_progress, cancel_event)
+                self.after(0, lambda: progress_window.destroy())
+                self.after(0, lambda: on_complete(result))
+            except InterruptedError:
                 self.after(0, lambda: progress_window.destroy())
-                self.after(0, lambda: messagebox.showinfo("Restore Complete", f"LML folder has been restored from backup '{backup_name}'."))
-                
             except Exception as e:
                 self.after(0, lambda: progress_window.destroy())
-                self.after(0, lambda: messagebox.showerror("Restore Error", f"Failed to restore backup: {str(e)}"))
+                self.after(0, lambda error=str(e): messagebox.showerror(error_title, f"{error_text}: {error}"))
         
-        threading.Thread(target=restore_thread, daemon=True).start()
-
-
+        threading.Thread(target=job_thread, daemon=True).start()
             
     def copy_to_clipboard(self):
+        import report_export
+        
         if not self.conflicts:
             messagebox.showinfo("No Data", "No conflict data to export to clipboard.")
             return
         
-        clipboard_text = "RDR2 LML Mod Conflict Report\n"
-        clipboard_text += "=" * 40 + "\n\n"
-        clipboard_text += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        clipboard_text += f"LML Directory: {self.path_var.get()}\n\n"
+        # The clipboard needs one string, but it is built off the Tk thread in a single join
+        def build_text(progress_callback, cancel_event):
+            return "".join(report_export.iter_text_report(data, progress_callback, cancel_event))
         
-        active_conflicts = {path: mods for path, mods in self.conflicts.items() if path not in self.excluded_files}
-        clipboard_text += f"Total Conflicts: {len(active_conflicts)}\n"
-        clipboard_text += f"Excluded Files: {len(self.excluded_files)}\n\n"
+        def on_complete(clipboard_text):
+            self.clipboard_clear()
+            self.clipboard_append(clipboard_text)
+            messagebox.showinfo("Success", "Conflict data copied to clipboard.")
         
-        clipboard_text += "ACTIVE CONFLICTS:\n"
-        clipboard_text += "-" * 40 + "\n\n"
+        data = self.report_data()
+        self.run_report_job("Copying Report", data, build_text, on_complete,
+                            "Export Error", "Failed to copy report")
         
-        for path, mods in sorted(active_conflicts.items()):
-            severity = self.get_conflict_severity(path, mods)
-            clipboard_text += f"File: {path}\n"
-            clipboard_text += f"Severity: {severity}\n"
-            clipboard_text += f"Conflicting Mods ({len(mods)}):\n"
-            for mod in sorted(mods):
-                clipboard_text += f"  - {mod}\n"
-            clipboard_text += "\n"
-            
-        if self.excluded_files:
-            clipboard_text += "EXCLUDED FILES:\n"
-            clipboard_text += "-" * 40 + "\n\n"
-            
-            for path in sorted(self.excluded_files):
-                if path in self.conflicts:
-                    mods = self.conflicts[path]
-                    severity = self.get_conflict_severity(path, mods)
-                    clipboard_text += f"File: {path}\n"
-                    clipboard_text += f"Severity: {severity}\n"
-                    clipboard_text += f"Conflicting Mods ({len(mods)}):\n"
-                    for mod in sorted(mods):
-                        clipboard_text += f"  - {mod}\n"
-                    clipboard_text += "\n"
-        
-        self.clipboard_clear()
-        self.clipboard_append(clipboard_text)
-        messagebox.showinfo("Success", "Conflict data copied to clipboard.")
+    def export_report(self, file_path, iter_report, error_text, on_complete=None):
+        """Stream a report generator to file_path in the background"""
+        import report_export
+        
+        def write_file(progress_callback, cancel_event):
+            report_export.write_report(file_path, iter_report(data, progress_callback, cancel_event))
+        
+        def show_complete(_):
+            messagebox.showinfo("Export Complete", f"Conflict data exported to:\n{file_path}")
+        
+        data = self.report_data()
+        self.run_report_job("Exporting Report", data, write_file, on_complete or show_complete,
+                            "Export Error", error_text)
         
     def export_to_txt(self):
+        import report_export
+        
         if not self.conflicts:
             messagebox.showinfo("No Data", "No conflict data to export.")
             return
@@ -2019,50 +3750,11 @@ class ModConflictChecker(tk.Tk):
         if not file_path:
             return
             
-        try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write("RDR2 LML Mod Conflict Report\n")
-                f.write("=" * 40 + "\n\n")
-                f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"LML Directory: {self.path_var.get()}\n\n")
-                
-                active_conflicts = {path: mods for path, mods in self.conflicts.items() if path not in self.excluded_files}
-                f.write(f"Total Conflicts: {len(active_conflicts)}\n")
-                f.write(f"Excluded Files: {len(self.excluded_files)}\n\n")
-                
-                f.write("ACTIVE CONFLICTS:\n")
-                f.write("-" * 40 + "\n\n")
-                
-                for path, mods in sorted(active_conflicts.items()):
-                    severity = self.get_conflict_severity(path, mods)
-                    f.write(f"File: {path}\n")
-                    f.write(f"Severity: {severity}\n")
-                    f.write(f"Conflicting Mods ({len(mods)}):\n")
-                    for mod in sorted(mods):
-                        f.write(f"  - {mod}\n")
-                    f.write("\n")
-                    
-                if self.excluded_files:
-                    f.write("EXCLUDED FILES:\n")
-                    f.write("-" * 40 + "\n\n")
-                    
-                    for path in sorted(self.excluded_files):
-                        if path in self.conflicts:
-                            mods = self.conflicts[path]
-                            severity = self.get_conflict_severity(path, mods)
-                            f.write(f"File: {path}\n")
-                            f.write(f"Severity: {severity}\n")
-                            f.write(f"Conflicting Mods ({len(mods)}):\n")
-                            for mod in sorted(mods):
-                                f.write(f"  - {mod}\n")
-                            f.write("\n")
-                    
-            messagebox.showinfo("Export Complete", f"Conflict data exported to:\n{file_path}")
-            
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export text: {str(e)}")
+        self.export_report(file_path, report_export.iter_text_report, "Failed to export text")
             
     def export_to_json(self):
+        import report_export
+        
         if not self.conflicts:
             messagebox.showinfo("No Data", "No conflict data to export.")
             return
@@ -2076,47 +3768,38 @@ class ModConflictChecker(tk.Tk):
         if not file_path:
             return
             
-        try:
-            active_conflicts = {path: mods for path, mods in self.conflicts.items() if path not in self.excluded_files}
-            
-            json_data = {
-                "metadata": {
-                    "generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "lml_directory": self.path_var.get(),
-                    "total_conflicts": len(active_conflicts),
-                    "excluded_files": len(self.excluded_files)
-                },
-                "active_conflicts": {},
-                "excluded_files": {}
-            }
+        self.export_report(file_path, report_export.iter_json_report, "Failed to export JSON")
             
-            for path, mods in active_conflicts.items():
-                severity = self.get_conflict_severity(path, mods)
-                json_data["active_conflicts"][path] = {
-                    "mods": list(mods),
-                    "count": len(mods),
-                    "severity": severity
-                }
-                
-            for path in self.excluded_files:
-                if path in self.conflicts:
-                    mods = self.conflicts[path]
-                    severity = self.get_conflict_severity(path, mods)
-                    json_data["excluded_files"][path] = {
-                        "mods": list(mods),
-                        "count": len(mods),
-                        "severity": severity
-                    }
-                
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(json_data, f, indent=4)
-                
-            messagebox.showinfo("Export Complete", f"Conflict data exported to:\n{file_path}")
+    def export_to_data(self):
+        """Export CSV, NDJSON or SQLite for analysis tools, picked by file extension"""
+        import report_export
+        
+        if not self.conflicts:
+            messagebox.showinfo("No Data", "No conflict data to export.")
+            return
             
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export JSON: {str(e)}")
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=report_export.DATA_EXPORT_TYPES + [("All Files", "*.*")],
+            title="Export Conflicts as Data"
+        )
+        
+        if not file_path:
+            return
+            
+        def write_file(progress_callback, cancel_event):
+            report_export.export_data_file(file_path, data, progress_callback, cancel_event)
+        
+        def show_complete(_):
+            messagebox.showinfo("Export Complete", f"Conflict data exported to:\n{file_path}")
+        
+        data = self.report_data()
+        self.run_report_job("Exporting Data", data, write_file, show_complete,
+                            "Export Error", "Failed to export data")
             
     def export_to_html(self):
+        import report_export
+        
         if not self.conflicts:
             messagebox.showinfo("No Data", "No conflict data to export.")
             return
@@ -2130,424 +3813,16 @@ class ModConflictChecker(tk.Tk):
         if not file_path:
             return
             
-        try:
-            html_content = self.generate_html_report()
-            
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(html_content)
-                
+        def on_complete(_):
             result = messagebox.askyesno("Export Complete", 
                                     f"HTML report exported to:\n{file_path}\n\nOpen in browser?")
             if result:
-                webbrowser.open(f"file://{os.path.abspath(file_path)}")
-                
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export HTML: {str(e)}")
-            
-    def generate_html_report(self):
-        active_conflicts = {path: mods for path, mods in self.conflicts.items() if path not in self.excluded_files}
-        
-        severity_counts = {"High": 0, "Medium": 0, "Low": 0}
-        type_groups = defaultdict(list)
-        excluded_type_groups = defaultdict(list)
-        
-        ytd_count = sum(1 for path in active_conflicts if path.endswith('.ytd'))
-        ydd_count = sum(1 for path in active_conflicts if path.endswith('.ydd'))
-        meta_count = sum(1 for path in active_conflicts if path.endswith('.meta'))
-        gxt2_count = sum(1 for path in active_conflicts if path.endswith('.gxt2'))
-        
-        for path, mods in active_conflicts.items():
-            severity = self.get_conflict_severity(path, mods)
-            severity_counts[severity] += 1
-            
-            ext = os.path.splitext(path)[1] or "No Extension"
-            type_groups[ext].append((path, mods, severity))
-            
-        for path in self.excluded_files:
-            if path in self.conflicts:
-                mods = self.conflicts[path]
-                severity = self.get_conflict_severity(path, mods)
-                
-                ext = os.path.splitext(path)[1] or "No Extension"
-                excluded_type_groups[ext].append((path, mods, severity))
-            
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>RDR2 LML Mod Conflict Report</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            margin: 0;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 0 20px rgba(0,0,0,0.1);
-        }}
-        h1, h2 {{
-            color: #333;
-            border-bottom: 3px solid #4a9eff;
-            padding-bottom: 10px;
-        }}
-        h1 {{
-            text-align: center;
-        }}
-        .summary {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin: 30px 0;
-        }}
-        .summary-card {{
-            background: #f8f9fa;
-            padding: 20px;
-            border-radius: 8px;
-            text-align: center;
-            border-left: 4px solid #4a9eff;
-        }}
-        .summary-card h3 {{
-            margin: 0 0 10px 0;
-            color: #333;
-        }}
-        .summary-card .number {{
-            font-size: 2em;
-            font-weight: bold;
-            color: #4a9eff;
-        }}
-        .file-type-section {{
-            margin: 30px 0;
-        }}
-        .file-type-header {{
-            background: #4a9eff;
-            color: white;
-            padding: 15px;
-            border-radius: 8px 8px 0 0;
-            cursor: pointer;
-            user-select: none;
-        }}
-        .file-type-content {{
-            border: 1px solid #ddd;
-            border-top: none;
-            border-radius: 0 0 8px 8px;
-        }}
-        .conflict-item {{
-            padding: 15px;
-            border-bottom: 1px solid #eee;
-        }}
-        .conflict-item:last-child {{
-            border-bottom: none;
-        }}
-        .file-path {{
-            font-weight: bold;
-            color: #333;
-            margin-bottom: 8px;
-        }}
-        .severity {{
-            display: inline-block;
-            padding: 4px 8px;
-            border-radius: 4px;
-            font-size: 0.8em;
-            font-weight: bold;
-            margin-bottom: 8px;
-        }}
-        .severity-high {{
-        background: #ff4757;
-        color: white;
-        }}
-        .severity-medium {{
-            background: #ffa502;
-            color: white;
-        }}
-        .severity-low {{
-            background: #2ed573;
-            color: white;
-        }}
-        .mod-list {{
-            margin-left: 20px;
-        }}
-        .mod-item {{
-            color: #666;
-            margin: 2px 0;
-        }}
-        .collapsible-content {{
-            max-height: 0;
-            overflow: hidden;
-            transition: max-height 0.3s ease;
-        }}
-        .collapsible-content.active {{
-            max-height: 2000px;
-        }}
-        .toggle-icon {{
-            float: right;
-            transition: transform 0.3s ease;
-        }}
-        .toggle-icon.rotated {{
-            transform: rotate(180deg);
-        }}
-        .special-types {{
-            display: flex;
-            justify-content: space-between;
-            margin: 20px 0;
-            flex-wrap: wrap;
-        }}
-        .special-type {{
-            background: #e9f5ff;
-            padding: 15px;
-            border-radius: 8px;
-            flex: 1;
-            margin: 0 10px 10px 0;
-            min-width: 200px;
-            box-shadow: 0 2px 5px rgba(0,0,0,0.05);
-        }}
-        .special-type h4 {{
-            margin: 0 0 10px 0;
-            color: #333;
-        }}
-        .special-type .count {{
-            font-size: 1.5em;
-            font-weight: bold;
-            color: #4a9eff;
-        }}
-        .warning-box {{
-            background-color: #fff3cd;
-            border-left: 4px solid #ffc107;
-            padding: 15px;
-            margin: 20px 0;
-            border-radius: 4px;
-        }}
-        .warning-box h4 {{
-            color: #856404;
-            margin-top: 0;
-        }}
-        .tab-buttons {{
-            display: flex;
-            margin-bottom: 20px;
-            border-bottom: 1px solid #ddd;
-        }}
-        .tab-button {{
-            padding: 10px 20px;
-            background: #f8f9fa;
-            border: 1px solid #ddd;
-            border-bottom: none;
-            border-radius: 5px 5px 0 0;
-            margin-right: 5px;
-            cursor: pointer;
-        }}
-        .tab-button.active {{
-            background: #4a9eff;
-            color: white;
-            border-color: #4a9eff;
-        }}
-        .tab-content {{
-            display: none;
-        }}
-        .tab-content.active {{
-            display: block;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>RDR2 LML Mod Conflict Report</h1>
-        
-        <div class="summary">
-            <div class="summary-card">
-                <h3>Active Conflicts</h3>
-                <div class="number">{len(active_conflicts)}</div>
-            </div>
-            <div class="summary-card">
-                <h3>Excluded Files</h3>
-                <div class="number">{len(self.excluded_files)}</div>
-            </div>
-            <div class="summary-card">
-                <h3>High Severity</h3>
-                <div class="number">{severity_counts['High']}</div>
-            </div>
-            <div class="summary-card">
-                <h3>Medium Severity</h3>
-                <div class="number">{severity_counts['Medium']}</div>
-            </div>
-        </div>
-        
-        <div class="special-types">
-            <div class="special-type">
-                <h4>Texture Conflicts (.ytd)</h4>
-                <div class="count">{ytd_count}</div>
-            </div>
-            <div class="special-type">
-                <h4>Drawable Conflicts (.ydd)</h4>
-                <div class="count">{ydd_count}</div>
-            </div>
-            <div class="special-type">
-                <h4>Metadata Conflicts (.meta)</h4>
-                <div class="count">{meta_count}</div>
-            </div>
-            <div class="special-type">
-                <h4>GXT2 Conflicts</h4>
-                <div class="count">{gxt2_count}</div>
-            </div>
-        </div>
-        
-        {f'''
-        <div class="warning-box">
-            <h4>Warning about GXT2 Files</h4>
-            <p>GXT2 files typically do not conflict and may result in false positives. Modify only if you understand what you're doing.</p>
-        </div>
-        ''' if gxt2_count > 0 else ''}
-        
-        <p><strong>Generated:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        <p><strong>LML Directory:</strong> {self.path_var.get()}</p>
-        
-        <div class="tab-buttons">
-            <div class="tab-button active" onclick="showTab('active-conflicts')">Active Conflicts</div>
-            <div class="tab-button" onclick="showTab('excluded-files')">Excluded Files</div>
-        </div>
-        
-        <div id="active-conflicts" class="tab-content active">
-            <h2>Active Conflicts</h2>
-"""
-        
-        for ext, conflicts in sorted(type_groups.items()):
-            section_id = ext.replace('.', 'dot')
-            html += f"""
-            <div class="file-type-section">
-                <div class="file-type-header" onclick="toggleSection('active-{section_id}')">
-                    <span>{ext} Files ({len(conflicts)} conflicts)</span>
-                    <span class="toggle-icon" id="icon-active-{section_id}">▼</span>
-                </div>
-                <div class="file-type-content">
-                    <div class="collapsible-content" id="content-active-{section_id}">
-"""
-            
-            for path, mods, severity in sorted(conflicts):
-                severity_class = f"severity-{severity.lower()}"
-                html += f"""
-                        <div class="conflict-item">
-                            <div class="file-path">{path}</div>
-                            <span class="severity {severity_class}">{severity} Severity</span>
-                            <div class="mod-list">
-                                <strong>Conflicting Mods ({len(mods)}):</strong>
-"""
-                for mod in mods:
-                    html += f'                                <div class="mod-item">• {mod}</div>\n'
-                    
-                html += """
-                            </div>
-                        </div>
-"""
-            
-            html += """
-                    </div>
-                </div>
-            </div>
-"""
-        
-        html += """
-        </div>
-        
-        <div id="excluded-files" class="tab-content">
-            <h2>Excluded Files</h2>
-"""
-        
-        if not self.excluded_files:
-            html += """
-            <p>No files have been excluded.</p>
-"""
-        else:
-            for ext, conflicts in sorted(excluded_type_groups.items()):
-                section_id = ext.replace('.', 'dot')
-                html += f"""
-                <div class="file-type-section">
-                    <div class="file-type-header" onclick="toggleSection('excluded-{section_id}')">
-                        <span>{ext} Files ({len(conflicts)} excluded)</span>
-                        <span class="toggle-icon" id="icon-excluded-{section_id}">▼</span>
-                    </div>
-                    <div class="file-type-content">
-                        <div class="collapsible-content" id="content-excluded-{section_id}">
-"""
-                
-                for path, mods, severity in sorted(conflicts):
-                    severity_class = f"severity-{severity.lower()}"
-                    html += f"""
-                            <div class="conflict-item">
-                                <div class="file-path">{path}</div>
-                                <span class="severity {severity_class}">{severity} Severity</span>
-                                <div class="mod-list">
-                                    <strong>Conflicting Mods ({len(mods)}):</strong>
-"""
-                    for mod in mods:
-                        html += f'                                    <div class="mod-item">• {mod}</div>\n'
-                        
-                    html += """
-                                </div>
-                            </div>
-"""
-                
-                html += """
-                        </div>
-                    </div>
-                </div>
-"""
-        
-        html += """
-        </div>
-    </div>
-    
-    <script>
-        function toggleSection(sectionId) {
-            const content = document.getElementById('content-' + sectionId);
-            const icon = document.getElementById('icon-' + sectionId);
-            
-            if (content.classList.contains('active')) {
-                content.classList.remove('active');
-                icon.classList.remove('rotated');
-            } else {
-                content.classList.add('active');
-                icon.classList.add('rotated');
-            }
-        }
-        
-        function showTab(tabId) {
-            const tabContents = document.getElementsByClassName('tab-content');
-            for (let i = 0; i < tabContents.length; i++) {
-                tabContents[i].classList.remove('active');
-            }
-            
-            const tabButtons = document.getElementsByClassName('tab-button');
-            for (let i = 0; i < tabButtons.length; i++) {
-                tabButtons[i].classList.remove('active');
-            }
-            
-            document.getElementById(tabId).classList.add('active');
-            
-            const clickedButton = event.target;
-            clickedButton.classList.add('active');
-        }
-        
-        document.addEventListener('DOMContentLoaded', function() {
-            const contents = document.querySelectorAll('.collapsible-content');
-            const icons = document.querySelectorAll('.toggle-icon');
-            
-            contents.forEach(content => content.classList.add('active'));
-            icons.forEach(icon => icon.classList.add('rotated'));
-        });
-    </script>
-</body>
-</html>
-"""
+                self.open_url(f"file://{os.path.abspath(file_path)}")
         
-        return html
+        self.export_report(file_path, report_export.iter_html_report, "Failed to export HTML", on_complete)
 
 if __name__ == '__main__':
+    import multiprocessing
+    multiprocessing.freeze_support()
     app = ModConflictChecker()
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,191 @@
+import os
+import concurrent.futures
+
+from text_diff import diff_hunks, group_nway_regions
+
+MERGEABLE_EXTENSIONS = ('.xml', '.meta', '.dat', '.ini', '.lua')
+
+MERGE_REPORT_NAME = "merge_report.txt"
+
+# Tried in order; a file that decodes cleanly with neither is skipped rather than rewritten lossily
+MERGE_ENCODINGS = ('utf-8', 'cp1252')
+
+
+def merge_versions(base_lines, versions):
+    """Merge every {name: lines} version into base, resolving non-overlapping hunks
+
+    Regions changed by one version, or changed identically by several, are taken
+    as-is. Regions where versions disagree are written with conflict markers.
+    Returns (merged_lines, conflict_count).
+    """
+    hunks = {name: diff_hunks(base_lines, lines) for name, lines in versions.items()}
+    regions = group_nway_regions(base_lines, versions, hunks)
+
+    merged = []
+    conflicts = 0
+    pos = 0
+    for region in regions:
+        merged.extend(base_lines[pos:region["start"]])
+
+        if region["status"] == "conflict":
+            conflicts += 1
+            names = region["names"]
+            merged.append(f"<<<<<<< {names[0]}")
+            merged.extend(region["texts"][names[0]])
+            for name in names[1:]:
+                merged.append(f"======= {name}")
+                merged.extend(region["texts"][name])
+            merged.append(">>>>>>> end of conflict")
+        else:
+            merged.extend(region["texts"][region["names"][0]])
+
+        pos = region["end"]
+
+    merged.extend(base_lines[pos:])
+    return merged, conflicts
+
+
+def _read_lines(path):
+    """Return (lines, (newline, trailing_newline, encoding)), or (None, reason) if it cannot be merged"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if b'\0' in raw[:1024]:
+        return None, "looks binary"
+    for encoding in MERGE_ENCODINGS:
+        try:
+            content = raw.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        return None, "is not UTF-8 or Windows-1252 text"
+    newline = '\r\n' if b'\r\n' in raw else '\n'
+    content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content.splitlines(), (newline, content.endswith('\n'), encoding)
+
+
+def merge_file_task(task):
+    """Merge one conflicting file into the staging folder (runs in a worker process)"""
+    rel_path, mod_paths, base_path, staging_dir = task
+    result = {"path": rel_path, "status": "merged", "conflicts": 0, "message": ""}
+
+    try:
+        if base_path:
+            base_name = "base"
+            base_lines, layout = _read_lines(base_path)
+            others = mod_paths
+        else:
+            base_name, first_path = mod_paths[0]
+            base_lines, layout = _read_lines(first_path)
+            others = mod_paths[1:]
+
+        if base_lines is None:
+            result.update(status="skipped", message=f"{base_name} version {layout}")
+            return result
+
+        versions = {}
+        for name, path in others:
+            lines, reason = _read_lines(path)
+            if lines is None:
+                result.update(status="skipped", message=f"{name} version {reason}")
+                return result
+            versions[name] = lines
+
+        merged, conflicts = merge_versions(base_lines, versions)
+
+        # The merge is written back in the encoding the base version was read with
+        newline, trailing_newline, encoding = layout
+        text = newline.join(merged)
+        if trailing_newline and merged:
+            text += newline
+        try:
+            data = text.encode(encoding)
+        except UnicodeEncodeError:
+            result.update(status="skipped",
+                          message=f"Merged text cannot be saved as {encoding} like the {base_name} version")
+            return result
+
+        output_path = os.path.join(staging_dir, rel_path)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, 'wb') as f:
+            f.write(data)
+
+        if conflicts:
+            result.update(status="conflict", conflicts=conflicts,
+                          message=f"{conflicts} overlapping change(s) need manual attention")
+        elif all(lines == base_lines for lines in versions.values()):
+            result.update(status="identical", message="All versions are identical")
+        else:
+            result["message"] = f"Merged {len(versions)} version(s) onto {base_name}"
+
+    except Exception as e:
+        result.update(status="error", message=str(e))
+
+    return result
+
+
+def build_merge_tasks(lml_dir, conflicts, staging_dir, base_dir=None):
+    tasks = []
+    for rel_path, mods in sorted(conflicts.items()):
+        if not rel_path.lower().endswith(MERGEABLE_EXTENSIONS):
+            continue
+        mod_paths = [(mod, os.path.join(lml_dir, mod, rel_path)) for mod in mods]
+        base_path = None
+        if base_dir:
+            candidate = os.path.join(base_dir, rel_path)
+            if os.path.isfile(candidate):
+                base_path = candidate
+        tasks.append((rel_path, mod_paths, base_path, staging_dir))
+    return tasks
+
+
+def run_batch_merge(lml_dir, conflicts, staging_dir, base_dir=None, progress_callback=None,
+                    cancel_event=None, max_workers=None):
+    """Merge every conflicting text file in a process pool and return the per-file results"""
+    tasks = build_merge_tasks(lml_dir, conflicts, staging_dir, base_dir)
+    os.makedirs(staging_dir, exist_ok=True)
+
+    results = []
+    if not tasks:
+        return results
+
+    workers = max_workers or min(len(tasks), os.cpu_count() or 4)
+
+    def run(executor_class):
+        with executor_class(max_workers=workers) as executor:
+            futures = [executor.submit(merge_file_task, task) for task in tasks]
+            for future in concurrent.futures.as_completed(futures):
+                results.append(future.result())
+                if progress_callback:
+                    progress_callback(len(results), len(tasks))
+                if cancel_event is not None and cancel_event.is_set():
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+    try:
+        run(concurrent.futures.ProcessPoolExecutor)
+    except (OSError, concurrent.futures.BrokenExecutor):
+        # Fall back to threads where worker processes cannot be started
+        results.clear()
+        run(concurrent.futures.ThreadPoolExecutor)
+
+    results.sort(key=lambda r: r["path"])
+    write_merge_report(staging_dir, results)
+    return results
+
+
+def write_merge_report(staging_dir, results):
+    with open(os.path.join(staging_dir, MERGE_REPORT_NAME), 'w', encoding='utf-8') as f:
+        f.write("RDR2 LML Auto-Merge Report\n")
+        f.write("=" * 40 + "\n\n")
+        for status, title in (("conflict", "NEEDS MANUAL ATTENTION"), ("error", "ERRORS"),
+                              ("skipped", "SKIPPED"), ("merged", "MERGED"), ("identical", "IDENTICAL")):
+            entries = [r for r in results if r["status"] == status]
+            if not entries:
+                continue
+            f.write(f"{title} ({len(entries)}):\n")
+            f.write("-" * 40 + "\n")
+            for r in entries:
+                f.write(f"{r['path']}: {r['message']}\n")
+            f.write("\n")
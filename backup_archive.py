@@ -0,0 +1,331 @@
+import os
+import time
+import zlib
+import queue
+import struct
+import threading
+import concurrent.futures
+from collections import deque
+
+METHOD_STORED = 0
+METHOD_DEFLATED = 8
+
+# Files are read and deflated in independent blocks so one large file still uses every core
+BLOCK_SIZE = 1024 * 1024
+COMPRESS_LEVEL = 6
+
+# Game resources that are already compressed gain almost nothing from deflate
+STORED_EXTENSIONS = ('.ytd', '.ydd', '.ydr', '.yft', '.ypt', '.ybn', '.ycd', '.awc', '.rpf',
+                     '.png', '.jpg', '.jpeg', '.ogg', '.mp3', '.wav', '.zip', '.7z', '.rar')
+DEFLATED_EXTENSIONS = ('.xml', '.meta', '.dat', '.ini', '.lua', '.txt', '.json', '.gxt2', '.cfg', '.log')
+
+# Other files are deflated only if a sample of their first block shrinks enough
+SAMPLE_SIZE = 64 * 1024
+SAMPLE_MAX_RATIO = 0.9
+
+ZIP64_LIMIT = 0xFFFFFFFF
+# Sizes above this get a zip64 extra field in their local header before their final size is known
+ZIP64_LOCAL_THRESHOLD = 0xF0000000
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_RECORD = struct.Struct("<IHHHHIIH")
+_ZIP64_END_RECORD = struct.Struct("<IQHHIIQQQQ")
+_ZIP64_LOCATOR = struct.Struct("<IIQI")
+
+# A final, empty fixed-Huffman block that terminates a chain of sync-flushed deflate blocks
+_DEFLATE_TERMINATOR = b'\x03\x00'
+
+
+def compression_policy(arc_name):
+    """Return "store", "deflate" or "auto" for an archive member name"""
+    lower = arc_name.lower()
+    if lower.endswith(STORED_EXTENSIONS):
+        return "store"
+    if lower.endswith(DEFLATED_EXTENSIONS):
+        return "deflate"
+    return "auto"
+
+
+def choose_method(arc_name, first_block):
+    policy = compression_policy(arc_name)
+    if policy == "store" or not first_block:
+        return METHOD_STORED
+    if policy == "deflate":
+        return METHOD_DEFLATED
+    sample = first_block[:SAMPLE_SIZE]
+    ratio = len(zlib.compress(sample, 1)) / len(sample)
+    return METHOD_DEFLATED if ratio < SAMPLE_MAX_RATIO else METHOD_STORED
+
+
+def deflate_block(data):
+    """Raw-deflate one block so it can be concatenated with the blocks around it"""
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+def _dos_datetime(timestamp):
+    t = time.localtime(timestamp)
+    if t.tm_year < 1980:
+        return 0, (1 << 5) | 1
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+class _Entry:
+    __slots__ = ("name", "method", "dos_time", "dos_date", "mode", "offset",
+                 "zip64_local", "crc", "compressed_size", "size")
+
+    def __init__(self, name, method, mtime, mode, offset, zip64_local):
+        self.name = name
+        self.method = method
+        self.dos_time, self.dos_date = _dos_datetime(mtime)
+        self.mode = mode
+        self.offset = offset
+        self.zip64_local = zip64_local
+        self.crc = 0
+        self.compressed_size = 0
+        self.size = 0
+
+
+class ArchiveWriter:
+    """Append-only zip writer that takes member data already compressed
+
+    Each local header is written with placeholder sizes and patched once the
+    member is complete, so data can be streamed in from a compression pool.
+    Zip64 records are added when sizes, offsets or the entry count need them.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.fp = open(path, 'wb')
+        self.entries = []
+        self.current = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.fp.close()
+        return False
+
+    def begin_entry(self, name, method, mtime, mode=0o100644, expected_size=0):
+        encoded = name.encode('utf-8')
+        zip64_local = expected_size > ZIP64_LOCAL_THRESHOLD
+        entry = _Entry(name, method, mtime, mode, self.fp.tell(), zip64_local)
+
+        extra = struct.pack("<HHQQ", 1, 16, 0, 0) if zip64_local else b''
+        sizes = ZIP64_LIMIT if zip64_local else 0
+        self.fp.write(_LOCAL_HEADER.pack(0x04034b50, 45 if zip64_local else 20, 0x800,
+                                         method, entry.dos_time, entry.dos_date,
+                                         0, sizes, sizes, len(encoded), len(extra)))
+        self.fp.write(encoded)
+        self.fp.write(extra)
+        self.current = entry
+        return entry
+
+    def write(self, data):
+        self.fp.write(data)
+        self.current.compressed_size += len(data)
+
+    def end_entry(self, crc, size):
+        entry = self.current
+        entry.crc = crc
+        entry.size = size
+        if not entry.zip64_local and (size > ZIP64_LIMIT or entry.compressed_size > ZIP64_LIMIT):
+            raise ValueError(f"{entry.name} grew past 4 GB while it was being archived")
+
+        end = self.fp.tell()
+        self.fp.seek(entry.offset + 14)
+        if entry.zip64_local:
+            self.fp.write(struct.pack("<I", crc))
+            self.fp.seek(entry.offset + 30 + len(entry.name.encode('utf-8')) + 4)
+            self.fp.write(struct.pack("<QQ", size, entry.compressed_size))
+        else:
+            self.fp.write(struct.pack("<III", crc, entry.compressed_size, size))
+        self.fp.seek(end)
+
+        self.entries.append(entry)
+        self.current = None
+
+    def writestr(self, name, data, mtime=None):
+        """Add an in-memory member, deflated unless that makes it bigger"""
+        compressed = deflate_block(data) + _DEFLATE_TERMINATOR
+        method = METHOD_DEFLATED if len(compressed) < len(data) else METHOD_STORED
+        self.begin_entry(name, method, time.time() if mtime is None else mtime)
+        self.write(compressed if method == METHOD_DEFLATED else data)
+        self.end_entry(zlib.crc32(data), len(data))
+
+    def close(self):
+        if self.fp.closed:
+            return
+        cd_offset = self.fp.tell()
+        for entry in self.entries:
+            encoded = entry.name.encode('utf-8')
+            zip64_fields = []
+            size = entry.size
+            compressed_size = entry.compressed_size
+            offset = entry.offset
+            if size >= ZIP64_LIMIT:
+                zip64_fields.append(size)
+                size = ZIP64_LIMIT
+            if compressed_size >= ZIP64_LIMIT:
+                zip64_fields.append(compressed_size)
+                compressed_size = ZIP64_LIMIT
+            if offset >= ZIP64_LIMIT:
+                zip64_fields.append(offset)
+                offset = ZIP64_LIMIT
+            extra = b''
+            if zip64_fields:
+                extra = struct.pack(f"<HH{len(zip64_fields)}Q", 1, 8 * len(zip64_fields), *zip64_fields)
+            version = 45 if zip64_fields or entry.zip64_local else 20
+
+            self.fp.write(_CENTRAL_HEADER.pack(0x02014b50, version, version, 0x800, entry.method,
+                                               entry.dos_time, entry.dos_date, entry.crc,
+                                               compressed_size, size, len(encoded), len(extra),
+                                               0, 0, 0, (entry.mode & 0xFFFF) << 16, offset))
+            self.fp.write(encoded)
+            self.fp.write(extra)
+
+        cd_end = self.fp.tell()
+        cd_size = cd_end - cd_offset
+        count = len(self.entries)
+        if count >= 0xFFFF or cd_offset >= ZIP64_LIMIT or cd_size >= ZIP64_LIMIT:
+            self.fp.write(_ZIP64_END_RECORD.pack(0x06064b50, 44, 45, 45, 0, 0,
+                                                 count, count, cd_size, cd_offset))
+            self.fp.write(_ZIP64_LOCATOR.pack(0x07064b50, 0, cd_end, 1))
+            self.fp.write(_END_RECORD.pack(0x06054b50, 0, 0, min(count, 0xFFFF), min(count, 0xFFFF),
+                                           min(cd_size, ZIP64_LIMIT), min(cd_offset, ZIP64_LIMIT), 0))
+        else:
+            self.fp.write(_END_RECORD.pack(0x06054b50, 0, 0, count, count, cd_size, cd_offset, 0))
+        self.fp.close()
+
+
+class FileFeed:
+    """Enumerate files on a background thread into a bounded queue
+
+    The archive writer can start on the first file while the tree is still
+    being walked. discovered and finished give a running estimate of the total
+    for progress displays.
+    """
+
+    _DONE = object()
+
+    def __init__(self, files, maxsize=4096):
+        self.queue = queue.Queue(maxsize)
+        self.discovered = 0
+        self.discovered_bytes = 0
+        self.finished = False
+        self.error = None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(files,), daemon=True)
+        self.thread.start()
+
+    def _put(self, item):
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _run(self, files):
+        try:
+            for item in files:
+                self.discovered += 1
+                self.discovered_bytes += item[2].st_size
+                if not self._put(item):
+                    return
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished = True
+            self._put(self._DONE)
+
+    def __iter__(self):
+        while True:
+            item = self.queue.get()
+            if item is self._DONE:
+                if self.error is not None:
+                    raise self.error
+                return
+            yield item
+
+    def total_text(self):
+        return f"{self.discovered}" if self.finished else f"{self.discovered}+"
+
+    def close(self):
+        self.stopped.set()
+
+
+def add_files(writer, files, progress_callback=None, cancel_event=None, max_workers=None, stats=None):
+    """Archive (arc_name, path, stat) items in order, deflating blocks on a worker pool
+
+    The calling thread reads files and writes the archive; workers only compress.
+    At most a few blocks per worker are in flight, which bounds memory use.
+    stats is an optional TransferStats that receives bytes read and written.
+    Returns (file_count, total_bytes).
+    """
+    workers = max_workers or os.cpu_count() or 4
+    max_pending = workers * 4
+    pending = deque()
+    state = {"files": 0, "bytes": 0}
+
+    def flush(limit):
+        while len(pending) > limit:
+            kind, value = pending.popleft()
+            if kind == "begin":
+                writer.begin_entry(*value)
+            elif kind == "data":
+                data = value.result() if isinstance(value, concurrent.futures.Future) else value
+                writer.write(data)
+                if stats is not None:
+                    stats.add_written(len(data))
+            else:
+                crc, size = value
+                writer.end_entry(crc, size)
+                state["files"] += 1
+                state["bytes"] += size
+                if stats is not None:
+                    stats.file_done()
+                if progress_callback:
+                    progress_callback(state["files"], state["bytes"])
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        for arc_name, path, st in files:
+            if cancel_event is not None and cancel_event.is_set():
+                raise InterruptedError("Backup cancelled")
+
+            if stats is not None:
+                stats.set_current(arc_name)
+            with open(path, 'rb') as f:
+                block = f.read(BLOCK_SIZE)
+                method = choose_method(arc_name, block)
+                pending.append(("begin", (arc_name, method, st.st_mtime, st.st_mode, st.st_size)))
+                crc = 0
+                size = 0
+                while block:
+                    crc = zlib.crc32(block, crc)
+                    size += len(block)
+                    if stats is not None:
+                        stats.add_read(len(block))
+                    if method == METHOD_DEFLATED:
+                        pending.append(("data", executor.submit(deflate_block, block)))
+                    else:
+                        pending.append(("data", block))
+                    flush(max_pending)
+                    block = f.read(BLOCK_SIZE)
+
+            if method == METHOD_DEFLATED:
+                pending.append(("data", _DEFLATE_TERMINATOR))
+            pending.append(("end", (crc, size)))
+            flush(max_pending)
+
+        flush(0)
+
+    return state["files"], state["bytes"]
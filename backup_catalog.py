@@ -0,0 +1,156 @@
+import os
+import json
+import zipfile
+import threading
+from datetime import datetime
+
+import backup_store
+import backup_snapshot
+
+CATALOG_NAME = "backup_catalog.json"
+CATALOG_VERSION = 1
+METADATA_NAME = "backup_metadata.json"
+
+_catalog_lock = threading.Lock()
+
+
+def is_backup_file(name):
+    return name.endswith('.zip') or backup_store.is_manifest(name) or backup_snapshot.is_snapshot(name)
+
+
+def _catalog_path(backups_dir):
+    return os.path.join(backups_dir, CATALOG_NAME)
+
+
+def load_catalog(backups_dir):
+    """Return {file_name: entry} from the catalog, or an empty dict if it is missing or unreadable"""
+    try:
+        with open(_catalog_path(backups_dir), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != CATALOG_VERSION:
+        return {}
+    return data.get("backups", {})
+
+
+def save_catalog(backups_dir, catalog):
+    path = _catalog_path(backups_dir)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": CATALOG_VERSION, "backups": catalog}, f, indent=1)
+    os.replace(temp_path, path)
+
+
+def describe_backup(path, st=None):
+    """Read a backup's metadata into a catalog entry (opens the archive or manifest)"""
+    st = st or os.stat(path)
+    file_name = os.path.basename(path)
+    entry = {
+        "name": os.path.splitext(file_name)[0],
+        "date": datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+        "file_count": None,
+        "size": st.st_size,
+        "archive_size": st.st_size,
+        "archive_mtime_ns": st.st_mtime_ns,
+    }
+
+    try:
+        if backup_store.is_manifest(file_name):
+            meta_data = backup_store.load_manifest(path)
+            entry["name"] = file_name[:-len(backup_store.MANIFEST_SUFFIX)]
+            entry["size"] = meta_data.get("total_size", 0)
+        elif backup_snapshot.is_snapshot(file_name):
+            meta_data = backup_snapshot.load_snapshot_manifest(path)
+            entry["name"] = file_name[:-len(backup_snapshot.SNAPSHOT_SUFFIX)]
+            entry["size"] = meta_data.get("total_size", 0)
+        else:
+            with zipfile.ZipFile(path, 'r') as zipf:
+                try:
+                    with zipf.open(METADATA_NAME) as meta_file:
+                        meta_data = json.load(meta_file)
+                except KeyError:
+                    meta_data = {}
+                if "file_count" not in meta_data:
+                    meta_data["file_count"] = sum(1 for info in zipf.infolist() if not info.is_dir())
+        entry["name"] = meta_data.get("name", entry["name"])
+        entry["date"] = meta_data.get("created", entry["date"])
+        entry["file_count"] = meta_data.get("file_count")
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        entry["error"] = str(e)
+
+    return entry
+
+
+def scan_backups(backups_dir):
+    """Match the backup files on disk against the catalog using stat only
+
+    Returns (entries, stale) where entries maps every backup file name to its
+    cataloged entry (or None if it must be re-read) and stale lists the names
+    whose archive is new or changed since it was cataloged.
+    """
+    catalog = load_catalog(backups_dir)
+    entries = {}
+    stale = []
+    try:
+        it = os.scandir(backups_dir)
+    except OSError:
+        return entries, stale
+
+    with it:
+        for dir_entry in it:
+            if not dir_entry.is_file() or not is_backup_file(dir_entry.name):
+                continue
+            st = dir_entry.stat()
+            cached = catalog.get(dir_entry.name)
+            if (cached and cached.get("archive_size") == st.st_size
+                    and cached.get("archive_mtime_ns") == st.st_mtime_ns):
+                entries[dir_entry.name] = cached
+            else:
+                entries[dir_entry.name] = None
+                stale.append(dir_entry.name)
+    return entries, stale
+
+
+def update_catalog(backups_dir, file_names, entry_callback=None):
+    """Re-read the given backups, store them in the catalog and drop entries for deleted files"""
+    described = {}
+    for file_name in file_names:
+        path = os.path.join(backups_dir, file_name)
+        try:
+            described[file_name] = describe_backup(path)
+        except OSError:
+            continue
+        if entry_callback:
+            entry_callback(file_name, described[file_name])
+
+    with _catalog_lock:
+        catalog = load_catalog(backups_dir)
+        catalog.update(described)
+        for file_name in list(catalog):
+            if not os.path.exists(os.path.join(backups_dir, file_name)):
+                del catalog[file_name]
+        try:
+            save_catalog(backups_dir, catalog)
+        except OSError as e:
+            print(f"Failed to save backup catalog: {e}")
+
+
+def record_backup(backups_dir, path, name, created, file_count, size=None):
+    """Add a just-written backup to the catalog without reopening it (size defaults to the archive size)"""
+    st = os.stat(path)
+    entry = {
+        "name": name,
+        "date": created,
+        "file_count": file_count,
+        "size": st.st_size if size is None else size,
+        "archive_size": st.st_size,
+        "archive_mtime_ns": st.st_mtime_ns,
+    }
+    with _catalog_lock:
+        catalog = load_catalog(backups_dir)
+        catalog[os.path.basename(path)] = entry
+        try:
+            save_catalog(backups_dir, catalog)
+        except OSError as e:
+            print(f"Failed to save backup catalog: {e}")
@@ -0,0 +1,104 @@
+import os
+import time
+import zipfile
+from collections import defaultdict
+
+import backup_store
+import backup_snapshot
+
+METADATA_NAME = "backup_metadata.json"
+
+# Zip timestamps have two-second resolution
+MTIME_TOLERANCE = 2
+
+
+class SnapshotEntry:
+    """Size, optional checksum and mtime of one file in a backup or folder"""
+
+    __slots__ = ("size", "checksum", "mtime")
+
+    def __init__(self, size, checksum, mtime):
+        self.size = size
+        self.checksum = checksum
+        self.mtime = mtime
+
+
+def zip_snapshot(path, entries=None):
+    """Read entries from a zip's central directory without touching member data"""
+    entries = {} if entries is None else entries
+    with zipfile.ZipFile(path, 'r') as zipf:
+        for info in zipf.infolist():
+            if info.is_dir() or info.filename == METADATA_NAME:
+                continue
+            entries[info.filename] = SnapshotEntry(info.file_size, ("crc32", info.CRC),
+                                                   time.mktime(info.date_time + (0, 0, -1)))
+    return entries
+
+
+def mod_snapshot(path):
+    """Read the central directories of every archive in a per-mod snapshot"""
+    manifest = backup_snapshot.load_snapshot_manifest(path)
+    entries = {}
+    for entry in manifest["mods"].values():
+        zip_snapshot(backup_snapshot.archive_path(os.path.dirname(path), entry), entries)
+    return entries
+
+
+def manifest_snapshot(path):
+    files = backup_store.load_manifest(path)["files"]
+    return {rel_path: SnapshotEntry(entry["size"], ("blake2b", entry["hash"]), entry["mtime_ns"] / 1e9)
+            for rel_path, entry in files.items()}
+
+
+def folder_snapshot(root):
+    """Read entries from a single scandir walk of a live folder"""
+    return {rel_path: SnapshotEntry(st.st_size, None, st.st_mtime)
+            for rel_path, _, st in backup_store.iter_files(root)}
+
+
+def load_snapshot(path):
+    if os.path.isdir(path):
+        return folder_snapshot(path)
+    if backup_store.is_manifest(path):
+        return manifest_snapshot(path)
+    if backup_snapshot.is_snapshot(path):
+        return mod_snapshot(path)
+    return zip_snapshot(path)
+
+
+def entry_changed(old, new):
+    """True if two entries differ; checksums win when both sides have the same kind"""
+    if old.size != new.size:
+        return True
+    if old.checksum is not None and new.checksum is not None and old.checksum[0] == new.checksum[0]:
+        return old.checksum[1] != new.checksum[1]
+    return abs(old.mtime - new.mtime) >= MTIME_TOLERANCE
+
+
+def diff_snapshots(old, new):
+    """Return {mod: {"added": [...], "removed": [...], "modified": [...]}} between two snapshots
+
+    Each list holds (rel_path, old_entry, new_entry) tuples sorted by path.
+    """
+    grouped = defaultdict(lambda: {"added": [], "removed": [], "modified": []})
+
+    for rel_path, new_entry in new.items():
+        old_entry = old.get(rel_path)
+        if old_entry is None:
+            grouped[backup_snapshot.mod_of(rel_path)]["added"].append((rel_path, None, new_entry))
+        elif entry_changed(old_entry, new_entry):
+            grouped[backup_snapshot.mod_of(rel_path)]["modified"].append((rel_path, old_entry, new_entry))
+
+    for rel_path, old_entry in old.items():
+        if rel_path not in new:
+            grouped[backup_snapshot.mod_of(rel_path)]["removed"].append((rel_path, old_entry, None))
+
+    for changes in grouped.values():
+        for items in changes.values():
+            items.sort(key=lambda item: item[0])
+    return dict(sorted(grouped.items(), key=lambda item: item[0].lower()))
+
+
+def diff_backups(old_path, new_path):
+    """Diff two backups, or a backup and a live folder, from metadata alone"""
+    return diff_snapshots(load_snapshot(old_path), load_snapshot(new_path))
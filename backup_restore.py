@@ -0,0 +1,439 @@
+import os
+import time
+import zlib
+import shutil
+import hashlib
+import zipfile
+import threading
+import concurrent.futures
+from datetime import datetime
+
+import backup_store
+import backup_snapshot
+
+METADATA_NAME = "backup_metadata.json"
+READ_SIZE = 1024 * 1024
+
+# Zip timestamps have two-second resolution
+ZIP_MTIME_TOLERANCE = 2
+
+# Marks an old tree that is being deleted after a restore, as opposed to one kept on purpose
+DISCARD_SUFFIX = ".deleting"
+
+
+def _file_crc32(path):
+    crc = 0
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(READ_SIZE)
+            if not data:
+                return crc
+            crc = zlib.crc32(data, crc)
+
+
+def _file_blake2b(path):
+    hasher = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(READ_SIZE)
+            if not data:
+                return hasher.hexdigest()
+            hasher.update(data)
+
+
+def safe_join(root, rel_path):
+    """Join an archive path onto root, refusing paths that escape it"""
+    path = os.path.normpath(os.path.join(root, *rel_path.split('/')))
+    if os.path.commonpath([os.path.abspath(root), os.path.abspath(path)]) != os.path.abspath(root):
+        raise ValueError(f"Unsafe path in backup: {rel_path}")
+    return path
+
+
+def path_key(rel_path):
+    """Comparison key for a relative path; case-insensitive where the file system is (Windows)"""
+    return os.path.normcase(rel_path)
+
+
+def in_scope(rel_path, mods):
+    """True if a path belongs to one of the given top-level mod folders (or mods is None)"""
+    return mods is None or backup_snapshot.mod_of(rel_path) in mods
+
+
+class ZipSource:
+    """Restore source for zip backups; members are read through one handle per archive per thread
+
+    A per-mod snapshot is read as the union of its mod archives, and only the
+    archives of the requested mods are opened.
+    """
+
+    def __init__(self, path, mods=None):
+        self.path = path
+        self.local = threading.local()
+        self.handles = []
+        self.lock = threading.Lock()
+        self.members = {}
+        self.archives = {}
+
+        if backup_snapshot.is_snapshot(path):
+            manifest = backup_snapshot.load_snapshot_manifest(path)
+            archive_paths = [backup_snapshot.archive_path(os.path.dirname(path), entry)
+                             for mod, entry in manifest["mods"].items() if mods is None or mod in mods]
+        else:
+            archive_paths = [path]
+
+        for archive in archive_paths:
+            with zipfile.ZipFile(archive, 'r') as zipf:
+                for info in zipf.infolist():
+                    if not info.is_dir() and info.filename != METADATA_NAME and in_scope(info.filename, mods):
+                        self.members[info.filename] = info
+                        self.archives[info.filename] = archive
+
+    def _zipfile(self, archive):
+        handles = getattr(self.local, "handles", None)
+        if handles is None:
+            handles = self.local.handles = {}
+        zipf = handles.get(archive)
+        if zipf is None:
+            zipf = handles[archive] = zipfile.ZipFile(archive, 'r')
+            with self.lock:
+                self.handles.append(zipf)
+        return zipf
+
+    def close(self):
+        with self.lock:
+            for zipf in self.handles:
+                zipf.close()
+            self.handles.clear()
+
+    def names(self):
+        return self.members.keys()
+
+    def size(self, name):
+        return self.members[name].file_size
+
+    def mtime(self, name):
+        return time.mktime(self.members[name].date_time + (0, 0, -1))
+
+    def unchanged(self, name, path, st):
+        """True if the file on disk already holds this member"""
+        info = self.members[name]
+        if st.st_size != info.file_size:
+            return False
+        if abs(st.st_mtime - self.mtime(name)) < ZIP_MTIME_TOLERANCE:
+            return True
+        return _file_crc32(path) == info.CRC
+
+    def write(self, name, path, stats=None):
+        info = self.members[name]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._zipfile(self.archives[name]).open(info) as src, open(path, 'wb') as dst:
+            while True:
+                data = src.read(READ_SIZE)
+                if not data:
+                    break
+                dst.write(data)
+                if stats is not None:
+                    stats.add_written(len(data))
+        if stats is not None:
+            stats.add_read(info.compress_size)
+        mtime = self.mtime(name)
+        os.utime(path, (mtime, mtime))
+
+
+class ManifestSource:
+    """Restore source for an incremental backup manifest"""
+
+    def __init__(self, manifest_path, mods=None):
+        self.path = manifest_path
+        self.manifest = backup_store.load_manifest(manifest_path)
+        self.members = {rel_path: entry for rel_path, entry in self.manifest["files"].items()
+                        if in_scope(rel_path, mods)}
+        self.store = backup_store.BackupStore(os.path.dirname(manifest_path))
+
+    def names(self):
+        return self.members.keys()
+
+    def size(self, name):
+        return self.members[name]["size"]
+
+    def unchanged(self, name, path, st):
+        entry = self.members[name]
+        if st.st_size != entry["size"]:
+            return False
+        if st.st_mtime_ns == entry["mtime_ns"]:
+            return True
+        return _file_blake2b(path) == entry["hash"]
+
+    def write(self, name, path, stats=None):
+        self.store.write_file(self.members[name], path, stats)
+
+    def close(self):
+        pass
+
+
+def open_source(backup_path, mods=None):
+    if backup_store.is_manifest(backup_path):
+        return ManifestSource(backup_path, mods)
+    return ZipSource(backup_path, mods)
+
+
+def backup_mods(backup_path):
+    """Return {mod: file_count} for the top-level mod folders in a backup"""
+    if backup_snapshot.is_snapshot(backup_path):
+        manifest = backup_snapshot.load_snapshot_manifest(backup_path)
+        return {mod: entry["file_count"] for mod, entry in manifest["mods"].items()}
+    source = open_source(backup_path)
+    try:
+        counts = {}
+        for name in source.names():
+            mod = backup_snapshot.mod_of(name)
+            counts[mod] = counts.get(mod, 0) + 1
+        return counts
+    finally:
+        source.close()
+
+
+def plan_restore(source, lml_dir, progress_callback=None, max_workers=None, mods=None, cancel_event=None):
+    """Compare a backup with lml_dir and return (to_write, to_delete, unchanged_count)
+
+    Sizes and mtimes come from a single scandir walk; file contents are only
+    read when the size matches but the mtime does not. When mods is given, only
+    those top-level folders are compared and only files inside them are deleted.
+    Paths are matched with path_key, so on Windows a file whose name differs
+    from the backup only in case counts as the same file and is never deleted.
+    """
+    on_disk = {path_key(rel_path): (rel_path, path, st) for rel_path, path, st in backup_store.iter_files(lml_dir)
+               if in_scope(rel_path, mods)}
+    names = list(source.names())
+    to_write = []
+    to_check = []
+
+    for name in names:
+        current = on_disk.get(path_key(name))
+        if current is None or current[2].st_size != source.size(name):
+            to_write.append(name)
+        else:
+            to_check.append((name, current[1:]))
+
+    unchanged = 0
+    checked = 0
+    workers = max_workers or min(8, os.cpu_count() or 4)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(source.unchanged, name, path, st): name
+                   for name, (path, st) in to_check}
+        for future in concurrent.futures.as_completed(futures):
+            if cancel_event is not None and cancel_event.is_set():
+                for other in futures:
+                    other.cancel()
+                raise InterruptedError("Restore cancelled")
+            if future.result():
+                unchanged += 1
+            else:
+                to_write.append(futures[future])
+            checked += 1
+            if progress_callback:
+                progress_callback(checked, len(to_check))
+
+    backup_keys = {path_key(name) for name in names}
+    to_delete = sorted(rel_path for key, (rel_path, _, _) in on_disk.items() if key not in backup_keys)
+    return sorted(to_write), to_delete, unchanged
+
+
+def _write_members(source, names, root, report, stats, cancel_event, max_workers):
+    """Extract names under root on a thread pool, stopping early if cancel_event is set"""
+    if stats is not None:
+        stats.set_total(sum(source.size(name) for name in names), len(names))
+
+    def write_one(name):
+        if cancel_event is not None and cancel_event.is_set():
+            raise InterruptedError("Restore cancelled")
+        if stats is not None:
+            stats.set_current(name)
+        # Replace rather than overwrite, so a file hard-linked into a kept .previous_ tree is never written through
+        path = safe_join(root, name)
+        temp_path = path + ".restoring"
+        try:
+            source.write(name, temp_path, stats)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        if stats is not None:
+            stats.file_done()
+
+    written = 0
+    workers = max_workers or min(8, os.cpu_count() or 4)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(write_one, name) for name in names]
+        for future in concurrent.futures.as_completed(futures):
+            if cancel_event is not None and cancel_event.is_set():
+                for other in futures:
+                    other.cancel()
+                raise InterruptedError("Restore cancelled")
+            future.result()
+            written += 1
+            report("extract", written, len(names))
+    return written
+
+
+def _remove_empty_parents(path, root):
+    parent = os.path.dirname(path)
+    root = os.path.abspath(root)
+    while os.path.abspath(parent) != root:
+        try:
+            os.rmdir(parent)
+        except OSError:
+            return
+        parent = os.path.dirname(parent)
+
+
+def differential_restore(backup_path, lml_dir, progress_callback=None, max_workers=None, mods=None,
+                         stats=None, cancel_event=None):
+    """Bring lml_dir in line with a backup, rewriting only the files that differ
+
+    progress_callback(phase, done, total) is called with phase "compare",
+    "extract" or "delete". When mods is given, only those top-level folders are
+    restored. Cancelling stops between files, so files already rewritten stay
+    rewritten. Returns a dict of counts.
+    """
+    def report(phase, done, total):
+        if progress_callback:
+            progress_callback(phase, done, total)
+
+    source = open_source(backup_path, mods)
+    try:
+        to_write, to_delete, unchanged = plan_restore(
+            source, lml_dir, lambda done, total: report("compare", done, total),
+            max_workers, mods, cancel_event)
+
+        written = _write_members(source, to_write, lml_dir, report, stats, cancel_event, max_workers)
+
+        for count, rel_path in enumerate(to_delete, start=1):
+            if cancel_event is not None and cancel_event.is_set():
+                raise InterruptedError("Restore cancelled")
+            path = safe_join(lml_dir, rel_path)
+            os.remove(path)
+            _remove_empty_parents(path, lml_dir)
+            report("delete", count, len(to_delete))
+
+        return {"unchanged": unchanged, "written": written, "deleted": len(to_delete)}
+    finally:
+        source.close()
+
+
+def _link_or_copy(src, dst):
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _unused_path(path):
+    candidate = path
+    counter = 2
+    while os.path.exists(candidate):
+        candidate = f"{path}_{counter}"
+        counter += 1
+    return candidate
+
+
+def remove_leftovers(lml_dir):
+    """Delete staging folders and old trees that an interrupted restore left beside lml_dir"""
+    parent, base = os.path.split(lml_dir)
+    base = os.path.normcase(base)
+    try:
+        names = os.listdir(parent)
+    except OSError:
+        return
+    for name in names:
+        key = os.path.normcase(name)
+        if key.startswith(base + ".restore_") or (key.startswith(base + ".previous_")
+                                                   and key.endswith(DISCARD_SUFFIX)):
+            shutil.rmtree(os.path.join(parent, name), ignore_errors=True)
+
+
+def verify_tree(source, root):
+    """Return the backup members that are missing from root or have the wrong size"""
+    on_disk = {path_key(rel_path): st.st_size for rel_path, _, st in backup_store.iter_files(root)}
+    return [name for name in source.names() if on_disk.get(path_key(name)) != source.size(name)]
+
+
+def staged_restore(backup_path, lml_dir, progress_callback=None, keep_previous=False, max_workers=None,
+                   stats=None, cancel_event=None):
+    """Rebuild lml_dir in a sibling folder, verify it, then swap it in with two renames
+
+    Files that already match the backup are hard-linked (or copied) from the
+    live folder instead of being extracted again. The live folder is only
+    unavailable between the two renames. Returns (counts, previous_dir), where
+    previous_dir is the old tree when keep_previous is set; otherwise it is
+    deleted on a background thread and None is returned. Cancelling before the
+    swap removes the staging folder and leaves lml_dir untouched. Anything an
+    interrupted restore or deletion left behind is removed by the next one.
+
+    A kept previous_dir is not an independent copy: the reused files are
+    hard links shared with the restored tree. Restores replace files instead
+    of writing into them, so they leave it intact, but another program that
+    edits a restored file in place changes the previous_dir copy too.
+    """
+    lml_dir = os.path.normpath(os.path.abspath(lml_dir))
+    remove_leftovers(lml_dir)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    staging_dir = _unused_path(f"{lml_dir}.restore_{stamp}")
+
+    def report(phase, done, total):
+        if progress_callback:
+            progress_callback(phase, done, total)
+
+    source = open_source(backup_path)
+    try:
+        to_write, _, unchanged = plan_restore(source, lml_dir,
+                                              lambda done, total: report("compare", done, total),
+                                              max_workers, cancel_event=cancel_event)
+        write_set = set(to_write)
+        to_link = [name for name in source.names() if name not in write_set]
+
+        os.makedirs(staging_dir)
+        for count, name in enumerate(to_link, start=1):
+            if cancel_event is not None and cancel_event.is_set():
+                raise InterruptedError("Restore cancelled")
+            _link_or_copy(safe_join(lml_dir, name), safe_join(staging_dir, name))
+            if count % 100 == 0 or count == len(to_link):
+                report("link", count, len(to_link))
+
+        written = _write_members(source, to_write, staging_dir, report, stats, cancel_event, max_workers)
+
+        report("verify", 0, 1)
+        bad = verify_tree(source, staging_dir)
+        if bad:
+            raise ValueError(f"{len(bad)} file(s) did not restore correctly, e.g. {bad[0]}")
+        if cancel_event is not None and cancel_event.is_set():
+            raise InterruptedError("Restore cancelled")
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+    finally:
+        source.close()
+
+    report("swap", 0, 1)
+    previous_dir = _unused_path(f"{lml_dir}.previous_{stamp}" + ("" if keep_previous else DISCARD_SUFFIX))
+    try:
+        os.rename(lml_dir, previous_dir)
+    except OSError:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+    try:
+        os.rename(staging_dir, lml_dir)
+    except OSError:
+        os.rename(previous_dir, lml_dir)
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    counts = {"unchanged": unchanged, "written": written, "linked": len(to_link)}
+    if keep_previous:
+        return counts, previous_dir
+
+    # Not a daemon, so closing the app waits for the deletion instead of cutting it short
+    threading.Thread(target=shutil.rmtree, args=(previous_dir, True)).start()
+    return counts, None
@@ -0,0 +1,165 @@
+import os
+import re
+import json
+import hashlib
+import threading
+import concurrent.futures
+from collections import defaultdict
+from datetime import datetime
+
+import backup_archive
+import backup_store
+
+SNAPSHOT_SUFFIX = ".snapshot.json"
+SNAPSHOT_VERSION = 1
+ARCHIVE_DIR_NAME = ".mods"
+
+# Files directly inside the LML folder are archived together under this name
+ROOT_MOD = "(LML root)"
+
+
+def is_snapshot(path):
+    return path.endswith(SNAPSHOT_SUFFIX)
+
+
+def snapshot_path(backups_dir, backup_name):
+    return os.path.join(backups_dir, f"{backup_name}{SNAPSHOT_SUFFIX}")
+
+
+def load_snapshot_manifest(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {manifest.get('version')}")
+    return manifest
+
+
+def archive_path(backups_dir, mod_entry):
+    return os.path.join(backups_dir, ARCHIVE_DIR_NAME, mod_entry["archive"])
+
+
+def mod_of(rel_path):
+    return rel_path.split('/', 1)[0] if '/' in rel_path else ROOT_MOD
+
+
+def group_files_by_mod(lml_dir):
+    mods = defaultdict(list)
+    for rel_path, path, st in backup_store.iter_files(lml_dir):
+        mods[mod_of(rel_path)].append((rel_path, path, st))
+    return mods
+
+
+def mod_fingerprint(files):
+    """Hash of every (path, size, mtime) in a mod; equal fingerprints mean an unchanged mod"""
+    hasher = hashlib.blake2b(digest_size=16)
+    for rel_path, _, st in sorted(files, key=lambda item: item[0]):
+        hasher.update(f"{rel_path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def _archive_name(mod, fingerprint):
+    safe = re.sub(r'[^A-Za-z0-9._-]+', '_', mod).strip('._') or "mod"
+    return f"{safe[:60]}-{fingerprint}.zip"
+
+
+def _write_mod_archive(path, files, progress_callback, cancel_event, stats=None):
+    temp_path = path + ".tmp"
+    try:
+        with backup_archive.ArchiveWriter(temp_path) as writer:
+            backup_archive.add_files(writer, sorted(files, key=lambda item: item[0]), progress_callback,
+                                     cancel_event, max_workers=2, stats=stats)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def create_mod_snapshot(lml_dir, backups_dir, backup_name, progress_callback=None,
+                        cancel_event=None, max_workers=None, stats=None):
+    """Back up lml_dir as one zip per top-level mod folder plus a snapshot manifest
+
+    Archives live in a shared pool named by mod and fingerprint, so a mod whose
+    files are unchanged since any earlier snapshot reuses that archive without
+    being read. Changed mods are archived in parallel.
+    progress_callback(mods_done, mods_total, bytes_done) reports progress and
+    stats, an optional TransferStats, totals only the mods that are archived.
+    """
+    pool_dir = os.path.join(backups_dir, ARCHIVE_DIR_NAME)
+    os.makedirs(pool_dir, exist_ok=True)
+
+    mods = group_files_by_mod(lml_dir)
+    entries = {}
+    pending = []
+    for mod, files in mods.items():
+        fingerprint = mod_fingerprint(files)
+        entry = {
+            "archive": _archive_name(mod, fingerprint),
+            "fingerprint": fingerprint,
+            "file_count": len(files),
+            "size": sum(st.st_size for _, _, st in files),
+        }
+        entries[mod] = entry
+        if not os.path.exists(archive_path(backups_dir, entry)):
+            pending.append((mod, files))
+
+    result = {"mods": len(mods), "reused": len(mods) - len(pending), "archived": 0, "bytes_archived": 0}
+    done = {"mods": result["reused"], "bytes": 0}
+    if stats is not None:
+        stats.set_total(sum(entries[mod]["size"] for mod, _ in pending),
+                        sum(len(files) for _, files in pending))
+    lock = threading.Lock()
+
+    def on_bytes(delta):
+        with lock:
+            done["bytes"] += delta
+            mods_done, bytes_done = done["mods"], done["bytes"]
+        if progress_callback:
+            progress_callback(mods_done, len(mods), bytes_done)
+
+    def archive_mod(mod, files):
+        last = [0]
+
+        def on_progress(file_count, total_bytes):
+            delta = total_bytes - last[0]
+            last[0] = total_bytes
+            on_bytes(delta)
+
+        _write_mod_archive(archive_path(backups_dir, entries[mod]), files, on_progress, cancel_event, stats)
+        return entries[mod]["size"]
+
+    if progress_callback:
+        progress_callback(done["mods"], len(mods), 0)
+
+    workers = max_workers or min(4, os.cpu_count() or 4)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(archive_mod, mod, files) for mod, files in pending]
+        for future in concurrent.futures.as_completed(futures):
+            if cancel_event is not None and cancel_event.is_set():
+                for other in futures:
+                    other.cancel()
+                raise InterruptedError("Backup cancelled")
+            result["bytes_archived"] += future.result()
+            result["archived"] += 1
+            with lock:
+                done["mods"] += 1
+            on_bytes(0)
+
+    if cancel_event is not None and cancel_event.is_set():
+        raise InterruptedError("Backup cancelled")
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "name": backup_name,
+        "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "lml_dir": lml_dir,
+        "file_count": sum(entry["file_count"] for entry in entries.values()),
+        "total_size": sum(entry["size"] for entry in entries.values()),
+        "mods": dict(sorted(entries.items(), key=lambda item: item[0].lower())),
+    }
+    path = snapshot_path(backups_dir, backup_name)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(temp_path, path)
+    return manifest, result
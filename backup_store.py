@@ -0,0 +1,315 @@
+import os
+import json
+import zlib
+import hashlib
+import threading
+import concurrent.futures
+from datetime import datetime
+
+from backup_archive import compression_policy
+
+STORE_DIR_NAME = ".store"
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_VERSION = 1
+
+# Files are split into fixed-size chunks so a changed file only adds its changed chunks
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# Every stored object starts with a one-byte codec tag
+CODEC_ZLIB = b'z'
+CODEC_STORE = b's'
+
+# Held while a backup writes chunks and while unreferenced chunks are swept, so a
+# sweep never deletes chunks a backup has written but not yet listed in its manifest
+_store_lock = threading.Lock()
+
+
+def iter_files(root):
+    """Yield (rel_path, path, stat) for every file under root using a single scandir walk
+
+    A folder that cannot be read raises OSError, so a backup never silently leaves it out.
+    """
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as it:
+            entries = list(it)
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+            elif entry.is_file():
+                rel_path = os.path.relpath(entry.path, root).replace(os.sep, '/')
+                yield rel_path, entry.path, entry.stat()
+
+
+def is_manifest(path):
+    return path.endswith(MANIFEST_SUFFIX)
+
+
+def manifest_path(backups_dir, backup_name):
+    return os.path.join(backups_dir, f"{backup_name}{MANIFEST_SUFFIX}")
+
+
+def load_manifest(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported backup manifest version: {manifest.get('version')}")
+    return manifest
+
+
+def write_manifest(path, manifest):
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+    os.replace(temp_path, path)
+
+
+def latest_manifest(backups_dir, lml_dir=None):
+    """Return the newest manifest in backups_dir (optionally for one LML folder), or None"""
+    newest = None
+    try:
+        names = os.listdir(backups_dir)
+    except OSError:
+        return None
+
+    for name in names:
+        if not is_manifest(name):
+            continue
+        try:
+            manifest = load_manifest(os.path.join(backups_dir, name))
+        except (OSError, ValueError):
+            continue
+        if lml_dir and os.path.normcase(manifest.get("lml_dir", "")) != os.path.normcase(lml_dir):
+            continue
+        if newest is None or manifest.get("created", "") > newest.get("created", ""):
+            newest = manifest
+    return newest
+
+
+def referenced_objects(backups_dir):
+    """Return the digest of every chunk used by a manifest in backups_dir"""
+    referenced = set()
+    for name in os.listdir(backups_dir):
+        if is_manifest(name):
+            for entry in load_manifest(os.path.join(backups_dir, name))["files"].values():
+                referenced.update(entry["chunks"])
+    return referenced
+
+
+def sweep_objects(backups_dir):
+    """Delete stored chunks that no manifest uses any more; returns (objects_removed, bytes_freed)
+
+    Run after deleting a manifest. A manifest that cannot be read raises instead
+    of sweeping, since its chunks could not be told apart from unused ones.
+    """
+    store = BackupStore(backups_dir)
+    removed = 0
+    freed = 0
+    with _store_lock:
+        if not os.path.isdir(store.objects_dir):
+            return removed, freed
+        referenced = referenced_objects(backups_dir)
+        for prefix in os.scandir(store.objects_dir):
+            if not prefix.is_dir():
+                continue
+            for entry in os.scandir(prefix.path):
+                # Leftover .tmp files from interrupted writes are unused as well
+                if entry.name in referenced:
+                    continue
+                try:
+                    size = entry.stat().st_size
+                    os.remove(entry.path)
+                except OSError:
+                    continue
+                removed += 1
+                freed += size
+    return removed, freed
+
+
+class BackupStore:
+    """Content-addressed chunk store shared by every incremental backup in a folder
+
+    Chunks are named by their blake2b digest, so content that appears in many
+    files or many backups is stored once. A backup is only a manifest mapping
+    each path to its size, mtime, file hash and chunk list.
+    """
+
+    def __init__(self, backups_dir):
+        self.root = os.path.join(backups_dir, STORE_DIR_NAME)
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.known_objects = None
+        self.lock = threading.Lock()
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def _load_known_objects(self):
+        known = set()
+        if os.path.isdir(self.objects_dir):
+            for prefix in os.scandir(self.objects_dir):
+                if prefix.is_dir():
+                    known.update(entry.name for entry in os.scandir(prefix.path)
+                                 if not entry.name.endswith(".tmp"))
+        return known
+
+    def has_object(self, digest):
+        with self.lock:
+            if self.known_objects is None:
+                self.known_objects = self._load_known_objects()
+            return digest in self.known_objects
+
+    def put_chunk(self, data, compress=True):
+        """Store a chunk if it is new and return (digest, bytes_written)"""
+        digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+        if self.has_object(digest):
+            return digest, 0
+
+        payload = CODEC_STORE + data
+        if compress:
+            compressed = zlib.compress(data, 6)
+            if len(compressed) < len(data):
+                payload = CODEC_ZLIB + compressed
+
+        path = self.object_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+
+        with self.lock:
+            self.known_objects.add(digest)
+        return digest, len(payload)
+
+    def read_chunk(self, digest):
+        with open(self.object_path(digest), 'rb') as f:
+            payload = f.read()
+        codec, body = payload[:1], payload[1:]
+        data = zlib.decompress(body) if codec == CODEC_ZLIB else body
+        if hashlib.blake2b(data, digest_size=20).hexdigest() != digest:
+            raise ValueError(f"Backup store object {digest} is corrupt")
+        return data
+
+    def store_file(self, path, compress=True, stats=None):
+        """Chunk and store one file, returning (file_hash, chunks, bytes_written)"""
+        file_hasher = hashlib.blake2b(digest_size=20)
+        chunks = []
+        written = 0
+        with open(path, 'rb') as f:
+            while True:
+                data = f.read(CHUNK_SIZE)
+                if not data:
+                    break
+                file_hasher.update(data)
+                digest, size = self.put_chunk(data, compress)
+                chunks.append(digest)
+                written += size
+                if stats is not None:
+                    stats.add_read(len(data))
+                    stats.add_written(size)
+        return file_hasher.hexdigest(), chunks, written
+
+    def write_file(self, entry, dest_path, stats=None):
+        """Rebuild a manifest entry at dest_path and give it the recorded mtime"""
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        with open(dest_path, 'wb') as f:
+            for digest in entry["chunks"]:
+                data = self.read_chunk(digest)
+                f.write(data)
+                if stats is not None:
+                    stats.add_read(len(data))
+                    stats.add_written(len(data))
+        os.utime(dest_path, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+
+
+def create_snapshot(lml_dir, backups_dir, backup_name, previous=None, progress_callback=None,
+                    cancel_event=None, max_workers=None, stats=None):
+    """Write an incremental backup of lml_dir and return its manifest
+
+    Files whose size and mtime match the previous manifest reuse its chunk list
+    without being read. Everything else is chunked and hashed in a thread pool;
+    only chunks missing from the store are written. stats is an optional
+    TransferStats whose totals cover the files that have to be read.
+    """
+    with _store_lock:
+        store = BackupStore(backups_dir)
+        previous_files = (previous or {}).get("files", {})
+
+        files = {}
+        pending = []
+        total_size = 0
+        for rel_path, path, st in iter_files(lml_dir):
+            total_size += st.st_size
+            old = previous_files.get(rel_path)
+            if (old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns
+                    and all(store.has_object(digest) for digest in old["chunks"])):
+                files[rel_path] = old
+            else:
+                pending.append((rel_path, path, st))
+
+        result = {"files": len(files) + len(pending), "unchanged": len(files),
+                  "hashed": 0, "bytes_written": 0, "total_size": total_size}
+        if stats is not None:
+            stats.set_total(sum(st.st_size for _, _, st in pending), len(pending))
+
+        def store_one(item):
+            rel_path, path, st = item
+            if cancel_event is not None and cancel_event.is_set():
+                raise InterruptedError("Backup cancelled")
+            if stats is not None:
+                stats.set_current(rel_path)
+            file_hash, chunks, written = store.store_file(path, compression_policy(rel_path) != "store", stats)
+            if stats is not None:
+                stats.file_done()
+            return rel_path, {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                              "hash": file_hash, "chunks": chunks}, written
+
+        if progress_callback:
+            progress_callback(len(files), result["files"], 0)
+
+        workers = max_workers or min(8, os.cpu_count() or 4)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(store_one, item) for item in pending]
+            for future in concurrent.futures.as_completed(futures):
+                if cancel_event is not None and cancel_event.is_set():
+                    for other in futures:
+                        other.cancel()
+                    raise InterruptedError("Backup cancelled")
+                rel_path, entry, written = future.result()
+                files[rel_path] = entry
+                result["hashed"] += 1
+                result["bytes_written"] += written
+                if progress_callback:
+                    progress_callback(len(files), result["files"], result["bytes_written"])
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "name": backup_name,
+            "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "lml_dir": lml_dir,
+            "file_count": len(files),
+            "total_size": total_size,
+            "files": dict(sorted(files.items())),
+        }
+        write_manifest(manifest_path(backups_dir, backup_name), manifest)
+        return manifest, result
+
+
+def restore_snapshot(manifest, backups_dir, lml_dir, progress_callback=None, max_workers=None):
+    """Rebuild every file of a manifest under lml_dir"""
+    store = BackupStore(backups_dir)
+    items = list(manifest["files"].items())
+    done = 0
+
+    def restore_one(item):
+        rel_path, entry = item
+        store.write_file(entry, os.path.join(lml_dir, *rel_path.split('/')))
+
+    workers = max_workers or min(8, os.cpu_count() or 4)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in concurrent.futures.as_completed([executor.submit(restore_one, item) for item in items]):
+            future.result()
+            done += 1
+            if progress_callback:
+                progress_callback(done, len(items))
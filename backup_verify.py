@@ -0,0 +1,191 @@
+import os
+import json
+import zlib
+import zipfile
+import threading
+import concurrent.futures
+
+import backup_store
+import backup_snapshot
+
+METADATA_NAME = "backup_metadata.json"
+READ_SIZE = 1024 * 1024
+
+
+class VerifyResult:
+    """Outcome of a backup verification"""
+
+    def __init__(self, expected_count, member_count):
+        self.expected_count = expected_count
+        self.member_count = member_count
+        self.checked = 0
+        self.checked_bytes = 0
+        self.unit = "entries"
+        self.total_units = member_count
+        self.corrupt = []
+        self.cancelled = False
+
+    @property
+    def missing_count(self):
+        if self.expected_count is None:
+            return 0
+        return max(0, self.expected_count - self.member_count)
+
+    @property
+    def ok(self):
+        return not self.cancelled and not self.corrupt and not self.missing_count
+
+    def summary_text(self):
+        if self.cancelled:
+            return f"Verification cancelled after {self.checked:,} of {self.total_units:,} {self.unit}."
+        lines = [f"Checked {self.checked:,} {self.unit} ({self.checked_bytes / (1024*1024):.1f} MB)."]
+        if self.expected_count is not None:
+            lines.append(f"Metadata lists {self.expected_count:,} files; the backup holds {self.member_count:,}.")
+        if self.missing_count:
+            lines.append(f"{self.missing_count:,} file(s) are missing.")
+        if self.corrupt:
+            lines.append(f"{len(self.corrupt):,} entry(s) are corrupt:")
+            lines.extend(f"  {name}: {error}" for name, error in self.corrupt[:20])
+            if len(self.corrupt) > 20:
+                lines.append(f"  ...and {len(self.corrupt) - 20:,} more")
+        if self.ok:
+            lines.append("The backup is intact.")
+        return "\n".join(lines)
+
+
+def _split_by_size(items, sizes, parts):
+    """Spread items over parts so each gets a similar number of bytes"""
+    buckets = [[] for _ in range(parts)]
+    totals = [0] * parts
+    for item, size in sorted(zip(items, sizes), key=lambda pair: pair[1], reverse=True):
+        smallest = totals.index(min(totals))
+        buckets[smallest].append(item)
+        totals[smallest] += size
+    return [bucket for bucket in buckets if bucket]
+
+
+def _verify_zips(archives, expected, result, progress, cancel_event, workers):
+    members = []
+    for archive in archives:
+        try:
+            with zipfile.ZipFile(archive, 'r') as zipf:
+                infos = [info for info in zipf.infolist() if not info.is_dir()]
+                if METADATA_NAME in zipf.NameToInfo:
+                    try:
+                        with zipf.open(METADATA_NAME) as meta_file:
+                            expected = json.load(meta_file).get("file_count", expected)
+                    except (ValueError, zipfile.BadZipFile, zlib.error) as e:
+                        result.corrupt.append((METADATA_NAME, str(e)))
+        except (OSError, zipfile.BadZipFile) as e:
+            result.corrupt.append((os.path.basename(archive), str(e)))
+            continue
+        members.extend((archive, info) for info in infos if info.filename != METADATA_NAME)
+
+    result.expected_count = expected
+    result.member_count = result.total_units = len(members)
+    total_bytes = sum(info.file_size for _, info in members)
+
+    def verify_part(part):
+        # Every worker streams its members through its own handles
+        handles = {}
+        try:
+            for archive, info in part:
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                try:
+                    zipf = handles.get(archive)
+                    if zipf is None:
+                        zipf = handles[archive] = zipfile.ZipFile(archive, 'r')
+                    with zipf.open(info) as member:
+                        while True:
+                            data = member.read(READ_SIZE)
+                            if not data:
+                                break
+                            progress(len(data), 0, total_bytes)
+                except (zipfile.BadZipFile, zlib.error, EOFError, OSError, NotImplementedError) as e:
+                    progress(0, 0, total_bytes, (info.filename, str(e)))
+                progress(0, 1, total_bytes)
+        finally:
+            for zipf in handles.values():
+                zipf.close()
+
+    parts = _split_by_size(members, [info.file_size for _, info in members], workers)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(parts))) as executor:
+        for future in [executor.submit(verify_part, part) for part in parts]:
+            future.result()
+
+
+def _verify_manifest(path, result, progress, cancel_event, workers):
+    manifest = backup_store.load_manifest(path)
+    store = backup_store.BackupStore(os.path.dirname(path))
+    files = manifest["files"]
+    result.expected_count = manifest.get("file_count")
+    result.member_count = len(files)
+
+    chunk_sizes = {}
+    chunk_owner = {}
+    for rel_path, entry in files.items():
+        remaining = entry["size"]
+        for digest in entry["chunks"]:
+            size = min(remaining, backup_store.CHUNK_SIZE)
+            remaining -= size
+            chunk_sizes.setdefault(digest, size)
+            chunk_owner.setdefault(digest, rel_path)
+    total_bytes = sum(chunk_sizes.values())
+    # Shared chunks are read once, so progress is counted in chunks
+    result.unit = "chunks"
+    result.total_units = len(chunk_sizes)
+
+    def verify_part(part):
+        for digest in part:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            try:
+                data = store.read_chunk(digest)
+                progress(len(data), 0, total_bytes)
+            except FileNotFoundError:
+                progress(0, 0, total_bytes, (chunk_owner[digest], f"chunk {digest} is missing"))
+            except (ValueError, zlib.error, OSError) as e:
+                progress(0, 0, total_bytes, (chunk_owner[digest], str(e)))
+            progress(0, 1, total_bytes)
+
+    digests = list(chunk_sizes)
+    parts = _split_by_size(digests, [chunk_sizes[d] for d in digests], workers)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(parts))) as executor:
+        for future in [executor.submit(verify_part, part) for part in parts]:
+            future.result()
+
+
+def verify_backup(path, progress_callback=None, cancel_event=None, max_workers=None):
+    """Read every entry of a zip backup, per-mod snapshot or incremental manifest and check its CRC or hash
+
+    progress_callback(done_bytes, total_bytes) is called as data streams in.
+    Returns a VerifyResult; corrupt entries are listed with their errors.
+    """
+    result = VerifyResult(None, 0)
+    lock = threading.Lock()
+
+    def progress(nbytes, nentries, total_bytes, corrupt=None):
+        with lock:
+            result.checked_bytes += nbytes
+            result.checked += nentries
+            if corrupt is not None:
+                result.corrupt.append(corrupt)
+            done = result.checked_bytes
+        if progress_callback and nbytes:
+            progress_callback(done, total_bytes)
+
+    workers = max_workers or min(8, os.cpu_count() or 4)
+    if backup_store.is_manifest(path):
+        _verify_manifest(path, result, progress, cancel_event, workers)
+    elif backup_snapshot.is_snapshot(path):
+        manifest = backup_snapshot.load_snapshot_manifest(path)
+        archives = [backup_snapshot.archive_path(os.path.dirname(path), entry) for entry in manifest["mods"].values()]
+        _verify_zips(archives, manifest.get("file_count"), result, progress, cancel_event, workers)
+    else:
+        _verify_zips([path], None, result, progress, cancel_event, workers)
+
+    if cancel_event is not None and cancel_event.is_set():
+        result.cancelled = True
+    result.corrupt.sort()
+    return result
@@ -0,0 +1,226 @@
+import os
+import mmap
+import hashlib
+import concurrent.futures
+
+BLOCK_SIZE = 256 * 1024
+REFINE_CHUNK = 4096
+HEX_ROW_WIDTH = 16
+
+BINARY_DIFF_OPTIONS = ("binary", BLOCK_SIZE)
+
+
+class MappedFile:
+    """Read-only memory map of a file that also works for empty files"""
+
+    def __init__(self, path):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self._file = open(path, 'rb')
+        if self.size:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.data = b""
+
+    def read(self, offset, length):
+        if offset >= self.size:
+            return b""
+        return self.data[offset:min(offset + length, self.size)]
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+
+class BinaryComparison:
+    """Summary of a block-level comparison between two binary files"""
+
+    def __init__(self, left_size, right_size, regions):
+        self.left_size = left_size
+        self.right_size = right_size
+        self.regions = regions
+        self.left_digest = None
+        self.right_digest = None
+
+    def to_dict(self):
+        """Plain form for the comparison cache"""
+        return {
+            "left_size": self.left_size,
+            "right_size": self.right_size,
+            "regions": [list(region) for region in self.regions],
+            "left_digest": self.left_digest,
+            "right_digest": self.right_digest,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        comparison = cls(data["left_size"], data["right_size"], [tuple(region) for region in data["regions"]])
+        comparison.left_digest = data["left_digest"]
+        comparison.right_digest = data["right_digest"]
+        return comparison
+
+    @property
+    def identical(self):
+        return not self.regions and self.left_size == self.right_size
+
+    @property
+    def size_delta(self):
+        return self.right_size - self.left_size
+
+    @property
+    def first_diff_offset(self):
+        return self.regions[0][0] if self.regions else None
+
+    def summary_text(self):
+        if self.identical:
+            return f"Files are identical ({format_size(self.left_size)})"
+
+        parts = []
+        if self.size_delta:
+            sign = "+" if self.size_delta > 0 else "-"
+            parts.append(f"Size delta: {sign}{format_size(abs(self.size_delta))}")
+        else:
+            parts.append(f"Same size ({format_size(self.left_size)})")
+
+        differing = sum(end - start for start, end in self.regions)
+        parts.append(f"{len(self.regions)} differing region(s), {format_size(differing)}")
+        parts.append(f"First difference at 0x{self.first_diff_offset:08X}")
+        return " | ".join(parts)
+
+
+def format_size(num_bytes):
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024 or unit == "GB":
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+
+def _block_digest(mapped, index):
+    start = index * BLOCK_SIZE
+    end = min(start + BLOCK_SIZE, mapped.size)
+    if start >= end:
+        return None
+    return hashlib.blake2b(memoryview(mapped.data)[start:end], digest_size=16).digest()
+
+
+def _file_digest(block_digests, size):
+    """Whole-file content digest derived from the per-block digests"""
+    hasher = hashlib.blake2b(digest_size=20)
+    hasher.update(size.to_bytes(8, 'little'))
+    for digest in block_digests:
+        hasher.update(digest)
+    return hasher.hexdigest()
+
+
+def _first_difference(left, right, start, end):
+    """Return the first offset in [start, end) where the two files differ"""
+    pos = start
+    while pos < end:
+        chunk_end = min(pos + REFINE_CHUNK, end)
+        a = left.read(pos, chunk_end - pos)
+        b = right.read(pos, chunk_end - pos)
+        if a != b:
+            for i in range(min(len(a), len(b))):
+                if a[i] != b[i]:
+                    return pos + i
+            return pos + min(len(a), len(b))
+        pos = chunk_end
+    return end
+
+
+def _last_difference(left, right, start, end):
+    """Return one past the last offset in [start, end) where the two files differ"""
+    pos = end
+    while pos > start:
+        chunk_start = max(pos - REFINE_CHUNK, start)
+        a = left.read(chunk_start, pos - chunk_start)
+        b = right.read(chunk_start, pos - chunk_start)
+        if a != b:
+            if len(a) != len(b):
+                return pos
+            for i in range(len(a) - 1, -1, -1):
+                if a[i] != b[i]:
+                    return chunk_start + i + 1
+        pos = chunk_start
+    return start
+
+
+def compare_binary_files(left, right, progress_callback=None, max_workers=None):
+    """Hash fixed-size blocks of both mapped files in parallel and return the differing ranges"""
+    shared = min(left.size, right.size)
+    shared_blocks = (shared + BLOCK_SIZE - 1) // BLOCK_SIZE
+    left_blocks = (left.size + BLOCK_SIZE - 1) // BLOCK_SIZE
+    right_blocks = (right.size + BLOCK_SIZE - 1) // BLOCK_SIZE
+    block_count = max(left_blocks, right_blocks)
+    workers = max_workers or min(8, os.cpu_count() or 4)
+
+    def hash_pair(index):
+        return _block_digest(left, index), _block_digest(right, index)
+
+    left_digests = []
+    right_digests = []
+    differing_blocks = []
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        # hashlib releases the GIL on large buffers, so blocks hash in parallel
+        for index, (left_digest, right_digest) in enumerate(
+                executor.map(hash_pair, range(block_count), chunksize=16)):
+            if left_digest is not None:
+                left_digests.append(left_digest)
+            if right_digest is not None:
+                right_digests.append(right_digest)
+
+            if index < shared_blocks:
+                start = index * BLOCK_SIZE
+                if start + BLOCK_SIZE <= shared:
+                    differs = left_digest != right_digest
+                else:
+                    # The block holding the end of the shorter file is compared directly
+                    differs = left.read(start, shared - start) != right.read(start, shared - start)
+                if differs:
+                    differing_blocks.append(index)
+
+            if progress_callback and index % 256 == 0:
+                progress_callback(index, block_count)
+
+    regions = []
+    for index in differing_blocks:
+        start = index * BLOCK_SIZE
+        end = min(start + BLOCK_SIZE, shared)
+        if regions and regions[-1][1] == start:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+
+    # Narrow each region to the exact bytes that differ
+    narrowed = []
+    for start, end in regions:
+        first = _first_difference(left, right, start, end)
+        last = _last_difference(left, right, start, end)
+        if first < last:
+            narrowed.append((first, last))
+    regions = narrowed
+
+    if left.size != right.size:
+        tail_start = shared
+        if regions and regions[-1][1] == shared:
+            tail_start = regions.pop()[0]
+        regions.append((tail_start, max(left.size, right.size)))
+
+    if progress_callback:
+        progress_callback(block_count, block_count)
+
+    comparison = BinaryComparison(left.size, right.size, regions)
+    comparison.left_digest = _file_digest(left_digests, left.size)
+    comparison.right_digest = _file_digest(right_digests, right.size)
+    return comparison
+
+
+def is_binary_file(file_path):
+    try:
+        with open(file_path, 'rb') as f:
+            chunk = f.read(1024)
+            return b'\0' in chunk
+    except:
+        return True
@@ -0,0 +1,192 @@
+import tkinter as tk
+from tkinter import ttk
+import tkinter.font as tkfont
+
+from binary_compare import HEX_ROW_WIDTH
+
+
+class HexView(ttk.Frame):
+    """Virtualized hex dump that only renders the rows currently on screen"""
+
+    def __init__(self, parent, mapped_file, other_file=None, colors=None, on_scroll=None):
+        super().__init__(parent)
+        self.mapped_file = mapped_file
+        self.other_file = other_file
+        self.on_scroll = on_scroll
+        self.top_row = 0
+        self.total_rows = max(1, (mapped_file.size + HEX_ROW_WIDTH - 1) // HEX_ROW_WIDTH)
+        colors = colors or {}
+
+        self.text = tk.Text(self, wrap='none', padx=5, pady=5, font=('Consolas', 10),
+                            bg=colors.get("bg", "#ffffff"), fg=colors.get("fg", "#000000"),
+                            cursor="arrow", takefocus=0)
+        self.line_height = max(1, tkfont.Font(font=self.text.cget("font")).metrics("linespace"))
+        self.text.tag_configure("offset", foreground=colors.get("offset", "#888888"))
+        self.text.tag_configure("diff", background=colors.get("diff", "#f8d7da"))
+        self.text.tag_configure("missing", background=colors.get("missing", "#e8f5e8"))
+
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.yview)
+        self.text.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+
+        self.text.bind("<Configure>", lambda e: self.render())
+        self.text.bind("<MouseWheel>", self._on_mousewheel)
+        self.text.bind("<Button-4>", lambda e: self.scroll_rows(-3))
+        self.text.bind("<Button-5>", lambda e: self.scroll_rows(3))
+
+    def visible_rows(self):
+        return max(1, (self.text.winfo_height() - 10) // self.line_height)
+
+    def _on_mousewheel(self, event):
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.goto_row(int(float(args[1]) * self.total_rows))
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if args[2] == "pages":
+                amount *= self.visible_rows()
+            self.scroll_rows(amount)
+
+    def scroll_rows(self, amount):
+        self.goto_row(self.top_row + amount)
+
+    def goto_offset(self, offset):
+        self.goto_row(offset // HEX_ROW_WIDTH)
+
+    def goto_row(self, row, notify=True):
+        row = max(0, min(row, self.total_rows - self.visible_rows()))
+        if row == self.top_row:
+            return
+        self.top_row = row
+        self.render()
+        if notify and self.on_scroll:
+            self.on_scroll(row)
+
+    def render(self):
+        rows = self.visible_rows()
+        size = self.mapped_file.size
+        start = self.top_row * HEX_ROW_WIDTH
+        data = self.mapped_file.read(start, rows * HEX_ROW_WIDTH)
+        other = self.other_file.read(start, rows * HEX_ROW_WIDTH) if self.other_file else data
+
+        self.text.config(state='normal')
+        self.text.delete("1.0", "end")
+
+        lines = []
+        diff_ranges = []
+        for row in range(rows):
+            row_offset = start + row * HEX_ROW_WIDTH
+            if row_offset >= size and row:
+                break
+            chunk = data[row * HEX_ROW_WIDTH:(row + 1) * HEX_ROW_WIDTH]
+            other_chunk = other[row * HEX_ROW_WIDTH:(row + 1) * HEX_ROW_WIDTH]
+            hex_part = " ".join(f"{b:02X}" for b in chunk).ljust(HEX_ROW_WIDTH * 3 - 1)
+            ascii_part = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
+            lines.append(f"{row_offset:08X}  {hex_part}  {ascii_part}")
+
+            if chunk != other_chunk:
+                for i, b in enumerate(chunk):
+                    if i >= len(other_chunk):
+                        diff_ranges.append(("missing", row + 1, i))
+                    elif b != other_chunk[i]:
+                        diff_ranges.append(("diff", row + 1, i))
+
+        self.text.insert("1.0", "\n".join(lines))
+
+        for line in range(1, len(lines) + 1):
+            self.text.tag_add("offset", f"{line}.0", f"{line}.8")
+
+        for tag, line, i in diff_ranges:
+            hex_col = 10 + i * 3
+            ascii_col = 10 + HEX_ROW_WIDTH * 3 + 1 + i
+            self.text.tag_add(tag, f"{line}.{hex_col}", f"{line}.{hex_col + 2}")
+            self.text.tag_add(tag, f"{line}.{ascii_col}", f"{line}.{ascii_col + 1}")
+
+        self.text.config(state='disabled')
+
+        first = self.top_row / self.total_rows
+        last = min(1.0, (self.top_row + rows) / self.total_rows)
+        self.scrollbar.set(first, last)
+
+
+def watch_text_changes(text_widget):
+    """Generate <<TextChanged>> on a Text widget whenever its content is edited"""
+    widget_cmd = str(text_widget)
+    orig_cmd = widget_cmd + "_orig"
+    text_widget.tk.call("rename", widget_cmd, orig_cmd)
+
+    def proxy(command, *args):
+        result = text_widget.tk.call((orig_cmd, command) + args)
+        if command in ("insert", "delete", "replace"):
+            text_widget.event_generate("<<TextChanged>>", when="tail")
+        return result
+
+    def release(event):
+        if event.widget is text_widget:
+            try:
+                text_widget.tk.deletecommand(widget_cmd)
+            except tk.TclError:
+                pass
+
+    text_widget.tk.createcommand(widget_cmd, proxy)
+    text_widget.bind("<Destroy>", release, add="+")
+
+
+class LineNumberGutter(tk.Canvas):
+    """Line numbers and diff markers drawn only for the lines visible in a Text widget"""
+
+    MARKER_TAGS = ("remove", "add", "change")
+
+    def __init__(self, parent, text_widget, colors=None):
+        colors = colors or {}
+        super().__init__(parent, width=40, highlightthickness=0, bd=0,
+                         bg=colors.get("bg", "#f0f0f0"), takefocus=0)
+        self.text_widget = text_widget
+        self.fg = colors.get("fg", "#888888")
+        self.marker_colors = {
+            "change": colors.get("change", "#4a9eff"),
+            "add": colors.get("add", "#2ed573"),
+            "remove": colors.get("remove", "#ff4757"),
+        }
+        self.font = tkfont.Font(font=text_widget.cget("font"))
+        self._digits = 0
+        self._redraw_job = None
+
+        text_widget.bind("<<TextChanged>>", lambda e: self.schedule_redraw(), add="+")
+        text_widget.bind("<Configure>", lambda e: self.schedule_redraw(), add="+")
+
+    def schedule_redraw(self):
+        if self._redraw_job is None:
+            self._redraw_job = self.after_idle(self.redraw)
+
+    def redraw(self):
+        self._redraw_job = None
+        self.delete("all")
+
+        text = self.text_widget
+        last_line = int(text.index("end-1c").split(".")[0])
+
+        digits = max(3, len(str(last_line)))
+        if digits != self._digits:
+            self._digits = digits
+            self.config(width=self.font.measure("9" * digits) + 16)
+        width = int(self.cget("width"))
+
+        line = int(text.index("@0,0").split(".")[0])
+        while line <= last_line:
+            info = text.dlineinfo(f"{line}.0")
+            if info is None:
+                break
+            y, height = info[1], info[3]
+
+            tags = text.tag_names(f"{line}.0")
+            for tag in self.MARKER_TAGS:
+                if tag in tags:
+                    self.create_rectangle(0, y, 4, y + height, fill=self.marker_colors[tag], width=0)
+                    break
+
+            self.create_text(width - 6, y, anchor="ne", text=str(line), fill=self.fg, font=self.font)
+            line += 1
@@ -0,0 +1,152 @@
+import os
+import json
+import zlib
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def content_digest(data):
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+class DiffCache:
+    """LRU cache of comparison results keyed by content hashes and diff options
+
+    Entries live in memory up to max_bytes. When disk_dir is given, entries are
+    also written there as zlib-compressed JSON, so values must be plain JSON
+    types, and evicted oldest-first once the directory grows past
+    max_disk_bytes. A (path, size, mtime) -> digest memo lets callers find the
+    key for an unchanged file without reading it again.
+    """
+
+    DIGEST_MEMO_FILE = "digests.json"
+    ENTRY_SUFFIX = ".json.z"
+    MAX_DIGEST_MEMO = 10000
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, disk_dir=None, max_disk_bytes=1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.digest_memo = {}
+        self.lock = threading.Lock()
+
+        if disk_dir:
+            try:
+                os.makedirs(disk_dir, mode=0o700, exist_ok=True)
+                with open(os.path.join(disk_dir, self.DIGEST_MEMO_FILE), 'r') as f:
+                    self.digest_memo = json.load(f)
+            except (OSError, ValueError):
+                self.digest_memo = {}
+
+    @staticmethod
+    def make_key(left_digest, right_digest, options):
+        return (left_digest, right_digest, tuple(options))
+
+    def _stat_key(self, path):
+        st = os.stat(path)
+        return f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}"
+
+    def known_digest(self, path):
+        """Digest recorded for this exact file state, or None if it changed or was never seen"""
+        try:
+            stat_key = self._stat_key(path)
+        except OSError:
+            return None
+        with self.lock:
+            return self.digest_memo.get(stat_key)
+
+    def remember_digest(self, path, digest):
+        try:
+            stat_key = self._stat_key(path)
+        except OSError:
+            return
+        with self.lock:
+            self.digest_memo.pop(stat_key, None)
+            self.digest_memo[stat_key] = digest
+            while len(self.digest_memo) > self.MAX_DIGEST_MEMO:
+                del self.digest_memo[next(iter(self.digest_memo))]
+
+    def _disk_path(self, key):
+        name = hashlib.blake2b(repr(key).encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.disk_dir, name + self.ENTRY_SUFFIX)
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key][0]
+
+        if not self.disk_dir:
+            return None
+
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                value, size = json.loads(zlib.decompress(f.read()))
+        except (OSError, zlib.error, ValueError, TypeError):
+            return None
+
+        self._store_memory(key, value, size)
+        return value
+
+    def put(self, key, value, size):
+        self._store_memory(key, value, size)
+
+        if not self.disk_dir:
+            return
+
+        try:
+            payload = zlib.compress(json.dumps([value, size], separators=(',', ':')).encode('utf-8'), 1)
+            self._replace(self._disk_path(key), payload)
+            with self.lock:
+                memo = dict(self.digest_memo)
+            self._replace(os.path.join(self.disk_dir, self.DIGEST_MEMO_FILE), json.dumps(memo).encode('utf-8'))
+            self._prune_disk()
+        except OSError as e:
+            print(f"Failed to write diff cache entry: {e}")
+
+    @staticmethod
+    def _replace(path, payload):
+        """Write through a temp file so other windows and processes never read a partial file"""
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _store_memory(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+
+    def _prune_disk(self):
+        files = []
+        total = 0
+        with os.scandir(self.disk_dir) as it:
+            for entry in it:
+                if entry.name.endswith(self.ENTRY_SUFFIX):
+                    st = entry.stat()
+                    files.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,799 @@
+import os
+import io
+import csv
+import gzip
+import html
+import json
+import sqlite3
+from collections import defaultdict
+from datetime import datetime
+
+# Chunks are written through a buffer this large instead of being joined in memory
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Progress callbacks fire every this many conflicts
+PROGRESS_INTERVAL = 500
+
+
+class ReportData:
+    """A scan result frozen for exporters that run off the Tk thread
+
+    Only the dict of references and the sorted path lists are copied, so the
+    UI can keep changing its own state while an export runs.
+    """
+
+    def __init__(self, conflicts, excluded_files, lml_dir, severity_of):
+        self.conflicts = dict(conflicts)
+        self.excluded_files = frozenset(excluded_files)
+        self.lml_dir = lml_dir
+        self.severity_of = severity_of
+        self.generated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.active_paths = sorted(path for path in self.conflicts if path not in self.excluded_files)
+        self.excluded_paths = sorted(path for path in self.excluded_files if path in self.conflicts)
+
+    @property
+    def total(self):
+        return len(self.active_paths) + len(self.excluded_paths)
+
+    def rows(self, excluded, progress):
+        """Yield (path, mods, severity) for the active or excluded conflicts in path order"""
+        for path in self.excluded_paths if excluded else self.active_paths:
+            progress.step()
+            mods = self.conflicts[path]
+            yield path, mods, self.severity_of(path, mods)
+
+
+class ExportProgress:
+    """Counts exported conflicts, reports them and raises InterruptedError on cancel"""
+
+    def __init__(self, total, progress_callback=None, cancel_event=None):
+        self.total = total
+        self.done = 0
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+
+    def step(self):
+        self.done += 1
+        if self.done % PROGRESS_INTERVAL == 0 or self.done == self.total:
+            if self.cancel_event is not None and self.cancel_event.is_set():
+                raise InterruptedError("Export cancelled")
+            if self.progress_callback:
+                self.progress_callback(self.done, self.total)
+
+
+def _open_text(path, compress):
+    if compress:
+        raw = io.BufferedWriter(gzip.GzipFile(path, 'wb', compresslevel=6), WRITE_BUFFER_SIZE)
+        return io.TextIOWrapper(raw, encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+
+
+def write_report(file_path, chunks, compress=False):
+    """Write an iterable of text chunks to file_path; the file only appears once it is complete
+
+    With compress set the chunks are gzipped as they are written.
+    """
+    temp_path = file_path + ".tmp"
+    try:
+        with _open_text(temp_path, compress) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _text_entry(path, mods, severity):
+    lines = [f"File: {path}\n", f"Severity: {severity}\n", f"Conflicting Mods ({len(mods)}):\n"]
+    lines.extend(f"  - {mod}\n" for mod in sorted(mods))
+    lines.append("\n")
+    return "".join(lines)
+
+
+def iter_text_report(data, progress_callback=None, cancel_event=None):
+    """Yield the plain-text report used by Export TXT and Copy to Clipboard"""
+    progress = ExportProgress(data.total, progress_callback, cancel_event)
+
+    yield "RDR2 LML Mod Conflict Report\n"
+    yield "=" * 40 + "\n\n"
+    yield f"Generated: {data.generated}\n"
+    yield f"LML Directory: {data.lml_dir}\n\n"
+    yield f"Total Conflicts: {len(data.active_paths)}\n"
+    yield f"Excluded Files: {len(data.excluded_files)}\n\n"
+
+    yield "ACTIVE CONFLICTS:\n"
+    yield "-" * 40 + "\n\n"
+    for row in data.rows(False, progress):
+        yield _text_entry(*row)
+
+    if data.excluded_files:
+        yield "EXCLUDED FILES:\n"
+        yield "-" * 40 + "\n\n"
+        for row in data.rows(True, progress):
+            yield _text_entry(*row)
+
+
+class StreamedObject:
+    """A JSON object whose (key, value) pairs come from an iterable and are encoded as they arrive"""
+
+    def __init__(self, items):
+        self.items = items
+
+
+def iter_json(value, indent=4, level=0):
+    """Encode value like json.dump(value, indent=indent), yielding one chunk per member
+
+    dicts and StreamedObjects are walked member by member so a StreamedObject
+    never has to exist in memory as a whole; other values are encoded with
+    json.dumps and re-indented to their depth.
+    """
+    if isinstance(value, (dict, StreamedObject)):
+        items = value.items if isinstance(value, StreamedObject) else value.items()
+        inner = "\n" + " " * (indent * (level + 1))
+        first = True
+        for key, item in items:
+            yield ("{" if first else ",") + inner + json.dumps(str(key)) + ": "
+            yield from iter_json(item, indent, level + 1)
+            first = False
+        yield "{}" if first else "\n" + " " * (indent * level) + "}"
+    else:
+        encoded = json.dumps(value, indent=indent)
+        yield encoded.replace("\n", "\n" + " " * (indent * level)) if level else encoded
+
+
+def _json_entries(data, excluded, progress):
+    for path, mods, severity in data.rows(excluded, progress):
+        yield path, {"mods": list(mods), "count": len(mods), "severity": severity}
+
+
+def iter_json_report(data, progress_callback=None, cancel_event=None):
+    """Yield the JSON report one conflict at a time"""
+    progress = ExportProgress(data.total, progress_callback, cancel_event)
+    report = {
+        "metadata": {
+            "generated": data.generated,
+            "lml_directory": data.lml_dir,
+            "total_conflicts": len(data.active_paths),
+            "excluded_files": len(data.excluded_files)
+        },
+        "active_conflicts": StreamedObject(_json_entries(data, False, progress)),
+        "excluded_files": StreamedObject(_json_entries(data, True, progress)),
+    }
+    return iter_json(report)
+
+
+SEVERITIES = ("High", "Medium", "Low")
+
+HTML_STYLE = """        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            line-height: 1.6;
+            margin: 0;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+            background: white;
+            padding: 30px;
+            border-radius: 10px;
+            box-shadow: 0 0 20px rgba(0,0,0,0.1);
+        }
+        h1 {
+            color: #333;
+            border-bottom: 3px solid #4a9eff;
+            padding-bottom: 10px;
+            text-align: center;
+        }
+        .summary {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 20px;
+            margin: 30px 0;
+        }
+        .summary-card {
+            background: #f8f9fa;
+            padding: 20px;
+            border-radius: 8px;
+            text-align: center;
+            border-left: 4px solid #4a9eff;
+        }
+        .summary-card h3 {
+            margin: 0 0 10px 0;
+            color: #333;
+        }
+        .summary-card .number {
+            font-size: 2em;
+            font-weight: bold;
+            color: #4a9eff;
+        }
+        .special-types {
+            display: flex;
+            justify-content: space-between;
+            margin: 20px 0;
+            flex-wrap: wrap;
+        }
+        .special-type {
+            background: #e9f5ff;
+            padding: 15px;
+            border-radius: 8px;
+            flex: 1;
+            margin: 0 10px 10px 0;
+            min-width: 200px;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.05);
+        }
+        .special-type h4 {
+            margin: 0 0 10px 0;
+            color: #333;
+        }
+        .special-type .count {
+            font-size: 1.5em;
+            font-weight: bold;
+            color: #4a9eff;
+        }
+        .warning-box {
+            background-color: #fff3cd;
+            border-left: 4px solid #ffc107;
+            padding: 15px;
+            margin: 20px 0;
+            border-radius: 4px;
+        }
+        .warning-box h4 {
+            color: #856404;
+            margin-top: 0;
+        }
+        .tab-buttons {
+            display: flex;
+            margin-bottom: 20px;
+            border-bottom: 1px solid #ddd;
+        }
+        .tab-button {
+            padding: 10px 20px;
+            background: #f8f9fa;
+            border: 1px solid #ddd;
+            border-bottom: none;
+            border-radius: 5px 5px 0 0;
+            margin-right: 5px;
+            cursor: pointer;
+        }
+        .tab-button.active {
+            background: #4a9eff;
+            color: white;
+            border-color: #4a9eff;
+        }
+        .toolbar {
+            display: flex;
+            gap: 10px;
+            align-items: center;
+            margin-bottom: 15px;
+        }
+        .toolbar input {
+            flex: 1;
+            padding: 8px;
+            border: 1px solid #ddd;
+            border-radius: 4px;
+        }
+        .toolbar select {
+            padding: 8px;
+            border: 1px solid #ddd;
+            border-radius: 4px;
+        }
+        .match-count {
+            color: #666;
+            margin-bottom: 10px;
+        }
+        .file-type-section {
+            margin: 0 0 10px 0;
+        }
+        .file-type-header {
+            background: #4a9eff;
+            color: white;
+            padding: 10px 15px;
+            border-radius: 8px;
+            cursor: pointer;
+            user-select: none;
+        }
+        .file-type-section.open .file-type-header {
+            border-radius: 8px 8px 0 0;
+        }
+        .toggle-icon {
+            float: right;
+        }
+        .viewport {
+            overflow-y: auto;
+            border: 1px solid #ddd;
+            border-top: none;
+            border-radius: 0 0 8px 8px;
+        }
+        .rows {
+            position: relative;
+        }
+        .conflict-row {
+            position: absolute;
+            left: 0;
+            right: 0;
+            height: 30px;
+            display: flex;
+            align-items: center;
+            gap: 10px;
+            padding: 0 10px;
+            border-bottom: 1px solid #eee;
+            box-sizing: border-box;
+            white-space: nowrap;
+        }
+        .file-path {
+            font-weight: bold;
+            color: #333;
+            flex: 0 1 50%;
+            overflow: hidden;
+            text-overflow: ellipsis;
+        }
+        .mod-names {
+            color: #666;
+            flex: 1;
+            overflow: hidden;
+            text-overflow: ellipsis;
+        }
+        .severity {
+            display: inline-block;
+            padding: 0 8px;
+            border-radius: 4px;
+            font-size: 0.8em;
+            font-weight: bold;
+            color: white;
+            flex: none;
+        }
+        .severity-high {
+            background: #ff4757;
+        }
+        .severity-medium {
+            background: #ffa502;
+        }
+        .severity-low {
+            background: #2ed573;
+        }
+"""
+
+# Rows are [path, severity index, [mod indexes]] and are only turned into DOM
+# nodes while they are scrolled into view
+HTML_SCRIPT = """        const data = JSON.parse(document.getElementById('report-data').textContent);
+        const SEVERITIES = ['High', 'Medium', 'Low'];
+        const ROW_HEIGHT = 30;
+        const VISIBLE_ROWS = 20;
+        const OVERSCAN = 10;
+        const modsLower = data.mods.map(mod => mod.toLowerCase());
+        const state = {tab: 'active', query: '', sort: 'path', open: new Set()};
+
+        function extensionOf(path) {
+            const slash = Math.max(path.lastIndexOf('/'), path.lastIndexOf('\\\\'));
+            const dot = path.lastIndexOf('.');
+            return dot > slash + 1 ? path.slice(dot) : 'No Extension';
+        }
+
+        const comparators = {
+            path: (a, b) => a[0] < b[0] ? -1 : a[0] > b[0] ? 1 : 0,
+            severity: (a, b) => a[1] - b[1] || comparators.path(a, b),
+            mods: (a, b) => b[2].length - a[2].length || comparators.path(a, b),
+        };
+
+        function visibleRows() {
+            const query = state.query;
+            let rows = data[state.tab];
+            if (query) {
+                rows = rows.filter(row => row[0].toLowerCase().includes(query)
+                    || row[2].some(index => modsLower[index].includes(query)));
+            }
+            return rows.slice().sort(comparators[state.sort]);
+        }
+
+        function createRow(row, index) {
+            const element = document.createElement('div');
+            element.className = 'conflict-row';
+            element.style.top = (index * ROW_HEIGHT) + 'px';
+
+            const path = document.createElement('span');
+            path.className = 'file-path';
+            path.textContent = path.title = row[0];
+
+            const severity = document.createElement('span');
+            const name = SEVERITIES[row[1]];
+            severity.className = 'severity severity-' + name.toLowerCase();
+            severity.textContent = name;
+
+            const mods = document.createElement('span');
+            mods.className = 'mod-names';
+            mods.textContent = mods.title = row[2].length + ' mods: ' + row[2].map(i => data.mods[i]).join(', ');
+
+            element.append(path, severity, mods);
+            return element;
+        }
+
+        function createVirtualList(rows) {
+            const viewport = document.createElement('div');
+            viewport.className = 'viewport';
+            viewport.style.height = (Math.min(rows.length, VISIBLE_ROWS) * ROW_HEIGHT) + 'px';
+            const inner = document.createElement('div');
+            inner.className = 'rows';
+            inner.style.height = (rows.length * ROW_HEIGHT) + 'px';
+            viewport.appendChild(inner);
+
+            let drawn = -1;
+            let pending = false;
+            function draw() {
+                pending = false;
+                const first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+                if (first === drawn) {
+                    return;
+                }
+                drawn = first;
+                const last = Math.min(rows.length, first + VISIBLE_ROWS + 2 * OVERSCAN);
+                const fragment = document.createDocumentFragment();
+                for (let i = first; i < last; i++) {
+                    fragment.appendChild(createRow(rows[i], i));
+                }
+                inner.replaceChildren(fragment);
+            }
+            viewport.addEventListener('scroll', () => {
+                if (!pending) {
+                    pending = true;
+                    requestAnimationFrame(draw);
+                }
+            });
+            draw();
+            return viewport;
+        }
+
+        function render() {
+            const container = document.getElementById('groups');
+            const rows = visibleRows();
+            const groups = new Map();
+            for (const row of rows) {
+                const ext = extensionOf(row[0]);
+                if (!groups.has(ext)) {
+                    groups.set(ext, []);
+                }
+                groups.get(ext).push(row);
+            }
+
+            const total = data[state.tab].length;
+            document.getElementById('match-count').textContent = state.query
+                ? 'Showing ' + rows.length + ' of ' + total + ' files'
+                : total + ' files';
+
+            const fragment = document.createDocumentFragment();
+            if (!total) {
+                const empty = document.createElement('p');
+                empty.textContent = state.tab === 'active' ? 'No active conflicts.' : 'No files have been excluded.';
+                fragment.appendChild(empty);
+            }
+            for (const ext of [...groups.keys()].sort()) {
+                const groupRows = groups.get(ext);
+                const key = state.tab + ':' + ext;
+                const isOpen = state.open.has(key) || groups.size === 1;
+                const section = document.createElement('div');
+                section.className = 'file-type-section' + (isOpen ? ' open' : '');
+
+                const header = document.createElement('div');
+                header.className = 'file-type-header';
+                header.textContent = ext + ' Files (' + groupRows.length + ')';
+                const icon = document.createElement('span');
+                icon.className = 'toggle-icon';
+                icon.textContent = isOpen ? '▲' : '▼';
+                header.appendChild(icon);
+                header.addEventListener('click', () => {
+                    if (state.open.has(key)) {
+                        state.open.delete(key);
+                    } else {
+                        state.open.add(key);
+                    }
+                    render();
+                });
+                section.appendChild(header);
+
+                if (isOpen) {
+                    section.appendChild(createVirtualList(groupRows));
+                }
+                fragment.appendChild(section);
+            }
+            container.replaceChildren(fragment);
+        }
+
+        function showTab(tab, button) {
+            state.tab = tab;
+            for (const other of document.getElementsByClassName('tab-button')) {
+                other.classList.remove('active');
+            }
+            button.classList.add('active');
+            render();
+        }
+
+        let searchTimer = null;
+        document.getElementById('search').addEventListener('input', event => {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => {
+                state.query = event.target.value.trim().toLowerCase();
+                render();
+            }, 150);
+        });
+        document.getElementById('sort').addEventListener('change', event => {
+            state.sort = event.target.value;
+            render();
+        });
+
+        render();
+"""
+
+
+def _json_island(value):
+    """Compact JSON that is safe inside a <script> element"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).replace("</", "<\\/")
+
+
+def _html_rows(data, excluded, mod_index, progress):
+    first = True
+    for path, mods, severity in data.rows(excluded, progress):
+        yield ("" if first else ",") + _json_island([path, SEVERITIES.index(severity),
+                                                    [mod_index[mod] for mod in mods]])
+        first = False
+
+
+def iter_html_report(data, progress_callback=None, cancel_event=None):
+    """Yield a self-contained HTML report that embeds the conflicts as one JSON island
+
+    Each conflict is a short JSON row with mods stored as indexes into a shared
+    name table. The page builds type groups and rows on demand in a virtualized
+    list with search and sort, so the DOM stays small however many conflicts
+    there are.
+    """
+    progress = ExportProgress(data.total, progress_callback, cancel_event)
+
+    severity_counts = {severity: 0 for severity in SEVERITIES}
+    ext_counts = defaultdict(int)
+    for path in data.active_paths:
+        severity_counts[data.severity_of(path, data.conflicts[path])] += 1
+        ext_counts[os.path.splitext(path)[1]] += 1
+
+    mod_names = sorted({mod for path in data.active_paths + data.excluded_paths for mod in data.conflicts[path]})
+    mod_index = {mod: index for index, mod in enumerate(mod_names)}
+
+    gxt2_warning = """
+        <div class="warning-box">
+            <h4>Warning about GXT2 Files</h4>
+            <p>GXT2 files typically do not conflict and may result in false positives. Modify only if you understand what you're doing.</p>
+        </div>
+""" if ext_counts['.gxt2'] else ""
+
+    yield f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>RDR2 LML Mod Conflict Report</title>
+    <style>
+{HTML_STYLE}    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>RDR2 LML Mod Conflict Report</h1>
+
+        <div class="summary">
+            <div class="summary-card">
+                <h3>Active Conflicts</h3>
+                <div class="number">{len(data.active_paths)}</div>
+            </div>
+            <div class="summary-card">
+                <h3>Excluded Files</h3>
+                <div class="number">{len(data.excluded_files)}</div>
+            </div>
+            <div class="summary-card">
+                <h3>High Severity</h3>
+                <div class="number">{severity_counts['High']}</div>
+            </div>
+            <div class="summary-card">
+                <h3>Medium Severity</h3>
+                <div class="number">{severity_counts['Medium']}</div>
+            </div>
+        </div>
+
+        <div class="special-types">
+            <div class="special-type">
+                <h4>Texture Conflicts (.ytd)</h4>
+                <div class="count">{ext_counts['.ytd']}</div>
+            </div>
+            <div class="special-type">
+                <h4>Drawable Conflicts (.ydd)</h4>
+                <div class="count">{ext_counts['.ydd']}</div>
+            </div>
+            <div class="special-type">
+                <h4>Metadata Conflicts (.meta)</h4>
+                <div class="count">{ext_counts['.meta']}</div>
+            </div>
+            <div class="special-type">
+                <h4>GXT2 Conflicts</h4>
+                <div class="count">{ext_counts['.gxt2']}</div>
+            </div>
+        </div>
+        {gxt2_warning}
+        <p><strong>Generated:</strong> {html.escape(data.generated)}</p>
+        <p><strong>LML Directory:</strong> {html.escape(data.lml_dir)}</p>
+
+        <div class="tab-buttons">
+            <div class="tab-button active" onclick="showTab('active', this)">Active Conflicts</div>
+            <div class="tab-button" onclick="showTab('excluded', this)">Excluded Files</div>
+        </div>
+
+        <div class="toolbar">
+            <input id="search" type="search" placeholder="Filter by file path or mod name...">
+            <select id="sort">
+                <option value="path">Sort by path</option>
+                <option value="severity">Sort by severity</option>
+                <option value="mods">Sort by mod count</option>
+            </select>
+        </div>
+        <div id="match-count" class="match-count"></div>
+        <div id="groups"></div>
+    </div>
+
+    <script id="report-data" type="application/json">{{"mods":{_json_island(mod_names)},"active":["""
+    yield from _html_rows(data, False, mod_index, progress)
+    yield '],"excluded":['
+    yield from _html_rows(data, True, mod_index, progress)
+    yield f"""]}}</script>
+    <script>
+{HTML_SCRIPT}    </script>
+</body>
+</html>
+"""
+
+
+def _extension(path):
+    return os.path.splitext(path)[1] or "No Extension"
+
+
+def _all_rows(data, progress):
+    """Yield (path, mods, severity, excluded) for active then excluded conflicts"""
+    for path, mods, severity in data.rows(False, progress):
+        yield path, mods, severity, False
+    for path, mods, severity in data.rows(True, progress):
+        yield path, mods, severity, True
+
+
+CSV_COLUMNS = ("path", "extension", "severity", "mod_count", "mods", "excluded")
+
+# Mod names inside the single mods column are joined with this separator
+CSV_MOD_SEPARATOR = "|"
+
+
+def iter_csv_report(data, progress_callback=None, cancel_event=None):
+    """Yield one CSV line per conflict, with the mods joined into one column"""
+    progress = ExportProgress(data.total, progress_callback, cancel_event)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    for path, mods, severity, excluded in _all_rows(data, progress):
+        writer.writerow((path, _extension(path), severity, len(mods), CSV_MOD_SEPARATOR.join(mods),
+                         int(excluded)))
+        if buffer.tell() >= WRITE_BUFFER_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_ndjson_report(data, progress_callback=None, cancel_event=None):
+    """Yield one JSON object per line, one line per conflict"""
+    progress = ExportProgress(data.total, progress_callback, cancel_event)
+    for path, mods, severity, excluded in _all_rows(data, progress):
+        yield json.dumps({"path": path, "extension": _extension(path), "severity": severity,
+                          "mod_count": len(mods), "mods": list(mods), "excluded": excluded},
+                         ensure_ascii=False, separators=(',', ':')) + "\n"
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE mods (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE conflicts (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    extension TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    mod_count INTEGER NOT NULL,
+    excluded INTEGER NOT NULL
+);
+CREATE TABLE conflict_mods (
+    conflict_id INTEGER NOT NULL REFERENCES conflicts(id),
+    mod_id INTEGER NOT NULL REFERENCES mods(id),
+    PRIMARY KEY (conflict_id, mod_id)
+) WITHOUT ROWID;
+"""
+
+# Created after the bulk insert, which is much faster than maintaining them row by row
+SQLITE_INDEXES = """
+CREATE INDEX conflicts_severity ON conflicts (severity);
+CREATE INDEX conflicts_extension ON conflicts (extension);
+CREATE INDEX conflict_mods_mod ON conflict_mods (mod_id, conflict_id);
+"""
+
+SQLITE_BATCH_SIZE = 5000
+
+
+def write_sqlite_report(file_path, data, progress_callback=None, cancel_event=None):
+    """Write the conflicts to a SQLite database with conflicts, mods and conflict_mods tables"""
+    progress = ExportProgress(data.total, progress_callback, cancel_event)
+    temp_path = file_path + ".tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    connection = sqlite3.connect(temp_path)
+    try:
+        # The file is renamed into place only when complete, so durability can wait until then
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.executescript(SQLITE_SCHEMA)
+        connection.executemany("INSERT INTO metadata VALUES (?, ?)", [
+            ("generated", data.generated),
+            ("lml_directory", data.lml_dir),
+            ("total_conflicts", str(len(data.active_paths))),
+            ("excluded_files", str(len(data.excluded_files))),
+        ])
+
+        mod_ids = {}
+        conflict_rows = []
+        member_rows = []
+
+        def flush():
+            connection.executemany("INSERT INTO conflicts VALUES (?, ?, ?, ?, ?, ?)", conflict_rows)
+            connection.executemany("INSERT INTO conflict_mods VALUES (?, ?)", member_rows)
+            conflict_rows.clear()
+            member_rows.clear()
+
+        for conflict_id, (path, mods, severity, excluded) in enumerate(_all_rows(data, progress), start=1):
+            conflict_rows.append((conflict_id, path, _extension(path), severity, len(mods), int(excluded)))
+            for mod in mods:
+                mod_id = mod_ids.get(mod)
+                if mod_id is None:
+                    mod_id = mod_ids[mod] = len(mod_ids) + 1
+                    connection.execute("INSERT INTO mods VALUES (?, ?)", (mod_id, mod))
+                member_rows.append((conflict_id, mod_id))
+            if len(conflict_rows) >= SQLITE_BATCH_SIZE:
+                flush()
+        flush()
+
+        connection.executescript(SQLITE_INDEXES)
+        connection.commit()
+    except BaseException:
+        connection.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    connection.close()
+    os.replace(temp_path, file_path)
+
+
+# (label, extension) pairs for the save dialog; ".gz" can be added to the text formats
+DATA_EXPORT_TYPES = [
+    ("CSV Files", "*.csv"),
+    ("NDJSON Files", "*.ndjson"),
+    ("SQLite Databases", "*.sqlite"),
+    ("Gzipped CSV", "*.csv.gz"),
+    ("Gzipped NDJSON", "*.ndjson.gz"),
+]
+
+
+def export_data_file(file_path, data, progress_callback=None, cancel_event=None):
+    """Write a CSV, NDJSON or SQLite export chosen by the file extension"""
+    name = file_path.lower()
+    compress = name.endswith(".gz")
+    if compress:
+        name = name[:-3]
+
+    if name.endswith((".sqlite", ".db", ".sqlite3")) and not compress:
+        write_sqlite_report(file_path, data, progress_callback, cancel_event)
+    elif name.endswith((".ndjson", ".jsonl")):
+        write_report(file_path, iter_ndjson_report(data, progress_callback, cancel_event), compress)
+    elif name.endswith(".csv"):
+        write_report(file_path, iter_csv_report(data, progress_callback, cancel_event), compress)
+    else:
+        raise ValueError("Choose a .csv, .ndjson or .sqlite file name (add .gz to compress CSV or NDJSON)")
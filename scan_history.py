@@ -0,0 +1,186 @@
+import os
+import re
+import json
+import gzip
+import hashlib
+from datetime import datetime
+
+HISTORY_DIR_NAME = "LML_ScanHistory"
+HISTORY_VERSION = 1
+INDEX_NAME = "history.json"
+HEAD_NAME = "head.json.gz"
+
+
+def history_dir(lml_dir):
+    """History folder for one LML folder, kept next to it like LML_Backups"""
+    lml_dir = os.path.normpath(os.path.abspath(lml_dir))
+    safe = re.sub(r'[^A-Za-z0-9._-]+', '_', os.path.basename(lml_dir)).strip('._') or "lml"
+    digest = hashlib.blake2b(os.path.normcase(lml_dir).encode('utf-8'), digest_size=4).hexdigest()
+    return os.path.join(os.path.dirname(lml_dir), HISTORY_DIR_NAME, f"{safe}-{digest}")
+
+
+def memberships(files_map):
+    """Turn {path: [mods]} into {mod: set(paths)}, the form deltas are taken over"""
+    by_mod = {}
+    for path, mods in files_map.items():
+        for mod in mods:
+            by_mod.setdefault(mod, set()).add(path)
+    return by_mod
+
+
+def conflicts_of(by_mod):
+    """Return {path: frozenset(mods)} for paths provided by more than one mod"""
+    owners = {}
+    for mod, paths in by_mod.items():
+        for path in paths:
+            owners.setdefault(path, []).append(mod)
+    return {path: frozenset(mods) for path, mods in owners.items() if len(mods) > 1}
+
+
+def compute_delta(old, new):
+    """Return {"added": {mod: [paths]}, "removed": {mod: [paths]}} turning old into new"""
+    added = {}
+    removed = {}
+    for mod in old.keys() | new.keys():
+        old_paths = old.get(mod, set())
+        new_paths = new.get(mod, set())
+        if old_paths == new_paths:
+            continue
+        if new_paths - old_paths:
+            added[mod] = sorted(new_paths - old_paths)
+        if old_paths - new_paths:
+            removed[mod] = sorted(old_paths - new_paths)
+    return {"added": added, "removed": removed}
+
+
+def apply_delta(by_mod, delta, reverse=False):
+    """Apply a delta in place; reverse undoes it"""
+    added, removed = delta["added"], delta["removed"]
+    if reverse:
+        added, removed = removed, added
+    for mod, paths in removed.items():
+        remaining = by_mod.get(mod, set())
+        remaining.difference_update(paths)
+        if not remaining:
+            by_mod.pop(mod, None)
+    for mod, paths in added.items():
+        by_mod.setdefault(mod, set()).update(paths)
+    return by_mod
+
+
+def delta_size(delta):
+    return (sum(len(paths) for paths in delta["added"].values()),
+            sum(len(paths) for paths in delta["removed"].values()))
+
+
+def _write_json(path, value, compress=False):
+    temp_path = path + ".tmp"
+    opener = gzip.open if compress else open
+    with opener(temp_path, 'wt', encoding='utf-8') as f:
+        json.dump(value, f, separators=(',', ':'))
+    os.replace(temp_path, path)
+
+
+def _read_json(path, compress=False):
+    opener = gzip.open if compress else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class ScanHistory:
+    """Scan results of one LML folder, stored as a head snapshot plus one delta per scan
+
+    Only the newest scan is stored in full. Every scan also stores the delta
+    from the scan before it, so older scans are rebuilt by undoing deltas from
+    the head backwards and the history grows with how much changed, not with
+    the size of each scan.
+    """
+
+    def __init__(self, lml_dir):
+        self.lml_dir = lml_dir
+        self.root = history_dir(lml_dir)
+
+    def _delta_path(self, scan_id):
+        return os.path.join(self.root, f"scan_{scan_id:06d}.json.gz")
+
+    def load_index(self):
+        """Return the list of recorded scans, oldest first"""
+        try:
+            data = _read_json(os.path.join(self.root, INDEX_NAME))
+        except (OSError, ValueError):
+            return []
+        if data.get("version") != HISTORY_VERSION:
+            return []
+        return data.get("scans", [])
+
+    def _load_head(self):
+        try:
+            data = _read_json(os.path.join(self.root, HEAD_NAME), compress=True)
+        except (OSError, ValueError):
+            return None, {}
+        return data.get("id"), {mod: set(paths) for mod, paths in data.get("mods", {}).items()}
+
+    def record_scan(self, files_map):
+        """Store a scan if it differs from the last one; returns its index entry or None"""
+        os.makedirs(self.root, exist_ok=True)
+        scans = self.load_index()
+        head_id, head = self._load_head()
+        if scans and head_id != scans[-1]["id"]:
+            # The head does not match the index (e.g. an interrupted write), so start over
+            scans, head = [], {}
+
+        current = memberships(files_map)
+        delta = compute_delta(head, current)
+        added, removed = delta_size(delta)
+        if scans and not added and not removed:
+            return None
+
+        scan_id = scans[-1]["id"] + 1 if scans else 1
+        entry = {
+            "id": scan_id,
+            "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "mods": len(current),
+            "files": len(files_map),
+            "conflicts": sum(1 for mods in files_map.values() if len(mods) > 1),
+            "added": added,
+            "removed": removed,
+        }
+
+        _write_json(self._delta_path(scan_id), delta, compress=True)
+        _write_json(os.path.join(self.root, HEAD_NAME),
+                    {"id": scan_id, "mods": {mod: sorted(paths) for mod, paths in current.items()}},
+                    compress=True)
+        scans.append(entry)
+        _write_json(os.path.join(self.root, INDEX_NAME), {"version": HISTORY_VERSION, "scans": scans})
+        return entry
+
+    def snapshots(self, scan_ids):
+        """Rebuild several scans with a single backward pass from the head"""
+        wanted = sorted(set(scan_ids), reverse=True)
+        head_id, by_mod = self._load_head()
+        if head_id is None or wanted[0] > head_id:
+            raise ValueError(f"Scan {wanted[0]} is not in the history")
+        result = {}
+        current_id = head_id
+        for scan_id in wanted:
+            for undo_id in range(current_id, scan_id, -1):
+                apply_delta(by_mod, _read_json(self._delta_path(undo_id), compress=True), reverse=True)
+            current_id = scan_id
+            result[scan_id] = conflicts_of(by_mod)
+        return result
+
+    def compare(self, old_id, new_id):
+        """Return the new, resolved and changed conflicts between two recorded scans
+
+        new and resolved are sorted lists of (path, mods); changed holds
+        (path, old_mods, new_mods) for paths that conflict in both scans but
+        with a different set of mods.
+        """
+        conflicts = self.snapshots([old_id, new_id])
+        old, new = conflicts[old_id], conflicts[new_id]
+        return {
+            "new": sorted((path, mods) for path, mods in new.items() if path not in old),
+            "resolved": sorted((path, mods) for path, mods in old.items() if path not in new),
+            "changed": sorted((path, old[path], mods) for path, mods in new.items()
+                              if path in old and old[path] != mods),
+        }
@@ -0,0 +1,210 @@
+import os
+import sys
+import json
+import time
+import bisect
+import pickle
+import concurrent.futures
+
+APP_DIR_NAME = "RDR2ConflictChecker"
+STATE_NAME = "session.json"
+SCAN_NAME = "last_scan.pickle"
+SESSION_VERSION = 1
+
+# A folder changed this close to the time it was scanned could change again without its
+# mtime moving (coarse timestamps), so it is not trusted and the mod is rescanned next time
+RACY_WINDOW_NS = 2_000_000_000
+
+# Partial results are passed to on_update at most this often
+UPDATE_INTERVAL = 0.25
+
+
+def data_dir():
+    """Per-user folder the last session is kept in"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.environ.get('APPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(base, APP_DIR_NAME)
+
+
+def same_dir(a, b):
+    return bool(a and b) and os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b))
+
+
+def list_mods(lml_dir):
+    return [d for d in os.listdir(lml_dir) if os.path.isdir(os.path.join(lml_dir, d))]
+
+
+def scan_mod(mod_path):
+    """Return (files, dirs) for one mod folder
+
+    files are the relative file paths, the same ones os.walk would give.
+    dirs maps every relative folder ("" for the mod folder itself) to its
+    mtime, or None when it was modified too recently to be trusted or could
+    not be listed, so the mod is rescanned next time.
+    """
+    racy_after = time.time_ns() - RACY_WINDOW_NS
+    files = []
+    dirs = {}
+    pending = [""]
+    while pending:
+        rel_dir = pending.pop()
+        full_dir = os.path.join(mod_path, rel_dir) if rel_dir else mod_path
+        try:
+            # Stat before listing so a change made during the listing shows up next time
+            mtime = os.stat(full_dir).st_mtime_ns
+            with os.scandir(full_dir) as entries:
+                for entry in entries:
+                    rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            pending.append(rel_path)
+                    else:
+                        files.append(rel_path)
+        except OSError:
+            dirs[rel_dir] = None
+            continue
+        dirs[rel_dir] = mtime if mtime < racy_after else None
+    files.sort()
+    return files, dirs
+
+
+def mod_unchanged(mod_path, dirs):
+    """Cheap check that no file was added, removed or renamed since scan_mod
+
+    Conflicts only depend on file paths, and any change to the paths in a
+    folder moves that folder's mtime, so one stat per folder is enough.
+    """
+    for rel_dir, mtime in dirs.items():
+        if mtime is None:
+            return False
+        try:
+            if os.stat(os.path.join(mod_path, rel_dir) if rel_dir else mod_path).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def files_map_of(mods):
+    """Build {path: [mods]} from {mod: (files, dirs)}"""
+    files_map = {}
+    for mod in sorted(mods):
+        for path in mods[mod][0]:
+            files_map.setdefault(path, []).append(mod)
+    return files_map
+
+
+def refresh_mods(lml_dir, mods, on_update=None, max_workers=None):
+    """Bring a scan up to date, rescanning only the mods whose folders changed
+
+    mods is {mod: (files, dirs)} from the last scan, or empty for a full scan,
+    and is updated in place. on_update(conflicts) is called from this thread
+    with a new conflicts dict as rescanned mods come in. Returns
+    (files_map, conflicts, changed) where changed lists the mods that were
+    added, removed or rescanned.
+    """
+    max_workers = max_workers or min(8, os.cpu_count() or 4)
+    files_map = files_map_of(mods)
+    conflicts = {path: list(owners) for path, owners in files_map.items() if len(owners) > 1}
+
+    def set_mod_files(mod, files):
+        old_files = mods[mod][0] if mod in mods else []
+        for path in old_files:
+            owners = files_map[path]
+            owners.remove(mod)
+            if not owners:
+                del files_map[path]
+        for path in files:
+            bisect.insort(files_map.setdefault(path, []), mod)
+        for path in set(old_files).union(files):
+            owners = files_map.get(path)
+            if owners and len(owners) > 1:
+                conflicts[path] = list(owners)
+            else:
+                conflicts.pop(path, None)
+
+    current = set(list_mods(lml_dir))
+    removed = [mod for mod in mods if mod not in current]
+    for mod in removed:
+        set_mod_files(mod, [])
+        del mods[mod]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        kept = sorted(mods)
+        unchanged = executor.map(lambda mod: mod_unchanged(os.path.join(lml_dir, mod), mods[mod][1]), kept)
+        stale = [mod for mod, same in zip(kept, unchanged) if not same]
+        to_scan = sorted(current - mods.keys()) + stale
+
+        futures = {executor.submit(scan_mod, os.path.join(lml_dir, mod)): mod for mod in to_scan}
+        last_update = time.time()
+        for future in concurrent.futures.as_completed(futures):
+            mod = futures[future]
+            try:
+                files, dirs = future.result()
+            except Exception as e:
+                print(f"Error processing mod {mod}: {e}")
+                # Not trusted, so the next refresh scans it again
+                files, dirs = [], {"": None}
+            set_mod_files(mod, files)
+            mods[mod] = (files, dirs)
+
+            if on_update and time.time() - last_update >= UPDATE_INTERVAL:
+                last_update = time.time()
+                on_update(dict(conflicts))
+
+    return files_map, conflicts, removed + to_scan
+
+
+class SessionStore:
+    """The last session: UI state as JSON and the last scan as a pickle
+
+    The scan keeps each mod's files and folder mtimes so the next launch can
+    show it straight away and rescan only the mods that changed since.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or data_dir()
+        self.state_path = os.path.join(self.root, STATE_NAME)
+        self.scan_path = os.path.join(self.root, SCAN_NAME)
+
+    def load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) and state.get("version") == SESSION_VERSION else {}
+
+    def save_state(self, state):
+        state = dict(state, version=SESSION_VERSION)
+        self._replace(self.state_path, json.dumps(state, indent=2).encode('utf-8'))
+
+    def load_scan(self, lml_dir):
+        """Return (conflicts, mods) of the last scan of lml_dir, or None"""
+        try:
+            with open(self.scan_path, 'rb') as f:
+                data = pickle.load(f)
+        except Exception:
+            return None
+        if data.get("version") != SESSION_VERSION or not same_dir(data.get("lml_dir"), lml_dir):
+            return None
+        return data["conflicts"], data["mods"]
+
+    def save_scan(self, lml_dir, conflicts, mods):
+        data = {
+            "version": SESSION_VERSION,
+            "lml_dir": lml_dir,
+            "time": time.time(),
+            "conflicts": conflicts,
+            "mods": mods,
+        }
+        self._replace(self.scan_path, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def _replace(self, path, payload):
+        os.makedirs(self.root, exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_path, path)
@@ -0,0 +1,73 @@
+"""Measure launch-to-interactive time of the conflict checker
+
+Starts the app (or a built exe) several times with --startup-profile
+--exit-after-startup, reads the interactive_at time it prints and appends
+the results to startup_benchmark.jsonl so builds can be compared.
+
+    python startup_benchmark.py [--runs 10] [--exe dist/RDR2ConflictChecker.exe]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+
+from startup_profile import STARTUP_PROFILE_FLAG, EXIT_AFTER_STARTUP_FLAG
+
+LOG_NAME = "startup_benchmark.jsonl"
+
+
+def run_once(command):
+    """Launch the app once; returns (seconds to interactive, profile lines)"""
+    launched = time.time()
+    result = subprocess.run(command + [STARTUP_PROFILE_FLAG, EXIT_AFTER_STARTUP_FLAG],
+                            capture_output=True, text=True, timeout=120)
+    lines = result.stdout.splitlines()
+    for line in lines:
+        if line.startswith("interactive_at="):
+            return float(line.split("=", 1)[1]) - launched, lines
+    raise RuntimeError(f"No startup profile in output (exit code {result.returncode}):\n{result.stderr}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--exe", help="Built executable to launch instead of the script")
+    parser.add_argument("--log", default=LOG_NAME, help="JSONL file the results are appended to")
+    args = parser.parse_args()
+
+    if args.exe:
+        command = [args.exe]
+    else:
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "RDR2ConflictChecker.py")
+        command = [sys.executable, script]
+
+    times = []
+    last_profile = []
+    for i in range(args.runs):
+        seconds, last_profile = run_once(command)
+        times.append(seconds)
+        print(f"Run {i + 1}: {seconds * 1000:.0f} ms")
+
+    print("\n".join(last_profile[:-1]))
+    print(f"Min {min(times) * 1000:.0f} ms, median {statistics.median(times) * 1000:.0f} ms over {len(times)} runs")
+
+    entry = {
+        "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "target": args.exe or "script",
+        "runs": len(times),
+        "min_ms": round(min(times) * 1000, 1),
+        "median_ms": round(statistics.median(times) * 1000, 1),
+        "cpu_count": os.cpu_count(),
+        "platform": platform.platform(),
+    }
+    with open(args.log, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+if __name__ == '__main__':
+    main()
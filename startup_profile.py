@@ -0,0 +1,35 @@
+import sys
+import time
+
+STARTUP_PROFILE_FLAG = "--startup-profile"
+# With this flag the app closes as soon as it is interactive (used by startup_benchmark.py)
+EXIT_AFTER_STARTUP_FLAG = "--exit-after-startup"
+
+
+class StartupProfile:
+    """Time spent in each startup step, printed when the app is run with --startup-profile"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.steps = []
+        self.enabled = STARTUP_PROFILE_FLAG in sys.argv
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.steps.append((name, now - self.last))
+        self.last = now
+
+    def report(self):
+        if not self.enabled:
+            return
+        total = self.last - self.start
+        print("Startup profile:")
+        for name, seconds in self.steps:
+            print(f"  {name:<24}{seconds * 1000:8.1f} ms")
+        print(f"  {'total':<24}{total * 1000:8.1f} ms")
+        # Wall-clock time so a launcher can measure from process start
+        print(f"interactive_at={time.time():.6f}", flush=True)
+
+
+PROFILE = StartupProfile()
@@ -0,0 +1,179 @@
+import os
+import re
+import difflib
+import concurrent.futures
+from collections import defaultdict
+
+TOKEN_PATTERN = re.compile(r"\w+|\s+|[^\w\s]")
+
+# Character-level matching is quadratic, so long lines fall back to tokens
+CHAR_DIFF_MAX_LENGTH = 1000
+
+# Below this many lines in total, N-way diffs run in this process: starting worker
+# processes (which re-import the app on Windows) costs more than the diffs themselves
+NWAY_PROCESS_MIN_LINES = 200_000
+
+# Part of the diff cache key, so cached results are dropped when the algorithm changes
+TEXT_DIFF_OPTIONS = ("text", "intraline", CHAR_DIFF_MAX_LENGTH)
+
+
+def decode_text(raw):
+    """Decode file bytes the way text-mode open() would, with universal newlines"""
+    return raw.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def changed_line_indexes(left_lines, right_lines):
+    """Return the indexes of lines present on both sides whose content differs"""
+    return [i for i, (left, right) in enumerate(zip(left_lines, right_lines)) if left != right]
+
+
+def _split_units(line, mode):
+    if mode == "char":
+        return list(line), [(i, i + 1) for i in range(len(line))]
+
+    tokens = []
+    spans = []
+    for match in TOKEN_PATTERN.finditer(line):
+        tokens.append(match.group())
+        spans.append(match.span())
+    return tokens, spans
+
+
+def _merge_spans(spans):
+    merged = []
+    for start, end in spans:
+        if merged and merged[-1][1] >= start:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def intraline_ranges(left_line, right_line, mode="auto"):
+    """Return the changed column ranges on each side of a pair of differing lines"""
+    if mode == "auto":
+        longest = max(len(left_line), len(right_line))
+        mode = "char" if longest <= CHAR_DIFF_MAX_LENGTH else "token"
+
+    left_units, left_spans = _split_units(left_line, mode)
+    right_units, right_spans = _split_units(right_line, mode)
+
+    matcher = difflib.SequenceMatcher(None, left_units, right_units, autojunk=False)
+
+    left_ranges = []
+    right_ranges = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        if i1 < i2:
+            left_ranges.append((left_spans[i1][0], left_spans[i2 - 1][1]))
+        if j1 < j2:
+            right_ranges.append((right_spans[j1][0], right_spans[j2 - 1][1]))
+
+    return _merge_spans(left_ranges), _merge_spans(right_ranges)
+
+
+def compute_intraline_diffs(left_lines, right_lines, results, cancel_event=None,
+                            progress_callback=None, batch_size=500):
+    """Fill results with {line_index: (left_ranges, right_ranges)} for every changed line"""
+    indexes = changed_line_indexes(left_lines, right_lines)
+    total = len(indexes)
+
+    for count, i in enumerate(indexes, start=1):
+        if cancel_event is not None and cancel_event.is_set():
+            return False
+        results[i] = intraline_ranges(left_lines[i], right_lines[i])
+        if progress_callback and (count % batch_size == 0 or count == total):
+            progress_callback(count, total)
+
+    return True
+
+
+def diff_hunks(base_lines, other_lines):
+    """Return (base_start, base_end, other_start, other_end) for every non-equal line opcode"""
+    matcher = difflib.SequenceMatcher(None, base_lines, other_lines)
+    return [(i1, i2, j1, j2) for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+
+
+def _diff_hunks_task(args):
+    return diff_hunks(*args)
+
+
+def compute_nway_hunks(base_lines, versions, max_workers=None):
+    """Diff every {name: lines} version against the base and return {name: hunks}
+
+    Large inputs are spread over worker processes; small ones are diffed here.
+    """
+    names = list(versions)
+    tasks = [(base_lines, versions[name]) for name in names]
+    workers = max_workers or min(len(tasks), os.cpu_count() or 4) or 1
+
+    total_lines = sum(len(base) + len(other) for base, other in tasks)
+    if workers == 1 or total_lines < NWAY_PROCESS_MIN_LINES:
+        return {name: diff_hunks(*task) for name, task in zip(names, tasks)}
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_diff_hunks_task, tasks))
+    except (OSError, concurrent.futures.BrokenExecutor):
+        # Fall back to threads where worker processes cannot be started
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_diff_hunks_task, tasks))
+
+    return dict(zip(names, results))
+
+
+def apply_hunks(base_lines, other_lines, hunks, start, end):
+    """Return the other version of base lines [start, end) given its hunks inside that range"""
+    result = []
+    pos = start
+    for i1, i2, j1, j2 in hunks:
+        result.extend(base_lines[pos:i1])
+        result.extend(other_lines[j1:j2])
+        pos = i2
+    result.extend(base_lines[pos:end])
+    return result
+
+
+def group_nway_regions(base_lines, versions, hunks_by_name):
+    """Merge overlapping hunks from every version into regions of the base file
+
+    Each region is a dict with the base line range, the versions that touch it,
+    their text for that range and a status of "single", "identical" or "conflict".
+    """
+    spans = sorted((i1, i2, name, (i1, i2, j1, j2))
+                   for name, hunks in hunks_by_name.items()
+                   for i1, i2, j1, j2 in hunks)
+
+    grouped = []
+    for i1, i2, name, hunk in spans:
+        if grouped and i1 <= grouped[-1]["end"]:
+            region = grouped[-1]
+            region["end"] = max(region["end"], i2)
+        else:
+            region = {"start": i1, "end": i2, "hunks": defaultdict(list)}
+            grouped.append(region)
+        region["hunks"][name].append(hunk)
+
+    regions = []
+    for region in grouped:
+        start, end = region["start"], region["end"]
+        texts = {name: apply_hunks(base_lines, versions[name], hunks, start, end)
+                 for name, hunks in region["hunks"].items()}
+
+        if len(texts) == 1:
+            status = "single"
+        elif all(text == next(iter(texts.values())) for text in texts.values()):
+            status = "identical"
+        else:
+            status = "conflict"
+
+        regions.append({
+            "start": start,
+            "end": end,
+            "names": [name for name in versions if name in texts],
+            "texts": texts,
+            "status": status,
+        })
+
+    return regions
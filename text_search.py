@@ -0,0 +1,53 @@
+import re
+from bisect import bisect_right
+
+SEARCH_MODES = ("Plain", "Match Case", "Whole Word", "Regex")
+
+
+class LineOffsetIndex:
+    """Maps character offsets in a string to Tk "line.col" indexes"""
+
+    def __init__(self, content):
+        starts = [0]
+        find = content.find
+        pos = find("\n")
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = find("\n", pos + 1)
+        self.line_starts = starts
+
+    @property
+    def line_count(self):
+        return len(self.line_starts)
+
+    def line_start(self, line):
+        """Offset of the first character of a 1-based line, clamped to the content"""
+        line = max(1, min(line, len(self.line_starts)))
+        return self.line_starts[line - 1]
+
+    def to_tk_index(self, offset):
+        line = bisect_right(self.line_starts, offset)
+        return f"{line}.{offset - self.line_starts[line - 1]}"
+
+
+def compile_search_pattern(term, mode):
+    """Compile a search term for one of SEARCH_MODES, raising re.error for bad regexes"""
+    if mode == "Regex":
+        return re.compile(term, re.MULTILINE)
+    if mode == "Match Case":
+        return re.compile(re.escape(term))
+    if mode == "Whole Word":
+        return re.compile(r"\b" + re.escape(term) + r"\b", re.IGNORECASE)
+    return re.compile(re.escape(term), re.IGNORECASE)
+
+
+def find_matches(content, pattern, is_cancelled=None, check_every=10000):
+    """Return (start, end) offsets for every non-empty match, or None if cancelled"""
+    matches = []
+    for count, match in enumerate(pattern.finditer(content), start=1):
+        start, end = match.span()
+        if start != end:
+            matches.append((start, end))
+        if is_cancelled is not None and count % check_every == 0 and is_cancelled():
+            return None
+    return matches
@@ -0,0 +1,155 @@
+import os
+import json
+import time
+import platform
+import threading
+from collections import deque
+from datetime import datetime
+
+STATS_LOG_NAME = "backup_stats.jsonl"
+
+# ETA uses the rate over this many recent seconds so it follows speed changes
+RATE_WINDOW = 5.0
+
+
+def format_bytes(count):
+    for unit in ("B", "KB", "MB", "GB"):
+        if count < 1024 or unit == "GB":
+            return f"{count:,.0f} {unit}" if unit == "B" else f"{count:,.1f} {unit}"
+        count /= 1024
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class TransferStats:
+    """Thread-safe byte and file counters for a backup or restore job
+
+    Workers call add_read/add_written/set_current as they go; the UI polls
+    snapshot() on a timer. total_bytes may grow while the input is still being
+    enumerated (total_final is False until it is known).
+    """
+
+    def __init__(self, operation, settings=None):
+        self.operation = operation
+        self.settings = dict(settings or {})
+        self.lock = threading.Lock()
+        self.start_time = time.time()
+        self.end_time = None
+        self.total_bytes = 0
+        self.total_final = False
+        self.total_files = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.files_done = 0
+        self.current_file = ""
+        self.samples = deque([(self.start_time, 0)])
+        self.cancelled = False
+
+    def set_total(self, total_bytes, total_files=0, final=True):
+        with self.lock:
+            self.total_bytes = total_bytes
+            self.total_files = total_files
+            self.total_final = final
+
+    def add_read(self, count):
+        with self.lock:
+            self.bytes_read += count
+
+    def add_written(self, count):
+        with self.lock:
+            self.bytes_written += count
+
+    def file_done(self, count=1):
+        with self.lock:
+            self.files_done += count
+
+    def set_current(self, name):
+        self.current_file = name
+
+    def finish(self, cancelled=False):
+        self.end_time = time.time()
+        self.cancelled = cancelled
+
+    def snapshot(self):
+        """Return a dict of the current counters, rates and ETA"""
+        now = self.end_time or time.time()
+        with self.lock:
+            progress_bytes = max(self.bytes_read, self.bytes_written)
+            self.samples.append((now, progress_bytes))
+            while len(self.samples) > 2 and now - self.samples[0][0] > RATE_WINDOW:
+                self.samples.popleft()
+            first_time, first_bytes = self.samples[0]
+            data = {
+                "elapsed": now - self.start_time,
+                "total_bytes": self.total_bytes,
+                "total_final": self.total_final,
+                "total_files": self.total_files,
+                "bytes_read": self.bytes_read,
+                "bytes_written": self.bytes_written,
+                "files_done": self.files_done,
+                "current_file": self.current_file,
+            }
+
+        elapsed = max(data["elapsed"], 0.001)
+        data["read_rate"] = data["bytes_read"] / elapsed
+        data["write_rate"] = data["bytes_written"] / elapsed
+        data["ratio"] = (data["bytes_written"] / data["bytes_read"]) if data["bytes_read"] else None
+
+        window = now - first_time
+        recent_rate = (progress_bytes - first_bytes) / window if window > 0 else 0
+        remaining = data["total_bytes"] - progress_bytes
+        data["eta"] = remaining / recent_rate if recent_rate > 0 and data["total_final"] and remaining > 0 else None
+        data["percent"] = (progress_bytes * 100 / data["total_bytes"]) if data["total_bytes"] else 0
+        return data
+
+    def status_lines(self):
+        """Human-readable lines for a progress window"""
+        data = self.snapshot()
+        total = format_bytes(data["total_bytes"]) + ("" if data["total_final"] else "+")
+        done = max(data["bytes_read"], data["bytes_written"])
+        lines = [f"{format_bytes(done)} of {total}"
+                 + (f" - {data['files_done']:,} of {data['total_files']:,} files" if data["total_files"] else
+                    f" - {data['files_done']:,} files")]
+
+        rates = f"Read {format_bytes(data['read_rate'])}/s, write {format_bytes(data['write_rate'])}/s"
+        if data["ratio"] is not None and self.operation == "backup":
+            rates += f", ratio {data['ratio']:.0%}"
+        lines.append(rates)
+
+        eta = format_duration(data["eta"]) if data["eta"] is not None else "estimating..."
+        lines.append(f"Elapsed {format_duration(data['elapsed'])}, remaining {eta}")
+        return lines, data
+
+    def write_log(self, log_dir, **extra):
+        """Append this run's totals to the stats log so runs can be compared"""
+        data = self.snapshot()
+        entry = {
+            "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "operation": self.operation,
+            "cancelled": self.cancelled,
+            "seconds": round(data["elapsed"], 3),
+            "files": data["files_done"],
+            "total_bytes": data["total_bytes"],
+            "bytes_read": data["bytes_read"],
+            "bytes_written": data["bytes_written"],
+            "read_mb_s": round(data["read_rate"] / (1024 * 1024), 2),
+            "write_mb_s": round(data["write_rate"] / (1024 * 1024), 2),
+            "ratio": round(data["ratio"], 4) if data["ratio"] is not None else None,
+            "cpu_count": os.cpu_count(),
+            "platform": platform.platform(),
+        }
+        entry.update(self.settings)
+        entry.update(extra)
+        try:
+            os.makedirs(log_dir, exist_ok=True)
+            with open(os.path.join(log_dir, STATS_LOG_NAME), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"Failed to write backup stats: {e}")
@@ -0,0 +1,168 @@
+import io
+import hashlib
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict, defaultdict
+
+XML_EXTENSIONS = ('.xml', '.meta')
+
+# Child elements and attributes that identify an entry, in order of preference
+IDENTITY_TAGS = ("Name", "name", "Hash", "hash", "modelName", "Id", "id", "Key", "key")
+IDENTITY_ATTRS = ("name", "hash", "id", "key")
+
+MAX_FIELDS_PER_ENTRY = 500
+PARSE_CACHE_SIZE = 32
+
+_parse_cache = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+class XmlEntry:
+    """An identified element with a digest of its own content and its leaf values"""
+
+    __slots__ = ("key", "digest", "fields")
+
+    def __init__(self, key, digest, fields):
+        self.key = key
+        self.digest = digest
+        self.fields = fields
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else str(tag)
+
+
+def _identity(frame, attrib):
+    for attr in IDENTITY_ATTRS:
+        if attrib.get(attr):
+            return f"@{attr}={attrib[attr]}"
+    for tag in IDENTITY_TAGS:
+        if tag in frame["idents"]:
+            return f"{tag}={frame['idents'][tag]}"
+    return None
+
+
+def parse_xml_entries(data):
+    """Stream-parse XML bytes into {entry_key: XmlEntry}, ignoring whitespace and entry order"""
+    entries = {}
+    stack = []
+    tag_path = []
+
+    for event, elem in ET.iterparse(io.BytesIO(data), events=("start", "end")):
+        if event == "start":
+            tag = _local_name(elem.tag)
+            tag_path.append(tag)
+            stack.append({"tag": tag, "digests": [], "fields": [], "idents": {}, "leaf": True})
+            if len(stack) > 1:
+                stack[-2]["leaf"] = False
+            continue
+
+        frame = stack.pop()
+        tag = frame["tag"]
+        text = (elem.text or "").strip()
+        attrib = sorted(elem.attrib.items())
+
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(repr((tag, attrib, text)).encode('utf-8'))
+        # Children without a key of their own are compared as a set, so reordering them
+        # is not a change (their fields are compared the same way in _field_changes)
+        for digest in sorted(frame["digests"]):
+            hasher.update(digest)
+        digest = hasher.digest()
+
+        value = text
+        if attrib:
+            value = " ".join(f'{k}="{v}"' for k, v in attrib) + (f" {text}" if text else "")
+
+        identity = _identity(frame, elem.attrib)
+        parent = stack[-1] if stack else None
+
+        if identity is not None or parent is None:
+            key = "/".join(tag_path[:-1] + [f"{tag}[{identity or ''}]"])
+            unique_key = key
+            counter = 2
+            while unique_key in entries:
+                unique_key = f"{key}#{counter}"
+                counter += 1
+
+            fields = list(frame["fields"])
+            if frame["leaf"] and value:
+                fields.append((tag, value))
+            entries[unique_key] = XmlEntry(unique_key, digest, fields[:MAX_FIELDS_PER_ENTRY])
+        else:
+            parent["digests"].append(digest)
+            if frame["leaf"]:
+                if tag in IDENTITY_TAGS and text:
+                    parent["idents"].setdefault(tag, text)
+                parent["fields"].append((tag, value))
+            else:
+                if value:
+                    parent["fields"].append((tag, value))
+                parent["fields"].extend((f"{tag}/{path}", field_value)
+                                        for path, field_value in frame["fields"])
+
+            if len(parent["fields"]) > MAX_FIELDS_PER_ENTRY:
+                del parent["fields"][MAX_FIELDS_PER_ENTRY:]
+
+        tag_path.pop()
+        elem.clear()
+
+    return entries
+
+
+def parse_xml_entries_cached(data):
+    """parse_xml_entries keyed by a hash of the content, so unchanged files parse once"""
+    content_key = hashlib.blake2b(data, digest_size=20).digest()
+    with _parse_cache_lock:
+        if content_key in _parse_cache:
+            _parse_cache.move_to_end(content_key)
+            return _parse_cache[content_key]
+
+    entries = parse_xml_entries(data)
+
+    with _parse_cache_lock:
+        _parse_cache[content_key] = entries
+        while len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return entries
+
+
+def _field_changes(left_fields, right_fields):
+    left_values = defaultdict(list)
+    right_values = defaultdict(list)
+    for path, value in left_fields:
+        left_values[path].append(value)
+    for path, value in right_fields:
+        right_values[path].append(value)
+
+    changes = []
+    for path in list(left_values) + [p for p in right_values if p not in left_values]:
+        before = left_values.get(path, [])
+        after = right_values.get(path, [])
+        if sorted(before) != sorted(after):
+            changes.append((path, ", ".join(before) or "(none)", ", ".join(after) or "(none)"))
+    return changes
+
+
+def diff_xml_entries(left_entries, right_entries):
+    """Return (added, removed, changed) where changed holds (key, field_changes) pairs"""
+    added = sorted(key for key in right_entries if key not in left_entries)
+    removed = sorted(key for key in left_entries if key not in right_entries)
+
+    changed = []
+    for key in sorted(left_entries):
+        right = right_entries.get(key)
+        if right is not None and right.digest != left_entries[key].digest:
+            changed.append((key, _field_changes(left_entries[key].fields, right.fields)))
+
+    return added, removed, changed
+
+
+def diff_xml_files(left_path, right_path):
+    with open(left_path, 'rb') as f:
+        left_data = f.read()
+    with open(right_path, 'rb') as f:
+        right_data = f.read()
+    left_entries = parse_xml_entries_cached(left_data)
+    right_entries = parse_xml_entries_cached(right_data)
+    return left_entries, right_entries, diff_xml_entries(left_entries, right_entries)